@@ -0,0 +1,132 @@
+import random
+
+
+def article(pmid: int, authors: int = 8, references: int = 30) -> str:
+    """ Create the XML of a synthetic (but realistically shaped) PubMed article.
+
+        Parameters:
+            - pmid          Int, PubMed ID of the article.
+            - authors       Int, number of authors.
+            - references    Int, number of references.
+
+        Returns:
+            - xml           Str, the PubmedArticle element.
+    """
+
+    # Use the ID as seed so the same article is generated every time
+    rng = random.Random(pmid)
+    year = 1990 + pmid % 35
+    words = " ".join(
+        rng.choice(["cell", "protein", "health", "risk", "study"]) for _ in range(60)
+    )
+
+    # Authors, some with multiple affiliations and a collective author
+    author_list = "".join(
+        f'<Author ValidYN="Y"><LastName>Last{rng.randint(0, 5000)}</LastName>'
+        f"<ForeName>First{rng.randint(0, 500)}</ForeName><Initials>F</Initials>"
+        f"<AffiliationInfo><Affiliation>Department {rng.randint(0, 20)}, University "
+        f"{rng.randint(0, 50)}.</Affiliation></AffiliationInfo>"
+        + (
+            "<AffiliationInfo><Affiliation>Institute.</Affiliation></AffiliationInfo>"
+            if index == 1
+            else ""
+        )
+        + "</Author>"
+        for index in range(authors)
+    )
+    if pmid % 5 == 0:
+        author_list += "<Author><CollectiveName>Study Group</CollectiveName></Author>"
+
+    # References carry their own (PubMed) article IDs
+    reference_list = "".join(
+        f"<Reference><Citation>Reference {index}.</Citation><ArticleIdList>"
+        f'<ArticleId IdType="pubmed">{rng.randint(1, 30000000)}</ArticleId>'
+        "</ArticleIdList></Reference>"
+        for index in range(references)
+    )
+
+    # Some articles have no PubMed publication date, or no DOI
+    pubmed_date = (
+        ""
+        if pmid % 11 == 0
+        else f'<PubMedPubDate PubStatus="pubmed"><Year>{year}</Year><Month>{1 + pmid % 12}</Month>'
+        f"<Day>{1 + pmid % 28}</Day><Hour>6</Hour></PubMedPubDate>"
+    )
+    doi = f'<ArticleId IdType="doi">10.1000/{pmid}</ArticleId>' if pmid % 3 else ""
+
+    return (
+        f'<PubmedArticle><MedlineCitation Status="MEDLINE" Owner="NLM"><PMID Version="1">{pmid}</PMID>'
+        f"<DateRevised><Year>{year + 1}</Year><Month>0{1 + pmid % 9}</Month><Day>1{pmid % 9}</Day></DateRevised>"
+        f'<Article PubModel="Print"><Journal><ISSN IssnType="Electronic">1234-5678</ISSN>'
+        f'<JournalIssue CitedMedium="Internet"><Volume>{pmid % 40}</Volume><PubDate><Year>{year}</Year>'
+        f"</PubDate></JournalIssue><Title>Journal of Things {pmid % 17}</Title>"
+        f"<ISOAbbreviation>J Things</ISOAbbreviation></Journal><ArticleTitle>Study {pmid} of {words[:40]}.</ArticleTitle>"
+        f'<Abstract><AbstractText Label="BACKGROUND">{words}</AbstractText>'
+        f'<AbstractText Label="METHOD">{words}</AbstractText><AbstractText Label="RESULTS">{words}</AbstractText>'
+        f'<AbstractText Label="CONCLUSION">{words[:120]}</AbstractText>'
+        f"<CopyrightInformation>Copyright {year}.</CopyrightInformation></Abstract>"
+        f'<AuthorList CompleteYN="Y">{author_list}</AuthorList><Language>eng</Language>'
+        '<PublicationTypeList><PublicationType UI="D016428">Journal Article</PublicationType></PublicationTypeList>'
+        "</Article><MedlineJournalInfo><Country>England</Country><MedlineTA>J Things</MedlineTA></MedlineJournalInfo>"
+        "<MeshHeadingList>"
+        + "".join(
+            f'<MeshHeading><DescriptorName UI="D{index}">Descriptor {index}</DescriptorName></MeshHeading>'
+            for index in range(10)
+        )
+        + '</MeshHeadingList><KeywordList Owner="NOTNLM">'
+        f"<Keyword>keyword {pmid % 13}</Keyword><Keyword>health</Keyword>"
+        + ("<Keyword/>" if pmid % 6 == 0 else "")
+        + "</KeywordList></MedlineCitation><PubmedData><History>"
+        f'<PubMedPubDate PubStatus="received"><Year>{year - 1}</Year><Month>1</Month><Day>1</Day></PubMedPubDate>'
+        f"{pubmed_date}</History><PublicationStatus>ppublish</PublicationStatus>"
+        f'<ArticleIdList><ArticleId IdType="pubmed">{pmid}</ArticleId>{doi}</ArticleIdList>'
+        f"<ReferenceList>{reference_list}</ReferenceList></PubmedData></PubmedArticle>"
+    )
+
+
+def book(pmid: int) -> str:
+    """ Create the XML of a synthetic PubMed book article.
+
+        Parameters:
+            - pmid          Int, PubMed ID of the book article.
+
+        Returns:
+            - xml           Str, the PubmedBookArticle element.
+    """
+
+    return (
+        f'<PubmedBookArticle><BookDocument><PMID Version="1">{pmid}</PMID>'
+        f'<ArticleIdList><ArticleId IdType="bookaccession">NBK{pmid}</ArticleId></ArticleIdList>'
+        f"<Book><Publisher><PublisherName>Publisher {pmid % 7}</PublisherName>"
+        "<PublisherLocation>Bethesda (MD)</PublisherLocation></Publisher>"
+        f'<BookTitle book="book{pmid}">Book {pmid}</BookTitle><PubDate><Year>{1990 + pmid % 35}</Year></PubDate>'
+        '<Isbn>9780000000000</Isbn></Book><Language>eng</Language><AuthorList Type="authors">'
+        "<Author><LastName>Writer</LastName><ForeName>Book</ForeName><Initials>B</Initials></Author>"
+        "<Author><CollectiveName>Editorial Board</CollectiveName></Author></AuthorList>"
+        '<PublicationType UI="D016454">Review</PublicationType><Abstract><AbstractText>Summary.</AbstractText>'
+        "<CopyrightInformation>Copyright.</CopyrightInformation></Abstract><Sections>"
+        '<Section><SectionTitle>Introduction</SectionTitle><LocationLabel Type="chapter">1</LocationLabel>'
+        "<Section><SectionTitle>Background</SectionTitle></Section></Section>"
+        '<Section><SectionTitle>Methods</SectionTitle><LocationLabel Type="chapter">2</LocationLabel></Section>'
+        '</Sections></BookDocument><PubmedBookData><History><PubMedPubDate PubStatus="pubmed">'
+        f"<Year>{1990 + pmid % 35}</Year></PubMedPubDate></History><ArticleIdList>"
+        f'<ArticleId IdType="pubmed">{pmid}</ArticleId></ArticleIdList></PubmedBookData></PubmedBookArticle>'
+    )
+
+
+def record(pmid: int) -> str:
+    """ Create the XML of the record with this ID (about 1% are book articles).
+    """
+
+    return book(pmid) if pmid % 97 == 0 else article(pmid)
+
+
+def efetch(pmids: list) -> str:
+    """ Create an efetch response with the records for the IDs.
+    """
+
+    return (
+        '<?xml version="1.0" ?>\n<!DOCTYPE PubmedArticleSet>\n<PubmedArticleSet>\n'
+        + "\n".join(record(int(pmid)) for pmid in pmids)
+        + "\n</PubmedArticleSet>"
+    )
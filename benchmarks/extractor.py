@@ -0,0 +1,110 @@
+import sys
+import time
+import argparse
+
+import xml.etree.ElementTree as xml
+
+from pymed.article import PubMedArticle
+from pymed.book import PubMedBookArticle
+
+from corpus import efetch
+
+
+def legacyArticle(article: PubMedArticle, xml_element: xml.Element) -> dict:
+    """ Extract the fields of an article with the separate _extract* methods.
+    """
+
+    return {
+        "pubmed_id": article._extractPubMedId(xml_element),
+        "title": article._extractTitle(xml_element),
+        "keywords": article._extractKeywords(xml_element),
+        "journal": article._extractJournal(xml_element),
+        "abstract": article._extractAbstract(xml_element),
+        "conclusions": article._extractConclusions(xml_element),
+        "methods": article._extractMethods(xml_element),
+        "results": article._extractResults(xml_element),
+        "copyrights": article._extractCopyrights(xml_element),
+        "doi": article._extractDoi(xml_element),
+        "publication_date": article._extractPublicationDate(xml_element),
+        "authors": [dict(author) for author in article._extractAuthors(xml_element)],
+        "xml": xml_element,
+    }
+
+
+def legacyBook(book: PubMedBookArticle, xml_element: xml.Element) -> dict:
+    """ Extract the fields of a book article with the separate _extract* methods.
+    """
+
+    return {
+        "pubmed_id": book._extractPubMedId(xml_element),
+        "title": book._extractTitle(xml_element),
+        "abstract": book._extractAbstract(xml_element),
+        "copyrights": book._extractCopyrights(xml_element),
+        "doi": book._extractDoi(xml_element),
+        "isbn": book._extractIsbn(xml_element),
+        "language": book._extractLanguage(xml_element),
+        "publication_date": book._extractPublicationDate(xml_element),
+        "authors": [dict(author) for author in book._extractAuthors(xml_element)],
+        "publication_type": book._extractPublicationType(xml_element),
+        "publisher": book._extractPublisher(xml_element),
+        "publisher_location": book._extractPublisherLocation(xml_element),
+        "sections": book._extractSections(xml_element),
+    }
+
+
+def timeIt(function, elements: list, repeat: int) -> float:
+    """ Return the best time (in seconds) of parsing all elements.
+    """
+
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for element in elements:
+            function(element)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+
+    # Parse the command line arguments
+    parser = argparse.ArgumentParser(
+        description="Compare the single pass extractor with the per-field extractors"
+    )
+    parser.add_argument(
+        "files", nargs="*", help="efetch XML files (defaults to a synthetic corpus)"
+    )
+    parser.add_argument("--articles", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    arguments = parser.parse_args()
+
+    # Load the efetch responses (or generate a synthetic one)
+    documents = [open(path, "rb").read() for path in arguments.files] or [
+        efetch(range(1, arguments.articles + 1))
+    ]
+    roots = [xml.fromstring(document) for document in documents]
+    articles = [element for root in roots for element in root.iter("PubmedArticle")]
+    books = [element for root in roots for element in root.iter("PubmedBookArticle")]
+
+    # Make sure both ways of parsing produce exactly the same values
+    for elements, cls, legacy in [
+        (articles, PubMedArticle, legacyArticle),
+        (books, PubMedBookArticle, legacyBook),
+    ]:
+        for element in elements:
+            expected = legacy(cls(), element)
+            actual = cls(xml_element=element).toDict()
+            if actual != expected:
+                sys.exit(f"Mismatch for {cls.__name__} {expected['pubmed_id']}")
+    print(f"Identical output for {len(articles)} articles and {len(books)} books")
+
+    # Time both ways of parsing
+    for name, function in [
+        ("per-field", lambda element: legacyArticle(PubMedArticle(), element)),
+        ("single pass", lambda element: PubMedArticle(xml_element=element)),
+    ]:
+        seconds = timeIt(function, articles, arguments.repeat)
+        print(
+            f"{name:>12}: {seconds * 1000:8.1f} ms, "
+            f"{len(articles) / seconds:10.0f} articles/sec"
+        )
@@ -0,0 +1,247 @@
+import sys
+import json
+import time
+import argparse
+import resource
+import platform
+import multiprocessing
+
+import pymed
+
+from pymed import PubMed
+from pymed.api import BATCH_SIZE
+from pymed.helpers import batches
+from pymed.metrics import Metrics
+from pymed.parser import parseArticles
+from pymed.ratelimit import getRateLimiter
+
+import server
+
+from corpus import efetch
+
+
+# Scenarios that can be run, from the smallest to the largest part of PyMed
+SCENARIOS = ("parse", "ids", "articles", "query")
+
+# API key used for the benchmarks (the stand-in server accepts any key)
+API_KEY = "benchmark"
+
+
+def peakRSS() -> float:
+    """ Return the peak resident set size of this process in MB.
+    """
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 ** 2 if platform.system() == "Darwin" else peak / 1024
+
+
+def summarize(metrics: Metrics) -> dict:
+    """ Return the time spent in each stage (and the number of requests).
+    """
+
+    return {
+        "requests": sum(metrics.requests.values.values()),
+        "retries": sum(metrics.retries.values.values()),
+        "request_seconds": sum(
+            total for _, total in metrics.request_seconds.values.values()
+        ),
+        "rate_limit_seconds": metrics.rate_limit_seconds.get()["sum"],
+        "batch_parse_seconds": metrics.batch_seconds.get()["sum"],
+        "article_seconds": sum(metrics.article_seconds.values.values()),
+    }
+
+
+def runScenario(name: str, url: str, options: dict) -> dict:
+    """ Run a scenario (in a fresh process, so the peak RSS is its own).
+
+        Parameters:
+            - name      Str, name of the scenario (see SCENARIOS).
+            - url       Str, URL of the (stand-in) E-utilities.
+            - options   Dict, the command line options.
+
+        Returns:
+            - result    Dict, the number of articles, the time, articles/sec, peak
+                        RSS and the time spent in each stage.
+    """
+
+    metrics = Metrics()
+    pubmed = PubMed(
+        tool="benchmark",
+        email="benchmark@example.com",
+        api_key=API_KEY,
+        base_url=url,
+        metrics=metrics,
+        backoff_factor=0.1,
+    )
+
+    # Raise (or lower) the client side rate limit
+    if options["client_rate"] is not None:
+        getRateLimiter(api_key=API_KEY).rate = options["client_rate"]
+
+    # Parsing only, without any requests
+    if name == "parse":
+        response = efetch(range(1, options["articles"] + 1)).encode()
+        start = time.perf_counter()
+        count = 0
+        for article in metrics.timeBatch(parseArticles(response)):
+            count += 1
+
+    # Retrieving the article IDs
+    elif name == "ids":
+        start = time.perf_counter()
+        count = len(
+            pubmed._getArticleIds(
+                query=options["query"], max_results=options["articles"]
+            )
+        )
+
+    # Retrieving and parsing the articles of known IDs
+    elif name == "articles":
+        article_ids = PubMed(base_url=url, api_key=API_KEY)._getArticleIds(
+            query=options["query"], max_results=options["articles"]
+        )
+        start = time.perf_counter()
+        count = 0
+        for batch in batches(article_ids, BATCH_SIZE):
+            for article in pubmed._getArticles(
+                article_ids=batch, stream=options["stream"], lazy=options["lazy"]
+            ):
+                count += 1
+
+    # The whole query
+    else:
+        start = time.perf_counter()
+        count = 0
+        for article in pubmed.query(
+            options["query"],
+            max_results=options["articles"],
+            use_history=options["use_history"],
+            concurrency=options["concurrency"],
+            stream=options["stream"],
+            lazy=options["lazy"],
+            processes=options["processes"],
+            sharded=options["sharded"],
+            summary=options["summary"],
+        ):
+            count += 1
+
+    seconds = time.perf_counter() - start
+    return dict(
+        articles=count,
+        seconds=seconds,
+        articles_per_second=count / seconds,
+        peak_rss_mb=peakRSS(),
+        **summarize(metrics),
+    )
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """ Compare the results with those of an earlier run.
+
+        Parameters:
+            - results       Dict, results of this run.
+            - baseline      Dict, results of the earlier run.
+            - threshold     Float, relative change that counts as a regression.
+
+        Returns:
+            - regressions   List, descriptions of the regressions.
+    """
+
+    regressions = []
+    print(f"\nCompared with PyMed {baseline['version']}:")
+    for name, result in results["scenarios"].items():
+        if name not in baseline["scenarios"]:
+            continue
+        before = baseline["scenarios"][name]
+
+        # Fewer articles per second, or more memory, are regressions
+        speed = result["articles_per_second"] / before["articles_per_second"] - 1
+        memory = result["peak_rss_mb"] / before["peak_rss_mb"] - 1
+        print(f"{name:>10}: {speed:+7.1%} articles/sec, {memory:+7.1%} peak RSS")
+        if speed < -threshold:
+            regressions.append(f"{name}: {speed:+.1%} articles/sec")
+        if memory > threshold:
+            regressions.append(f"{name}: {memory:+.1%} peak RSS")
+
+    return regressions
+
+
+if __name__ == "__main__":
+
+    # Parse the command line arguments
+    parser = argparse.ArgumentParser(
+        description="Measure the throughput of PyMed against a local stand-in server"
+    )
+    parser.add_argument("--scenarios", nargs="*", choices=SCENARIOS, default=SCENARIOS)
+    parser.add_argument("--articles", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=1, help="keep the best run")
+    parser.add_argument("--query", default="benchmark")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument("--stream", action="store_true")
+    parser.add_argument("--lazy", action="store_true")
+    parser.add_argument("--use-history", action="store_true")
+    parser.add_argument("--sharded", action="store_true")
+    parser.add_argument("--summary", action="store_true")
+    parser.add_argument(
+        "--client-rate", type=float, help="requests per second of the client"
+    )
+    parser.add_argument("--url", help="use this server instead of starting one")
+    parser.add_argument("--save", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="JSON file with the results to compare with")
+    parser.add_argument("--threshold", type=float, default=0.1)
+    server.addArguments(parser)
+    arguments = parser.parse_args()
+
+    # Start the stand-in server (in this process, the scenarios run in others)
+    url = arguments.url
+    if url is None:
+        stand_in = server.fromArguments(arguments).start()
+        url = stand_in.url
+
+    # Run each scenario in a fresh process
+    results = {
+        "version": pymed.__version__,
+        "options": vars(arguments),
+        "scenarios": {},
+    }
+    context = multiprocessing.get_context("spawn")
+    for name in arguments.scenarios:
+        runs = []
+        for _ in range(arguments.repeat):
+            with context.Pool(processes=1) as pool:
+                runs.append(pool.apply(runScenario, (name, url, vars(arguments))))
+        result = max(runs, key=lambda run: run["articles_per_second"])
+        results["scenarios"][name] = result
+        print(
+            f"{name:>10}: {result['articles']:7d} articles in "
+            f"{result['seconds']:7.2f} s, "
+            f"{result['articles_per_second']:9.0f} articles/sec, "
+            f"{result['peak_rss_mb']:7.1f} MB peak RSS"
+        )
+        print(
+            f"{'':>12}requests {result['requests']} "
+            f"({result['request_seconds']:.2f} s, {result['retries']} retries), "
+            f"rate limit {result['rate_limit_seconds']:.2f} s, "
+            f"parsing {result['batch_parse_seconds']:.2f} s "
+            f"(articles {result['article_seconds']:.2f} s)"
+        )
+
+    # Requests handled by the server (including the rate limited and failed ones)
+    if arguments.url is None:
+        results["server"] = stand_in.stats
+        print(f"\nServer: {json.dumps(stand_in.stats, sort_keys=True)}")
+
+    # Keep the results to compare future runs with
+    if arguments.save:
+        with open(arguments.save, "w") as results_file:
+            json.dump(results, results_file, indent=4)
+
+    # Compare with an earlier run, and fail on regressions
+    if arguments.compare:
+        with open(arguments.compare) as baseline_file:
+            regressions = compare(
+                results, json.load(baseline_file), arguments.threshold
+            )
+        if regressions:
+            sys.exit("Regressions:\n" + "\n".join(regressions))
@@ -0,0 +1,504 @@
+import re
+import json
+import time
+import random
+import argparse
+import datetime
+import threading
+import urllib.parse
+
+import xml.etree.ElementTree as xml
+
+from http.server import ThreadingHTTPServer
+from http.server import BaseHTTPRequestHandler
+
+from corpus import record
+
+
+# Date ranges in the terms of sharded queries ("2001/01/01"[PDAT] : "2001/12/31"[PDAT])
+DATE_RANGE_PATTERN = re.compile(
+    r'"(\d{4})/(\d{2})/(\d{2})"\[PDAT\]\s*:\s*"(\d{4})/(\d{2})/(\d{2})"\[PDAT\]'
+)
+
+
+class Corpus(object):
+    """ The records served by the stand-in server: a synthetic corpus (see
+        corpus.py) or the records of recorded efetch responses.
+    """
+
+    def __init__(self: object, size: int = 5000, recorded: list = None) -> None:
+        """ Initialization of the object.
+
+            Parameters:
+                - size      Int, number of records of the synthetic corpus.
+                - recorded  List, paths of efetch XML files to serve instead.
+
+            Returns:
+                - None
+        """
+
+        self.records = {}
+        self.dates = {}
+        self.summaries = {}
+        self.cited_by = None
+
+        # Serve the records of real efetch responses
+        if recorded:
+            from pymed.parser import createArticle
+            from pymed.parser import getPubMedId
+            from pymed.parser import iterRecords
+            from pymed.table import toDate
+
+            for path in recorded:
+                with open(path, "rb") as recorded_file:
+                    for element in iterRecords(recorded_file.read()):
+                        pubmed_id = getPubMedId(element)
+                        self.records[pubmed_id] = xml.tostring(
+                            element, encoding="unicode"
+                        )
+                        self.dates[pubmed_id] = toDate(
+                            createArticle(element).publication_date
+                        )
+
+            # Most recent (highest) IDs first, like PubMed
+            self.ids = sorted(self.records, key=int, reverse=True)
+
+        # Generate the synthetic records on demand
+        else:
+            self.ids = [str(pmid) for pmid in range(size, 0, -1)]
+
+    def __len__(self: object) -> int:
+        return len(self.ids)
+
+    def record(self: object, pubmed_id: str) -> str:
+        if self.records:
+            return self.records.get(pubmed_id, "")
+        return record(int(pubmed_id))
+
+    def date(self: object, pubmed_id: str) -> datetime.date:
+        if self.records:
+            return self.dates.get(pubmed_id)
+
+        # The publication date of the synthetic records (see corpus.article)
+        pmid = int(pubmed_id)
+        return datetime.date(1990 + pmid % 35, 1 + pmid % 12, 1 + pmid % 28)
+
+    def summary(self: object, pubmed_id: str) -> dict:
+        """ Return the esummary document of a record (derived from its XML).
+        """
+
+        document = self.summaries.get(pubmed_id)
+        if document is not None:
+            return document
+
+        # Like esummary, report the IDs that do not exist
+        record = self.record(pubmed_id)
+        if not record:
+            return {"uid": pubmed_id, "error": "cannot get document summary"}
+
+        from pymed.parser import createArticle
+
+        article = createArticle(xml.fromstring(record))
+        date = article.publication_date
+        doi = getattr(article, "doi", None)
+        document = self.summaries[pubmed_id] = {
+            "uid": pubmed_id,
+            "title": article.title or "",
+            "fulljournalname": getattr(article, "journal", None) or "",
+            "history": [{"pubstatus": "pubmed", "date": f"{date:%Y/%m/%d} 06:00"}]
+            if isinstance(date, datetime.date)
+            else [],
+            "authors": [
+                {
+                    "name": f'{author.get("lastname")} {author.get("initials")}',
+                    "authtype": "Author",
+                }
+                for author in article.authors or []
+                if author.get("lastname")
+            ],
+            "articleids": [{"idtype": "pubmed", "value": pubmed_id}]
+            + ([{"idtype": "doi", "value": doi}] if doi else []),
+        }
+        return document
+
+    def references(self: object, pubmed_id: str) -> list:
+        """ Return the IDs of the records a record cites (only those in the corpus).
+        """
+
+        # The references of real records
+        if self.records:
+            element = xml.fromstring(self.records.get(pubmed_id) or "<None/>")
+            references = [
+                reference.text
+                for reference in element.iterfind(
+                    ".//ReferenceList//ArticleId[@IdType='pubmed']"
+                )
+                if reference.text in self.records
+            ]
+
+        # Synthetic records cite up to 10 older records
+        else:
+            pmid = int(pubmed_id)
+            rng = random.Random(pmid)
+            references = (
+                [str(rng.randint(1, pmid - 1)) for _ in range(10)]
+                if 1 < pmid <= len(self.ids)
+                else []
+            )
+
+        return list(dict.fromkeys(references))
+
+    def citedBy(self: object, pubmed_id: str) -> list:
+        """ Return the IDs of the records that cite a record.
+        """
+
+        # Index the references of all records on first use
+        if self.cited_by is None:
+            cited_by = {}
+            for citing_id in self.ids:
+                for reference in self.references(citing_id):
+                    cited_by.setdefault(reference, []).append(citing_id)
+            self.cited_by = cited_by
+        return self.cited_by.get(pubmed_id, [])
+
+    def search(self: object, term: str) -> list:
+        """ Return the IDs that match a term (only publication date ranges are
+            taken into account, every record matches any other term).
+        """
+
+        match = DATE_RANGE_PATTERN.search(term or "")
+        if match is None:
+            return self.ids
+        values = [int(value) for value in match.groups()]
+        start, end = datetime.date(*values[:3]), datetime.date(*values[3:])
+        dates = [(pubmed_id, self.date(pubmed_id)) for pubmed_id in self.ids]
+        return [
+            pubmed_id
+            for pubmed_id, date in dates
+            if date is not None and start <= date <= end
+        ]
+
+
+class RateLimit(object):
+    """ Token bucket per API key (or client address), like the rate limit of the
+        E-utilities.
+    """
+
+    def __init__(self: object, rate: float) -> None:
+        self.rate = rate
+        self.buckets = {}
+        self.lock = threading.Lock()
+
+    def allow(self: object, client: str) -> bool:
+        with self.lock:
+            now = time.monotonic()
+            tokens, updated = self.buckets.get(client, (self.rate, now))
+            tokens = min(self.rate, tokens + (now - updated) * self.rate)
+            allowed = tokens >= 1
+            self.buckets[client] = (tokens - 1 if allowed else tokens, now)
+            return allowed
+
+
+class Handler(BaseHTTPRequestHandler):
+    """ Handles the esearch, epost, esummary, elink and efetch requests (GET and
+        POST).
+    """
+
+    # Use keep-alive connections, like eutils.ncbi.nlm.nih.gov
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self: object, *args: list) -> None:
+        pass
+
+    def do_GET(self: object) -> None:
+        url = urllib.parse.urlsplit(self.path)
+
+        # Counts of the requests, rate limited requests and injected errors
+        if url.path == "/stats":
+            with self.server.lock:
+                stats = json.dumps(self.server.stats)
+            return self.respond(200, stats, "application/json")
+
+        self.handle_request(url.path, urllib.parse.parse_qs(url.query))
+
+    def do_POST(self: object) -> None:
+        self.server.count("post")
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length).decode()
+        parameters = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+        for name, values in urllib.parse.parse_qs(body).items():
+            parameters.setdefault(name, []).extend(values)
+        self.handle_request(urllib.parse.urlsplit(self.path).path, parameters)
+
+    def respond(
+        self: object, status: int, body: str, content_type: str, headers: dict = None
+    ) -> None:
+        body = body.encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def handle_request(self: object, path: str, parameters: dict) -> None:
+        server = self.server
+        endpoint = path.rsplit("/", 1)[-1].split(".", 1)[0]
+        server.count(endpoint)
+
+        # Simulate the latency of the E-utilities
+        if server.latency > 0:
+            time.sleep(server.latency)
+
+        # Refuse requests beyond the rate limit
+        client = parameters.get("api_key", [self.client_address[0]])[0]
+        if server.rate_limit is not None and not server.rate_limit.allow(client):
+            server.count("rate_limited")
+            return self.respond(
+                429,
+                json.dumps({"error": "API rate limit exceeded"}),
+                "application/json",
+                {"Retry-After": "1"},
+            )
+
+        # Inject transient errors
+        if server.random.random() < server.error_rate:
+            server.count("errors")
+            return self.respond(503, "Service unavailable", "text/plain")
+
+        if endpoint == "esearch":
+            return self.esearch(parameters)
+        elif endpoint == "epost":
+            return self.epost(parameters)
+        elif endpoint == "esummary":
+            return self.esummary(parameters)
+        elif endpoint == "elink":
+            return self.elink(parameters)
+        elif endpoint == "efetch":
+            return self.efetch(parameters)
+        self.respond(404, "Not found", "text/plain")
+
+    def ids(self: object, parameters: dict) -> list:
+        """ Return the IDs of a request (repeated and/or comma separated).
+        """
+
+        return [
+            pubmed_id
+            for value in parameters.get("id", [])
+            for pubmed_id in value.split(",")
+            if pubmed_id
+        ]
+
+    def esearch(self: object, parameters: dict) -> None:
+        server = self.server
+        term = parameters.get("term", [""])[0]
+        ids = server.corpus.search(term)
+        retstart = int(parameters.get("retstart", [0])[0])
+        retmax = int(parameters.get("retmax", [20])[0])
+
+        # Like the E-utilities, only the first IDs of a query can be retrieved
+        if server.max_search_results is not None:
+            if retstart >= server.max_search_results:
+                return self.respond(
+                    400,
+                    json.dumps(
+                        {"error": "Search Backend failed: retstart exceeds the limit"}
+                    ),
+                    "application/json",
+                )
+            retmax = min(retmax, server.max_search_results - retstart)
+
+        result = {
+            "count": str(len(ids)),
+            "retmax": str(len(ids[retstart : retstart + retmax])),
+            "retstart": str(retstart),
+            "idlist": ids[retstart : retstart + retmax],
+        }
+
+        # Keep the results on the "history server"
+        if parameters.get("usehistory", [""])[0] == "y":
+            with server.lock:
+                server.history.append(ids)
+                result["webenv"] = "BENCHMARK"
+                result["querykey"] = str(len(server.history))
+
+        self.respond(200, json.dumps({"esearchresult": result}), "application/json")
+
+    def epost(self: object, parameters: dict) -> None:
+        server = self.server
+
+        # Keep the uploaded IDs on the "history server"
+        with server.lock:
+            server.history.append(self.ids(parameters))
+            query_key = len(server.history)
+
+        self.respond(
+            200,
+            '<?xml version="1.0" ?>\n<ePostResult>\n'
+            f"<QueryKey>{query_key}</QueryKey>\n<WebEnv>BENCHMARK</WebEnv>\n"
+            "</ePostResult>",
+            "text/xml",
+        )
+
+    def requested(self: object, parameters: dict) -> list:
+        """ Return the IDs of an efetch or esummary request: from the history
+            server, or by ID.
+        """
+
+        if "WebEnv" in parameters:
+            ids = self.server.history[int(parameters["query_key"][0]) - 1]
+            retstart = int(parameters.get("retstart", [0])[0])
+            retmax = int(parameters.get("retmax", [20])[0])
+            return ids[retstart : retstart + retmax]
+        return self.ids(parameters)
+
+    def esummary(self: object, parameters: dict) -> None:
+        ids = self.requested(parameters)
+        result = {"uids": ids}
+        for pubmed_id in ids:
+            result[pubmed_id] = self.server.corpus.summary(pubmed_id)
+        self.respond(200, json.dumps({"result": result}), "application/json")
+
+    def elink(self: object, parameters: dict) -> None:
+        corpus = self.server.corpus
+        link_name = parameters.get("linkname", [""])[0]
+        links = corpus.references
+        if link_name == "pubmed_pubmed_citedin":
+            links = corpus.citedBy
+
+        # A linkset for each id parameter (with the links of all its IDs)
+        linksets = []
+        for value in parameters.get("id", []):
+            ids = [pubmed_id for pubmed_id in value.split(",") if pubmed_id]
+            linked = list(
+                dict.fromkeys(
+                    linked_id for pubmed_id in ids for linked_id in links(pubmed_id)
+                )
+            )
+            linkset = {"dbfrom": "pubmed", "ids": ids}
+            if linked:
+                linkset["linksetdbs"] = [
+                    {"dbto": "pubmed", "linkname": link_name, "links": linked}
+                ]
+            linksets.append(linkset)
+
+        self.respond(200, json.dumps({"linksets": linksets}), "application/json")
+
+    def efetch(self: object, parameters: dict) -> None:
+        server = self.server
+        ids = self.requested(parameters)
+
+        self.respond(
+            200,
+            '<?xml version="1.0" ?>\n<!DOCTYPE PubmedArticleSet>\n<PubmedArticleSet>\n'
+            + "\n".join(server.corpus.record(pubmed_id) for pubmed_id in ids)
+            + "\n</PubmedArticleSet>",
+            "text/xml",
+        )
+
+
+class Server(ThreadingHTTPServer):
+    """ Local stand-in for the E-utilities (esearch, epost, esummary, elink and
+        efetch).
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self: object,
+        port: int = 0,
+        corpus: Corpus = None,
+        latency: float = 0,
+        rate_limit: float = None,
+        error_rate: float = 0,
+        max_search_results: int = 9999,
+        seed: int = 0,
+    ) -> None:
+        """ Initialization of the object.
+
+            Parameters:
+                - port                  Int, port to listen on (0 picks a free port).
+                - corpus                Corpus, the records to serve.
+                - latency               Float, seconds added to every request.
+                - rate_limit            Float, requests per second allowed per API key
+                                        (or client), beyond which 429 is returned.
+                - error_rate            Float, fraction of the requests that fail with
+                                        503.
+                - max_search_results    Int, number of IDs esearch returns at most for
+                                        a query (None for no limit).
+                - seed                  Int, seed of the error injection.
+
+            Returns:
+                - None
+        """
+
+        super().__init__(("127.0.0.1", port), Handler)
+        self.corpus = corpus or Corpus()
+        self.latency = latency
+        self.rate_limit = RateLimit(rate_limit) if rate_limit else None
+        self.error_rate = error_rate
+        self.max_search_results = max_search_results
+        self.random = random.Random(seed)
+        self.history = []
+        self.stats = {}
+        self.lock = threading.Lock()
+
+    @property
+    def url(self: object) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+    def count(self: object, name: str) -> None:
+        with self.lock:
+            self.stats[name] = self.stats.get(name, 0) + 1
+
+    def start(self: object) -> "Server":
+        """ Serve the requests on a background thread.
+        """
+
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+
+def addArguments(parser: argparse.ArgumentParser) -> None:
+    """ Add the options of the server to a command line parser.
+    """
+
+    parser.add_argument("--size", type=int, default=5000, help="synthetic records")
+    parser.add_argument("--recorded", nargs="*", help="efetch XML files to serve")
+    parser.add_argument("--latency", type=float, default=0, help="seconds per request")
+    parser.add_argument("--rate-limit", type=float, help="requests per second")
+    parser.add_argument("--error-rate", type=float, default=0, help="fraction of 503s")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def fromArguments(arguments: argparse.Namespace, port: int = 0) -> Server:
+    """ Create a server with the options from the command line.
+    """
+
+    return Server(
+        port=port,
+        corpus=Corpus(size=arguments.size, recorded=arguments.recorded),
+        latency=arguments.latency,
+        rate_limit=arguments.rate_limit,
+        error_rate=arguments.error_rate,
+        seed=arguments.seed,
+    )
+
+
+if __name__ == "__main__":
+
+    # Parse the command line arguments
+    parser = argparse.ArgumentParser(description="Local stand-in for the E-utilities")
+    parser.add_argument("--port", type=int, default=8000)
+    addArguments(parser)
+    arguments = parser.parse_args()
+
+    # Serve until interrupted
+    server = fromArguments(arguments, port=arguments.port)
+    print(f"Serving {len(server.corpus)} records on {server.url}")
+    print(f'Use PubMed(base_url="{server.url}")')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -1,7 +1,5 @@
-import csv
-import itertools
-
 from pymed import PubMed
+from pymed.graph import CoAuthorshipGraph
 
 
 # Create a PubMed object that GraphQL can use to query
@@ -13,70 +11,13 @@ pubmed = PubMed(tool="Author co-occurence analysis", email="my@email.address")
 query = "occupational health[Title]"
 
 
-# Execute the query against the API
-results = list(pubmed.query(query, max_results=1344))
-
-
-# Create a node for each unique author
-nodes = {
-    author: index
-    for index, author in enumerate(
-        set(
-            itertools.chain.from_iterable(
-                [
-                    [
-                        f'{author["lastname"]} {author["firstname"]}'
-                        for author in article.authors
-                    ]
-                    for article in results
-                ]
-            )
-        )
-    )
-}
-
-# Create an edge for each combination of authors (co-authorship)
-edges = list(
-    itertools.chain.from_iterable(
-        [
-            [combination for combination in itertools.combinations(co_author_list, 2)]
-            for co_author_list in [
-                [
-                    nodes[f'{author["lastname"]} {author["firstname"]}']
-                    for author in article.authors
-                ]
-                for article in results
-            ]
-        ]
-    )
-)
-
-# De-duplicate the list of edges by adding a weight
-edges = set([(edge[0], edge[1], edges.count(edge)) for edge in edges])
-
-
-# Open the nodes file
-with open("./nodes.csv", "w", encoding="utf8", newline="") as nodes_file:
-
-    # Create a CSV writer
-    writer = csv.writer(nodes_file, delimiter=",")
-
-    # Write the header
-    writer.writerow(["id", "label"])
-
-    # Loop over the authors and create rows
-    for name, index in nodes.items():
-        writer.writerow([index, name])
-
-
-with open("./edges.csv", "w", encoding="utf8", newline="") as edge_file:
+# Execute the query against the API, only decoding the authors of each article
+results = pubmed.query(query, max_results=1344, lazy=True)
 
-    # Create a CSV writer
-    writer = csv.writer(edge_file, delimiter=",")
+# Create a node for each unique author, and a weighted edge for each combination
+# of authors (co-authorship)
+graph = CoAuthorshipGraph().extend(results)
 
-    # Write the header
-    writer.writerow(["source", "target", "weight"])
 
-    # Loop over the edges and put them in the file
-    for edge in edges:
-        writer.writerow(edge)
+# Write the nodes and the edges to CSV files
+graph.toCSV(nodes_path="./nodes.csv", edges_path="./edges.csv")
@@ -1,4 +1,5 @@
 from .api import PubMed
+from .async_api import AsyncPubMed
 from .version import __version__
 
-__all__ = ["PubMed", "__version__"]
+__all__ = ["PubMed", "AsyncPubMed", "__version__"]
@@ -1,26 +1,106 @@
+import os
+import time
+import logging
 import datetime
 import requests
 import itertools
+import collections
 
 import xml.etree.ElementTree as xml
 
+from concurrent.futures import wait
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import ProcessPoolExecutor
+
+from typing import Tuple
 from typing import Union
+from requests.adapters import HTTPAdapter
 
+from .ids import ArticleIds
+from .cache import SearchCache
+from .metrics import Metrics
+from .cache import ArticleCache
 from .helpers import batches
-from .article import PubMedArticle
-from .book import PubMedBookArticle
-
+from .helpers import readJSON
+from .helpers import writeJSON
+from .helpers import retryDelay
+from .helpers import dateBuckets
+from .helpers import dateRangeQuery
+from .parser import getPubMedId
+from .parser import iterRecords
+from .parser import splitRecords
+from .parser import createArticle
+from .parser import iterRecordsStream
+from .parser import parseArticlesDetached
+from .summary import parseSummaries
+from .ratelimit import getRateLimiter
+
+
+logger = logging.getLogger(__name__)
 
 # Base url for all queries
 BASE_URL = "https://eutils.ncbi.nlm.nih.gov"
 
+# HTTP status codes that indicate a transient failure worth retrying
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+# Number of articles per efetch request (by ID list or from the history server)
+BATCH_SIZE = 250
+HISTORY_BATCH_SIZE = 10000
+
+# Number of articles per efetch request of PubMed.fetch (the IDs are sent as POST)
+FETCH_BATCH_SIZE = 1000
+
+# Number of summaries per esummary request (by ID list, the IDs are sent as POST)
+SUMMARY_BATCH_SIZE = 5000
+
+# Number of articles per elink request, and the links of each citation direction
+ELINK_BATCH_SIZE = 100
+LINK_NAMES = {"references": "pubmed_pubmed_refs", "cited_by": "pubmed_pubmed_citedin"}
+
+# Number of article IDs above which requests are sent as POST instead of GET (NCBI
+# recommends POST for more than about 200 IDs, long URLs are refused)
+MAX_GET_IDS = 200
+
+# Maximum number of article IDs esearch returns for a query (retstart is capped)
+MAX_SEARCH_RESULTS = 9999
+
+# Publication dates covered by sharded queries
+SHARD_START_DATE = datetime.date(1000, 1, 1)
+SHARD_END_DATE = datetime.date(3000, 12, 31)
+
+# Search tags of the fields that facets counts the results of each value of
+FACET_FIELDS = {
+    "journal": "jour",
+    "publication_type": "pt",
+    "language": "la",
+    "mesh": "mh",
+    "author": "au",
+}
+
+# Finer interval that the buckets of a histogram are refined into
+REFINED_INTERVALS = {"year": "month", "month": "day"}
+
 
 class PubMed(object):
     """ Wrapper around the PubMed API.
     """
 
     def __init__(
-        self: object, tool: str = "my_tool", email: str = "my_email@example.com"
+        self: object,
+        tool: str = "my_tool",
+        email: str = "my_email@example.com",
+        api_key: str = None,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        pool_maxsize: int = 10,
+        timeout: Union[float, Tuple[float, float]] = (10, 60),
+        cache: ArticleCache = None,
+        search_cache: SearchCache = None,
+        metrics: Metrics = None,
+        base_url: str = BASE_URL,
+        link_cache: SearchCache = None,
     ) -> None:
         """ Initialization of the object.
 
@@ -30,6 +110,30 @@ class PubMed(object):
                             PMC (PubMed Central).
                 - email     String, email of the user of the tool. This parameter
                             is not required but kindly requested by PMC (PubMed Central).
+                - api_key   String, NCBI API key. When provided the rate limit is
+                            raised from 3 to 10 requests per second.
+                - max_retries       Int, number of times a request is retried after a
+                                    connection error, timeout, 429 or 5xx response.
+                - backoff_factor    Float, base delay in seconds for the exponential
+                                    backoff between retries.
+                - pool_maxsize      Int, maximum number of keep-alive connections that
+                                    are kept open to PubMed.
+                - timeout           Float / tuple, timeout in seconds for each request,
+                                    either a single value or (connect, read).
+                - cache             ArticleCache, local cache of article XML. Articles
+                                    that are cached (and not stale) are not fetched
+                                    again, and fetched articles are added to it.
+                - search_cache      SearchCache, cache of esearch results (result
+                                    counts and lists of article IDs).
+                - metrics           Metrics, collects counters and latency histograms
+                                    of the requests and the parsing, and calls hooks
+                                    for each of these events.
+                - base_url          String, URL of the E-utilities (e.g. of a local
+                                    server for testing and benchmarking).
+                - link_cache        SearchCache, cache of the links of each article
+                                    (ELink, used by citations). Kept apart from the
+                                    search cache, as it has an entry per article:
+                                    give it room for many entries and a long ttl.
 
             Returns:
                 - None
@@ -38,40 +142,632 @@ class PubMed(object):
         # Store the input parameters
         self.tool = tool
         self.email = email
+        self.api_key = api_key
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.timeout = timeout
+        self.cache = cache
+        self.search_cache = search_cache
+        self.metrics = metrics
+        self.base_url = base_url
+        self.link_cache = link_cache
+
+        # Reuse connections to PubMed between requests (retries are handled in _get)
+        self._session = requests.Session()
+        self._session.mount(
+            "https://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        )
+        self._session.mount(
+            "http://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_maxsize)
+        )
 
-        # Keep track of the rate limit
-        self._rateLimit = 3
-        self._requestsMade = []
+        # Share the rate limit with every other instance that uses the same key
+        self._rateLimiter = getRateLimiter(api_key=api_key)
 
         # Define the standard / default query parameters
         self.parameters = {"tool": tool, "email": email, "db": "pubmed"}
+        if api_key is not None:
+            self.parameters["api_key"] = api_key
+
+    def query(
+        self: object,
+        query: str,
+        max_results: int = 100,
+        use_history: bool = False,
+        concurrency: int = 1,
+        ordered: bool = True,
+        stream: bool = False,
+        lazy: bool = False,
+        fields: list = None,
+        processes: int = 1,
+        sharded: bool = False,
+        journal: str = None,
+        summary: bool = False,
+    ):
+        """ Method that executes a query against PubMed and retrieves the articles.
+
+            Parameters:
+                - query         String, the query to send to PubMed.
+                - max_results   Int, the maximum number of results to retrieve (-1
+                                retrieves everything).
+                - use_history   Bool, keep the search results on the Entrez History
+                                server and fetch the articles from there, instead of
+                                retrieving the article IDs first.
+                - concurrency   Int, number of efetch batches that are retrieved and
+                                parsed at the same time (all requests still share
+                                the rate limit).
+                - ordered       Bool, when fetching concurrently, yield the articles
+                                in the order of the results (True) or in the order
+                                the batches complete (False).
+                - stream        Bool, parse each efetch response while it is being
+                                downloaded and return every article as soon as it
+                                is complete. Keeps memory usage flat regardless of
+                                the batch size.
+                - lazy          Bool, decode the fields of each article when they are
+                                first accessed, instead of all fields up front.
+                - fields        List, names of the fields of lazy articles that are
+                                decoded right away.
+                - processes     Int, number of processes that parse the efetch
+                                responses, while this process keeps fetching. The
+                                articles are returned in order, without their XML
+                                element (stream and lazy do not apply).
+                - sharded       Bool, split the query into publication date ranges
+                                that each have fewer results than esearch returns
+                                (MAX_SEARCH_RESULTS), and retrieve the article IDs
+                                of these shards concurrently. Required to retrieve
+                                more results than that (without use_history).
+                - journal       String, directory in which the article IDs and every
+                                retrieved batch are kept, so an interrupted query
+                                continues where it stopped when it is executed
+                                again (with the same journal). Batches that were
+                                already retrieved are read from the journal. The
+                                articles are always retrieved by ID (combining it
+                                with use_history raises a ValueError, the history
+                                server forgets the results after a few hours).
+                - summary       Bool, retrieve the summaries of the articles (from
+                                esummary, in large batches) instead of the articles
+                                themselves. Much faster when only the title,
+                                journal, date, authors and DOI are needed (stream,
+                                lazy, fields, processes and journal do not apply).
+
+            Returns:
+                - articles      Iterator, yields PubMedArticle and PubMedBookArticle
+                                objects (or PubMedSummary objects).
+        """
+
+        # Summaries are small enough to retrieve again
+        if summary and journal is not None:
+            raise ValueError("The summaries of a query can not be journaled")
+
+        # The history server forgets the results before an interrupted query is
+        # resumed, journaled queries retrieve the articles by ID
+        if use_history and journal is not None:
+            raise ValueError("Journaled queries can not use the history server")
 
-    def query(self: object, query: str, max_results: int = 100):
-        """ Method that executes a query agains the GraphQL schema, automatically
-            inserting the PubMed data loader.
+        # Parse in other processes, only fetch the raw responses here
+        raw = processes > 1 and not summary
+
+        # Resume the query from the journal
+        if journal is not None:
+
+            # Retrieve the article IDs for the query (or read them from the journal)
+            article_ids = self._openJournal(
+                journal=journal,
+                query=query,
+                max_results=max_results,
+                sharded=sharded,
+                concurrency=concurrency,
+            )
+
+            # Get the articles themselves, skipping the network for finished batches
+            articles = [
+                self._getJournaledArticles(
+                    journal=journal,
+                    index=index,
+                    article_ids=batch,
+                    stream=stream,
+                    lazy=lazy,
+                    fields=fields,
+                    raw=raw,
+                )
+                for index, batch in enumerate(batches(article_ids, BATCH_SIZE))
+            ]
+
+        # Fetch the articles directly from the history server
+        elif use_history:
+
+            # Store the search results on the history server
+            history = self._searchHistory(query=query)
+
+            # Calculate a cut off point based on the max_results parameter
+            total_result_count = history["count"]
+            if max_results != -1:
+                total_result_count = min(total_result_count, max_results)
+
+            # Get the articles (or summaries) in batches from the history server
+            if summary:
+                articles = [
+                    self._getSummariesFromHistory(
+                        history=history,
+                        retstart=retstart,
+                        retmax=min(HISTORY_BATCH_SIZE, total_result_count - retstart),
+                    )
+                    for retstart in range(0, total_result_count, HISTORY_BATCH_SIZE)
+                ]
+            else:
+                articles = list(
+                    [
+                        self._getArticlesFromHistory(
+                            history=history,
+                            retstart=retstart,
+                            retmax=min(
+                                HISTORY_BATCH_SIZE, total_result_count - retstart
+                            ),
+                            stream=stream,
+                            lazy=lazy,
+                            fields=fields,
+                            raw=raw,
+                        )
+                        for retstart in range(
+                            0, total_result_count, HISTORY_BATCH_SIZE
+                        )
+                    ]
+                )
+
+        else:
+
+            # Retrieve the article IDs for the query
+            if sharded:
+                article_ids = self._getShardedArticleIds(
+                    query=query, max_results=max_results, concurrency=concurrency
+                )
+            else:
+                article_ids = self._getArticleIds(query=query, max_results=max_results)
+
+            # Get the summaries of the articles
+            if summary:
+                articles = [
+                    self._getSummaries(article_ids=batch)
+                    for batch in batches(article_ids, SUMMARY_BATCH_SIZE)
+                ]
+
+            # Get the articles themselves
+            else:
+                articles = list(
+                    [
+                        self._getArticles(
+                            article_ids=batch,
+                            stream=stream,
+                            lazy=lazy,
+                            fields=fields,
+                            raw=raw,
+                        )
+                        for batch in batches(article_ids, BATCH_SIZE)
+                    ]
+                )
+
+        # Fetch the responses on a thread, and parse them on a pool of processes
+        if raw:
+            return self._parseConcurrently(
+                payloads=self._getConcurrently(
+                    batches=articles, concurrency=concurrency, ordered=ordered
+                ),
+                processes=processes,
+                ordered=ordered,
+            )
+
+        # Retrieve multiple batches at the same time
+        if concurrency > 1:
+            return self._getConcurrently(
+                batches=articles, concurrency=concurrency, ordered=ordered
+            )
+
+        # Chain the batches back together and return the list
+        return itertools.chain.from_iterable(articles)
+
+    def sync(
+        self: object,
+        query: str,
+        state_path: str,
+        concurrency: int = 1,
+        ordered: bool = True,
+        stream: bool = False,
+        lazy: bool = False,
+        fields: list = None,
+    ):
+        """ Method that keeps a local copy of the results of a query up to date.
+            The first sync retrieves all articles, every next sync only the
+            articles that were added (EDAT) or modified (MDAT) since the last one.
+
+            When the PubMed object has a cache, the new and revised articles
+            replace the cached ones. The date of the sync is recorded in the state
+            file (per query) once all articles have been retrieved, so an
+            interrupted sync is repeated the next time.
 
             Parameters:
-                - query     String, the GraphQL query to execute against the schema.
+                - query         String, the query to send to PubMed.
+                - state_path    String, path of the JSON file that keeps the date of
+                                the last sync of each query.
+                - concurrency   Int, number of esearch requests and efetch batches
+                                that are made and parsed at the same time.
+                - ordered       Bool, when fetching concurrently, yield the articles
+                                in the order of the results.
+                - stream        Bool, parse each efetch response while it is being
+                                downloaded.
+                - lazy          Bool, decode the fields of each article when they are
+                                first accessed.
+                - fields        List, names of the fields of lazy articles that are
+                                decoded right away.
 
             Returns:
-                - result    ExecutionResult, GraphQL object that contains the result
-                            in the "data" attribute.
+                - articles      Iterator, yields the new and revised PubMedArticle
+                                and PubMedBookArticle objects.
         """
 
-        # Retrieve the article IDs for the query
-        article_ids = self._getArticleIds(query=query, max_results=max_results)
+        # The start of this sync is the starting point of the next one
+        started = datetime.date.today()
+
+        # Only search for records that were added or modified since the last sync,
+        # starting a day earlier as PubMed dates are in US Eastern Time
+        state = readJSON(state_path, default={})
+        term = query
+        if query in state:
+            last_sync = datetime.datetime.strptime(
+                state[query]["last_sync"], "%Y/%m/%d"
+            ).date() - datetime.timedelta(days=1)
+            since = last_sync.strftime("%Y/%m/%d")
+            term = (
+                f'({query}) AND ("{since}"[EDAT] : "3000"[EDAT] '
+                f'OR "{since}"[MDAT] : "3000"[MDAT])'
+            )
+
+        # Retrieve the IDs of the new and revised articles (split by publication
+        # date, a first sync or a large delta has more results than esearch returns)
+        article_ids = self._getShardedArticleIds(
+            query=term, max_results=-1, concurrency=concurrency
+        )
+
+        # Make sure the revised articles are fetched again instead of read from
+        # the cache (they are added to the cache again when they are fetched)
+        if self.cache is not None:
+            self.cache.invalidate(article_ids)
 
         # Get the articles themselves
-        articles = list(
-            [
-                self._getArticles(article_ids=batch)
-                for batch in batches(article_ids, 250)
+        articles = [
+            self._getArticles(
+                article_ids=batch, stream=stream, lazy=lazy, fields=fields
+            )
+            for batch in batches(article_ids, BATCH_SIZE)
+        ]
+        if concurrency > 1:
+            yield from self._getConcurrently(
+                batches=articles, concurrency=concurrency, ordered=ordered
+            )
+        else:
+            yield from itertools.chain.from_iterable(articles)
+
+        # Record the date of this sync (re-reading the state, other queries may
+        # have been synced in the meantime)
+        state = readJSON(state_path, default={})
+        state[query] = {
+            "last_sync": started.strftime("%Y/%m/%d"),
+            "articles": len(article_ids),
+        }
+        writeJSON(state_path, state)
+
+    def fetch(
+        self: object,
+        article_ids: list,
+        batch_size: int = FETCH_BATCH_SIZE,
+        use_history: bool = False,
+        concurrency: int = 1,
+        ordered: bool = True,
+        stream: bool = False,
+        lazy: bool = False,
+        fields: list = None,
+        processes: int = 1,
+        summary: bool = False,
+    ):
+        """ Method that retrieves the articles of a list of PubMed IDs (e.g. from
+            another system). The IDs are sent in the body of POST requests, so the
+            number of articles per request is not limited by the length of the URL.
+
+            Parameters:
+                - article_ids   List, PubMed IDs of the articles.
+                - batch_size    Int, number of articles per efetch request (efetch
+                                returns at most HISTORY_BATCH_SIZE).
+                - use_history   Bool, upload the IDs to the Entrez History server
+                                once (epost) and fetch the articles from there,
+                                instead of sending the IDs with every request.
+                                Cached articles are fetched again.
+                - concurrency   Int, number of efetch batches that are retrieved and
+                                parsed at the same time.
+                - ordered       Bool, when fetching concurrently, yield the articles
+                                in the order of the IDs (True) or in the order the
+                                batches complete (False).
+                - stream        Bool, parse each efetch response while it is being
+                                downloaded.
+                - lazy          Bool, decode the fields of each article when they are
+                                first accessed.
+                - fields        List, names of the fields of lazy articles that are
+                                decoded right away.
+                - processes     Int, number of processes that parse the efetch
+                                responses (see query).
+                - summary       Bool, retrieve the summaries of the articles instead
+                                of the articles themselves (see query).
+
+            Returns:
+                - articles      Iterator, yields PubMedArticle and PubMedBookArticle
+                                objects (or PubMedSummary objects).
+        """
+
+        # Parse in other processes, only fetch the raw responses here
+        raw = processes > 1 and not summary
+
+        # Accept IDs as numbers too, and respect the maximum of efetch
+        article_ids = ArticleIds(article_ids)
+        batch_size = min(batch_size, HISTORY_BATCH_SIZE)
+
+        # Upload the IDs once, and get the articles in batches from the history server
+        if use_history:
+            history = self._postHistory(article_ids=article_ids) if article_ids else {}
+            articles = [
+                self._getSummariesFromHistory(
+                    history=history,
+                    retstart=retstart,
+                    retmax=min(batch_size, len(article_ids) - retstart),
+                )
+                if summary
+                else self._getArticlesFromHistory(
+                    history=history,
+                    retstart=retstart,
+                    retmax=min(batch_size, len(article_ids) - retstart),
+                    stream=stream,
+                    lazy=lazy,
+                    fields=fields,
+                    raw=raw,
+                )
+                for retstart in range(0, len(article_ids), batch_size)
             ]
-        )
 
-        # Chain the batches back together and return the list
+        # Send the IDs of each batch
+        else:
+            articles = [
+                self._getSummaries(article_ids=batch)
+                if summary
+                else self._getArticles(
+                    article_ids=batch, stream=stream, lazy=lazy, fields=fields, raw=raw
+                )
+                for batch in batches(article_ids, batch_size)
+            ]
+
+        # Fetch the responses on a thread, and parse them on a pool of processes
+        if raw:
+            return self._parseConcurrently(
+                payloads=self._getConcurrently(
+                    batches=articles, concurrency=concurrency, ordered=ordered
+                ),
+                processes=processes,
+                ordered=ordered,
+            )
+
+        # Retrieve multiple batches at the same time
+        if concurrency > 1:
+            return self._getConcurrently(
+                batches=articles, concurrency=concurrency, ordered=ordered
+            )
+
+        # Chain the batches back together
         return itertools.chain.from_iterable(articles)
 
+    def citations(
+        self: object,
+        article_ids: list,
+        direction: str = "references",
+        depth: int = 1,
+        batch_size: int = ELINK_BATCH_SIZE,
+        concurrency: int = 1,
+        max_nodes: int = None,
+    ) -> dict:
+        """ Method that expands a set of articles by their references and/or the
+            articles that cite them (ELink), breadth-first up to a given depth.
+            The links of many articles are retrieved per request, so the number of
+            requests grows with the number of articles per level divided by the
+            batch size. Each article is visited once, and its links are kept in
+            the link cache (if any).
+
+            Parameters:
+                - article_ids   List, PubMed IDs of the articles to start from.
+                - direction     Str, follow the "references" of the articles, the
+                                articles they are "cited_by", or "both".
+                - depth         Int, number of levels to expand.
+                - batch_size    Int, number of articles per elink request.
+                - concurrency   Int, number of elink requests made at the same time
+                                (all requests still share the rate limit).
+                - max_nodes     Int, stop adding articles to the graph when it has
+                                this many (None for no limit).
+
+            Returns:
+                - graph         Dict, the linked articles of each visited article
+                                (None for the articles of the last level, which
+                                were not expanded). The keys are all articles in
+                                the graph, e.g. to pass to fetch.
+        """
+
+        # The links to follow
+        if direction == "both":
+            link_names = list(LINK_NAMES.values())
+        elif direction in LINK_NAMES:
+            link_names = [LINK_NAMES[direction]]
+        else:
+            raise ValueError(f"Unknown direction: {direction}")
+
+        # Every visited article, in the order they were found
+        graph = dict.fromkeys(str(article_id) for article_id in article_ids)
+        frontier = list(graph)
+
+        for _ in range(depth):
+
+            # Retrieve the links of all articles of this level
+            links = self._getLinks(
+                article_ids=frontier,
+                link_names=link_names,
+                batch_size=batch_size,
+                concurrency=concurrency,
+            )
+
+            # Add the articles that were not visited yet to the next level
+            next_frontier = []
+            for article_id in frontier:
+                graph[article_id] = links[article_id]
+                for linked_id in links[article_id]:
+                    if linked_id not in graph and (
+                        max_nodes is None or len(graph) < max_nodes
+                    ):
+                        graph[linked_id] = None
+                        next_frontier.append(linked_id)
+
+            frontier = next_frontier
+            if len(frontier) == 0:
+                break
+
+        return graph
+
+    def search(
+        self: object,
+        query: str,
+        max_results: int = 100,
+        sharded: bool = False,
+        concurrency: int = 1,
+    ) -> ArticleIds:
+        """ Method that retrieves the IDs of the articles that match a query (without
+            the articles themselves), e.g. to combine the results of queries:
+            pubmed.fetch(pubmed.search("a") - pubmed.search("b")).
+
+            Parameters:
+                - query         String, the query to send to PubMed.
+                - max_results   Int, the maximum number of results to retrieve (-1
+                                retrieves everything).
+                - sharded       Bool, split the query into publication date ranges
+                                (see query).
+                - concurrency   Int, number of esearch requests made at the same time
+                                (for sharded queries).
+
+            Returns:
+                - article_ids   ArticleIds, the IDs (most recent first).
+        """
+
+        if sharded:
+            return self._getShardedArticleIds(
+                query=query, max_results=max_results, concurrency=concurrency
+            )
+        return self._getArticleIds(query=query, max_results=max_results)
+
+    def facets(
+        self: object, query: str, field: str, values: list, concurrency: int = 1
+    ) -> dict:
+        """ Method that counts the results of a query for each value of a field
+            (e.g. journals or publication types), without retrieving any articles:
+            a single count-only esearch request per value.
+
+            Parameters:
+                - query         String, the query to send to PubMed.
+                - field         String, the field (see FACET_FIELDS), e.g. "journal"
+                                or "publication_type".
+                - values        List, the values to count the results of, e.g.
+                                ["Lancet", "BMJ"] or ["Review", "Clinical Trial"].
+                - concurrency   Int, number of requests made at the same time (all
+                                requests still share the rate limit).
+
+            Returns:
+                - counts        Dict, the number of results of each value (in the
+                                order of the values).
+        """
+
+        if field not in FACET_FIELDS:
+            raise ValueError(f"Unknown field: {field}")
+
+        values = list(values)
+        counts = self._countConcurrently(
+            queries=[
+                f'({query}) AND "{value}"[{FACET_FIELDS[field]}]' for value in values
+            ],
+            concurrency=concurrency,
+        )
+        return dict(zip(values, counts))
+
+    def histogram(
+        self: object,
+        query: str,
+        start: Union[int, datetime.date],
+        end: Union[int, datetime.date] = None,
+        interval: str = "year",
+        refine: int = None,
+        concurrency: int = 1,
+    ) -> dict:
+        """ Method that counts the results of a query per year, month or day of
+            publication, without retrieving any articles: a single count-only
+            esearch request per bucket.
+
+            Parameters:
+                - query         String, the query to send to PubMed.
+                - start         Int / date, first year (or date) of the histogram.
+                - end           Int / date, last year (or date) of the histogram
+                                (defaults to today).
+                - interval      String, size of the buckets: "year", "month" or
+                                "day".
+                - refine        Int, split buckets with more results than this into
+                                months (years) or days (months), e.g. to zoom in on
+                                the busy periods of a trend.
+                - concurrency   Int, number of requests made at the same time (all
+                                requests still share the rate limit).
+
+            Returns:
+                - histogram     Dict, the number of results of each bucket ("2019",
+                                "2019/03" or "2019/03/05"), in chronological order.
+        """
+
+        # Years cover the whole year
+        if isinstance(start, int):
+            start = datetime.date(start, 1, 1)
+        if end is None:
+            end = datetime.date.today()
+        elif isinstance(end, int):
+            end = datetime.date(end, 12, 31)
+
+        # Count the results of the buckets, and of the refined buckets of those
+        # with too many results
+        histogram = {}
+        buckets = [bucket + (interval,) for bucket in dateBuckets(start, end, interval)]
+        while buckets:
+            counts = self._countConcurrently(
+                queries=[
+                    dateRangeQuery(query, bucket_start, bucket_end)
+                    for _, bucket_start, bucket_end, _ in buckets
+                ],
+                concurrency=concurrency,
+            )
+            refined = []
+            for (key, bucket_start, bucket_end, bucket_interval), count in zip(
+                buckets, counts
+            ):
+                if (
+                    refine is not None
+                    and count > refine
+                    and bucket_interval in REFINED_INTERVALS
+                ):
+                    finer = REFINED_INTERVALS[bucket_interval]
+                    refined += [
+                        bucket + (finer,)
+                        for bucket in dateBuckets(bucket_start, bucket_end, finer)
+                    ]
+                else:
+                    histogram[key] = count
+            buckets = refined
+
+        # The keys sort chronologically
+        return dict(sorted(histogram.items()))
+
     def getTotalResultsCount(self: object, query: str) -> int:
         """ Helper method that returns the total number of results that match the query.
 
@@ -90,30 +786,49 @@ class PubMed(object):
         parameters["retmax"] = 1
 
         # Make the request (request a single article ID for this search)
-        response = self._get(url="/entrez/eutils/esearch.fcgi", parameters=parameters)
+        response = self._search(parameters=parameters)
 
         # Get from the returned meta data the total number of available results for the query
         total_results_count = int(response.get("esearchresult", {}).get("count"))
 
         # Return the total number of results (without retrieving them)
         return total_results_count
-    
-    def _exceededRateLimit(self) -> bool:
-        """ Helper method to check if we've exceeded the rate limit.
+
+    def _search(self: object, parameters: dict) -> dict:
+        """ Helper method that makes an esearch request, using the search cache
+            when possible.
+
+            Parameters:
+                - parameters    Dict, parameters to use for the request.
 
             Returns:
-                - exceeded      Bool, Whether or not the rate limit is exceeded.
+                - response      Dict, the parsed esearch response.
         """
 
-        # Remove requests from the list that are longer than 1 second ago
-        self._requestsMade = [requestTime for requestTime in self._requestsMade if requestTime > datetime.datetime.now() - datetime.timedelta(seconds=1)]
+        # Use the cached result
+        if self.search_cache is not None:
+            response = self.search_cache.get(parameters)
+            if response is not None:
+                return response
+
+        # Make the request
+        response = self._get(url="/entrez/eutils/esearch.fcgi", parameters=parameters)
+
+        # Cache the result for the next time
+        if self.search_cache is not None:
+            self.search_cache.put(parameters, response)
 
-        # Return whether we've made more requests in the last second, than the rate limit
-        return len(self._requestsMade) > self._rateLimit
+        # Return the response
+        return response
 
     def _get(
-        self: object, url: str, parameters: dict, output: str = "json"
-    ) -> Union[dict, str]:
+        self: object,
+        url: str,
+        parameters: dict,
+        output: str = "json",
+        stream: bool = False,
+        post: bool = False,
+    ) -> Union[dict, str, requests.Response]:
         """ Generic helper method that makes a request to PubMed.
 
             Parameters:
@@ -122,64 +837,1048 @@ class PubMed(object):
                 - parameters    Dict, parameters to use for the request
                 - output        Str, type of output that is requested (defaults to
                                 JSON but can be used to retrieve XML)
+                - stream        Bool, return the response before its body is read,
+                                so it can be consumed as a stream
+                - post          Bool, send the parameters in the body of a POST
+                                request instead of the URL (e.g. long lists of IDs)
 
             Returns:
-                - response      Dict / str, if the response is valid JSON it will
-                                be parsed before returning, otherwise a string is
-                                returend
+                - response      Dict / str / Response, if the response is valid JSON
+                                it will be parsed before returning, otherwise a string
+                                is returned (or the response itself when streaming)
         """
 
-        # Make sure the rate limit is not exceeded
-        while self._exceededRateLimit():
-            pass
-
         # Set the response mode
         parameters["retmode"] = output
 
-        # Make the request to PubMed
-        response = requests.get(f"{BASE_URL}{url}", params=parameters)
+        # Name of the E-utility (e.g. "efetch") for the metrics
+        metrics = self.metrics
+        endpoint = url.rsplit("/", 1)[-1].split(".", 1)[0]
+
+        for attempt in range(self.max_retries + 1):
+
+            # Wait until the rate limit allows another request
+            waited = self._rateLimiter.acquire()
+            if metrics is not None:
+                metrics.observeRateLimit(seconds=waited)
+
+            # Make the request to PubMed, retry on connection problems
+            start = time.perf_counter()
+            try:
+                if post:
+                    response = self._session.post(
+                        f"{self.base_url}{url}",
+                        data=parameters,
+                        timeout=self.timeout,
+                        stream=stream,
+                    )
+                else:
+                    response = self._session.get(
+                        f"{self.base_url}{url}",
+                        params=parameters,
+                        timeout=self.timeout,
+                        stream=stream,
+                    )
+            except (requests.ConnectionError, requests.Timeout) as error:
+                if metrics is not None:
+                    metrics.observeRequest(
+                        endpoint=endpoint,
+                        status=None,
+                        seconds=time.perf_counter() - start,
+                        bytes=0,
+                        attempt=attempt,
+                    )
+                if attempt == self.max_retries:
+                    raise
+                delay = retryDelay(attempt=attempt, backoff_factor=self.backoff_factor)
+                if metrics is not None:
+                    metrics.observeRetry(
+                        endpoint=endpoint,
+                        attempt=attempt,
+                        delay=delay,
+                        reason=type(error).__name__,
+                    )
+                time.sleep(delay)
+                continue
+
+            # Record the request (the size of streamed responses is not known yet)
+            if metrics is not None:
+                metrics.observeRequest(
+                    endpoint=endpoint,
+                    status=response.status_code,
+                    seconds=time.perf_counter() - start,
+                    bytes=int(response.headers.get("Content-Length", 0))
+                    if stream
+                    else len(response.content),
+                    attempt=attempt,
+                )
+
+            # Retry transient errors until we run out of attempts
+            if (
+                response.status_code in RETRY_STATUS_CODES
+                and attempt < self.max_retries
+            ):
+                response.close()
+                delay = retryDelay(
+                    attempt=attempt,
+                    backoff_factor=self.backoff_factor,
+                    retry_after=response.headers.get("Retry-After"),
+                )
+                if metrics is not None:
+                    metrics.observeRetry(
+                        endpoint=endpoint,
+                        attempt=attempt,
+                        delay=delay,
+                        reason=str(response.status_code),
+                    )
+                time.sleep(delay)
+                continue
+
+            break
 
         # Check for any errors
         response.raise_for_status()
 
-        # Add this request to the list of requests made
-        self._requestsMade.append(datetime.datetime.now())
-
         # Return the response
-        if output == "json":
+        if stream:
+            return response
+        elif output == "json":
             return response.json()
         else:
             return response.text
 
-    def _getArticles(self: object, article_ids: list) -> list:
+    def _getConcurrently(
+        self: object, batches: list, concurrency: int, ordered: bool = True
+    ) -> list:
+        """ Helper method that retrieves and parses batches of articles on a pool
+            of threads.
+
+            Parameters:
+                - batches       List, generators that each retrieve a batch of
+                                articles (as returned by _getArticles).
+                - concurrency   Int, number of batches to retrieve at the same time.
+                - ordered       Bool, yield the batches in order (True) or as soon
+                                as they are completed (False).
+
+            Returns:
+                - articles      List, yields the article objects.
+        """
+
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+
+        try:
+            for articles in self._runConcurrently(
+                executor=executor,
+                function=list,
+                items=((batch,) for batch in batches),
+                window=2 * concurrency,
+                ordered=ordered,
+            ):
+                yield from articles
+        finally:
+            executor.shutdown(wait=False)
+
+    def _parseConcurrently(
+        self: object, payloads: list, processes: int, ordered: bool = True
+    ) -> list:
+        """ Helper method that parses efetch responses on a pool of processes.
+
+            Parameters:
+                - payloads      List, yields the efetch responses (XML), each with
+                                a bool that tells whether it was fetched (True) or
+                                read from the cache (False), or the list of the
+                                fetched PubMed IDs (when it is partly cached).
+                - processes     Int, number of processes to parse with.
+                - ordered       Bool, yield the articles in the order of the
+                                responses (True) or as soon as they are parsed
+                                (False).
+
+            Returns:
+                - articles      List, yields the article objects.
+        """
+
+        executor = ProcessPoolExecutor(max_workers=processes)
+
+        try:
+            for articles, records in self._runConcurrently(
+                executor=executor,
+                function=parseArticlesDetached,
+                items=(
+                    (payload, fetched and self.cache is not None)
+                    for payload, fetched in payloads
+                ),
+                window=2 * processes,
+                ordered=ordered,
+            ):
+
+                # Add the fetched records to the cache
+                if len(records) > 0:
+                    self.cache.putRecords(records)
+
+                yield from articles
+        finally:
+            executor.shutdown(wait=False)
+
+    def _runConcurrently(
+        self: object,
+        executor: object,
+        function: object,
+        items: list,
+        window: int,
+        ordered: bool = True,
+    ) -> list:
+        """ Helper method that calls a function for each item on an executor.
+
+            Parameters:
+                - executor      Executor, pool of threads or processes to use.
+                - function      Callable, called with the arguments of each item.
+                - items         List, tuples of arguments (consumed one by one).
+                - window        Int, maximum number of items submitted at a time.
+                - ordered       Bool, yield the results in the order of the items
+                                (True) or as soon as they are completed (False).
+
+            Returns:
+                - results       List, yields the results of the function.
+        """
+
+        items = iter(items)
+
+        # Keep the workers busy, but limit the number of results held in memory
+        pending = [
+            executor.submit(function, *item) for item in itertools.islice(items, window)
+        ]
+
+        try:
+            while pending:
+
+                # Wait for the next item in line, or any item that is done
+                if ordered:
+                    done = [pending[0]]
+                else:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+
+                for future in done:
+
+                    # Replace the completed item with a new one
+                    pending.remove(future)
+                    for item in itertools.islice(items, 1):
+                        pending.append(executor.submit(function, *item))
+
+                    # Return the result of the completed item
+                    yield future.result()
+
+        finally:
+
+            # Stop submitting items when the caller stops iterating (or on errors)
+            for future in pending:
+                future.cancel()
+
+    def _getArticles(
+        self: object,
+        article_ids: list,
+        stream: bool = False,
+        lazy: bool = False,
+        fields: list = None,
+        raw: bool = False,
+    ) -> list:
         """ Helper method that batches a list of article IDs and retrieves the content.
 
             Parameters:
                 - article_ids   List, article IDs.
+                - stream        Bool, parse the response while it is being downloaded.
+                - lazy          Bool, decode the fields of the articles on first access.
+                - fields        List, names of the fields of lazy articles that are
+                                decoded right away.
+                - raw           Bool, return the unparsed efetch responses instead
+                                of article objects (each with a bool that tells
+                                whether it was fetched, or the list of the fetched
+                                PubMed IDs when it is partly cached).
 
             Returns:
-                - articles      List, article objects.
+                - articles      List, article objects (or efetch responses), in
+                                the order of the IDs.
         """
 
         # Get the default parameters
         parameters = self.parameters.copy()
         parameters["id"] = article_ids
 
+        # Use the cached articles, and only fetch the articles that are missing
+        cached = self.cache.getMany(article_ids) if self.cache is not None else {}
+        if len(cached) > 0:
+            article_ids = [str(article_id) for article_id in article_ids]
+            parameters["id"] = [
+                article_id for article_id in article_ids if article_id not in cached
+            ]
+
+            # Combine the cached and fetched records into a single response, in
+            # the order of the IDs (only the fetched records are to be cached)
+            if raw:
+                records = {}
+                if len(parameters["id"]) > 0:
+                    records = splitRecords(self._efetch(parameters=parameters))
+                yield "<PubmedArticleSet>{}</PubmedArticleSet>".format(
+                    "".join(
+                        cached.get(article_id) or records.pop(article_id, "")
+                        for article_id in article_ids
+                    )
+                    + "".join(records.values())
+                ), parameters["id"]
+                return
+
+            # Return the cached and fetched articles in the order of the IDs
+            fetched = []
+            if len(parameters["id"]) > 0:
+                fetched = self._fetchArticleRecords(
+                    parameters=parameters, stream=stream, lazy=lazy, fields=fields
+                )
+            yield from self._mergeArticles(
+                article_ids=article_ids,
+                cached=cached,
+                fetched=fetched,
+                lazy=lazy,
+                fields=fields,
+            )
+            return
+
+        # Make the request and parse the response into article objects
+        yield from self._fetchArticles(
+            parameters=parameters, stream=stream, lazy=lazy, fields=fields, raw=raw
+        )
+
+    def _fetchArticles(
+        self: object,
+        parameters: dict,
+        stream: bool = False,
+        lazy: bool = False,
+        fields: list = None,
+        raw: bool = False,
+    ) -> list:
+        """ Helper method that makes an efetch request and parses the response.
+
+            Parameters:
+                - parameters    Dict, parameters to use for the request.
+                - stream        Bool, parse the response while it is being downloaded.
+                - lazy          Bool, decode the fields of the articles on first access.
+                - fields        List, names of the fields of lazy articles that are
+                                decoded right away.
+                - raw           Bool, return the unparsed efetch response (and True)
+                                instead of article objects, the records are not
+                                cached.
+
+            Returns:
+                - articles      List, article objects (or the efetch response).
+        """
+
+        # Leave the parsing (and caching) to the caller
+        if raw:
+            yield self._efetch(parameters=parameters), True
+            return
+
+        # Make the request and parse the response into article objects
+        yield from self._createArticles(
+            records=self._fetchRecords(parameters=parameters, stream=stream),
+            lazy=lazy,
+            fields=fields,
+        )
+
+    def _fetchArticleRecords(
+        self: object,
+        parameters: dict,
+        stream: bool = False,
+        lazy: bool = False,
+        fields: list = None,
+    ) -> list:
+        """ Helper method that makes an efetch request and parses the response, like
+            _fetchArticles, but yields the PubMed ID of each record with its article.
+
+            Parameters:
+                - parameters    Dict, parameters to use for the request.
+                - stream        Bool, parse the response while it is being downloaded.
+                - lazy          Bool, decode the fields of the articles on first access.
+                - fields        List, names of the fields of lazy articles that are
+                                decoded right away.
+
+            Returns:
+                - articles      List, tuples of the PubMed ID and the article object.
+        """
+
+        # Keep the IDs of the records that are turned into articles (one at a time)
+        pubmed_ids = collections.deque()
+
+        def keepIds(records: list) -> list:
+            for record in records:
+                pubmed_ids.append(getPubMedId(record))
+                yield record
+
+        for article in self._createArticles(
+            records=keepIds(self._fetchRecords(parameters=parameters, stream=stream)),
+            lazy=lazy,
+            fields=fields,
+        ):
+            yield pubmed_ids.popleft(), article
+
+    def _mergeArticles(
+        self: object,
+        article_ids: list,
+        cached: dict,
+        fetched: list,
+        lazy: bool = False,
+        fields: list = None,
+    ) -> list:
+        """ Helper method that combines cached and fetched articles in the order of
+            their IDs. Fetched articles are returned as soon as the articles before
+            them are.
+
+            Parameters:
+                - article_ids   List, article IDs (str), in order.
+                - cached        Dict, XML of the cached records per PubMed ID.
+                - fetched       List, tuples of the PubMed ID and the article object
+                                of the fetched records.
+                - lazy          Bool, decode the fields of the articles on first access.
+                - fields        List, names of the fields of lazy articles that are
+                                decoded right away.
+
+            Returns:
+                - articles      List, article objects.
+        """
+
+        # Fetched articles that are not due yet
+        pending = {}
+        position = 0
+
+        # A final round (without an article) returns the remaining articles
+        for pubmed_id, article in itertools.chain(fetched, [(None, None)]):
+            if pubmed_id is not None:
+                pending[pubmed_id] = article
+
+            # Return the articles in order, until one that is not fetched yet
+            while position < len(article_ids):
+                article_id = article_ids[position]
+                if article_id in cached:
+                    yield createArticle(
+                        xml.fromstring(cached[article_id]), lazy=lazy, fields=fields
+                    )
+                elif article_id in pending:
+                    yield pending.pop(article_id)
+                elif pubmed_id is not None:
+                    break
+                position += 1
+
+        # Records that were returned for other IDs
+        yield from pending.values()
+
+    def _createArticles(
+        self: object,
+        records: list,
+        cache: Union[bool, list] = True,
+        lazy: bool = False,
+        fields: list = None,
+    ) -> list:
+        """ Helper method that creates the article objects of records, and adds the
+            records to the cache.
+
+            Parameters:
+                - records       List, PubmedArticle and PubmedBookArticle elements.
+                - cache         Bool / list, add the records to the cache (if any),
+                                or only those of the PubMed IDs in the list.
+                - lazy          Bool, decode the fields of the articles on first access.
+                - fields        List, names of the fields of lazy articles that are
+                                decoded right away.
+
+            Returns:
+                - articles      List, article objects.
+        """
+
+        # Records that still have to be added to the cache
+        uncached = []
+        cache_ids = set(cache) if isinstance(cache, list) else None
+        cache = bool(cache) and self.cache is not None
+
+        # Measure the time spent parsing the batch
+        metrics = self.metrics
+        if metrics is not None:
+            records = metrics.timeBatch(records)
+
+        try:
+            for record in records:
+
+                # Add the record to the cache (in chunks)
+                if cache and (cache_ids is None or getPubMedId(record) in cache_ids):
+                    uncached.append(record)
+                    if len(uncached) >= 100:
+                        self.cache.putMany(uncached)
+                        uncached = []
+
+                # Construct the article object
+                if metrics is None:
+                    yield createArticle(record, lazy=lazy, fields=fields)
+                else:
+                    start = time.perf_counter()
+                    article = createArticle(record, lazy=lazy, fields=fields)
+                    metrics.observeArticle(
+                        article=article, seconds=time.perf_counter() - start
+                    )
+                    yield article
+
+        finally:
+            if len(uncached) > 0:
+                self.cache.putMany(uncached)
+
+    def _fetchRecords(self: object, parameters: dict, stream: bool = False) -> list:
+        """ Helper method that makes an efetch request and parses the response into
+            the elements of the records. The request is made right away, the
+            response is parsed while the records are retrieved.
+
+            Parameters:
+                - parameters    Dict, parameters to use for the request.
+                - stream        Bool, parse the response while it is being downloaded.
+
+            Returns:
+                - records       List, PubmedArticle and PubmedBookArticle elements.
+        """
+
         # Make the request
+        response = self._efetch(parameters=parameters, stream=stream)
+
+        # Parse the records while the response is coming in
+        if stream:
+            return self._streamRecords(response=response)
+
+        # Parse the whole response at once
+        return iterRecords(response)
+
+    def _efetch(
+        self: object, parameters: dict, stream: bool = False
+    ) -> Union[str, requests.Response]:
+        """ Helper method that makes an efetch request, as POST when it has more
+            article IDs than fit in a URL (MAX_GET_IDS).
+
+            Parameters:
+                - parameters    Dict, parameters to use for the request.
+                - stream        Bool, return the response before its body is read.
+
+            Returns:
+                - response      Str / Response, the efetch response (XML).
+        """
+
+        return self._get(
+            url="/entrez/eutils/efetch.fcgi",
+            parameters=parameters,
+            output="xml",
+            stream=stream,
+            post=len(parameters.get("id", [])) > MAX_GET_IDS,
+        )
+
+    def _streamRecords(self: object, response: requests.Response) -> list:
+        """ Helper method that parses a streamed efetch response into the elements of
+            the records, and closes the response when it is done.
+
+            Parameters:
+                - response      Response, the streamed efetch response.
+
+            Returns:
+                - records       List, PubmedArticle and PubmedBookArticle elements.
+        """
+
+        with response:
+            response.raw.decode_content = True
+            yield from iterRecordsStream(response.raw)
+
+    def _openJournal(
+        self: object,
+        journal: str,
+        query: str,
+        max_results: int,
+        sharded: bool = False,
+        concurrency: int = 1,
+    ) -> ArticleIds:
+        """ Helper method that reads the article IDs of a query from its journal,
+            or retrieves them and starts a new journal.
+
+            Parameters:
+                - journal       Str, directory of the journal.
+                - query         Str, query to be executed against the PubMed database.
+                - max_results   Int, the maximum number of results to retrieve.
+                - sharded       Bool, split the query into publication date ranges.
+                - concurrency   Int, number of esearch requests made at the same time
+                                (for sharded queries).
+
+            Returns:
+                - article_ids   ArticleIds, article IDs.
+        """
+
+        filename = os.path.join(journal, "query.json")
+
+        # Continue an earlier run of the same query
+        state = readJSON(filename)
+        if state is not None:
+            if state["query"] != query or state["max_results"] != max_results:
+                raise ValueError(
+                    f"The journal in {journal} belongs to a different query: "
+                    f"{state['query']} (max_results={state['max_results']})"
+                )
+            return ArticleIds(state["article_ids"])
+
+        # Retrieve the article IDs for the query
+        if sharded:
+            article_ids = self._getShardedArticleIds(
+                query=query, max_results=max_results, concurrency=concurrency
+            )
+        else:
+            article_ids = self._getArticleIds(query=query, max_results=max_results)
+
+        # Start the journal
+        os.makedirs(journal, exist_ok=True)
+        writeJSON(
+            filename,
+            {
+                "query": query,
+                "max_results": max_results,
+                "article_ids": list(article_ids),
+            },
+        )
+
+        return article_ids
+
+    def _getJournaledArticles(
+        self: object,
+        journal: str,
+        index: int,
+        article_ids: list,
+        stream: bool = False,
+        lazy: bool = False,
+        fields: list = None,
+        raw: bool = False,
+    ) -> list:
+        """ Helper method that retrieves a batch of articles once, and keeps the
+            efetch responses in the journal. When the batch was retrieved before,
+            the articles are read from the journal instead.
+
+            Parameters:
+                - journal       Str, directory of the journal.
+                - index         Int, index of the batch.
+                - article_ids   List, article IDs of the batch.
+                - stream        Bool, parse the responses while they are being read.
+                - lazy          Bool, decode the fields of the articles on first access.
+                - fields        List, names of the fields of lazy articles that are
+                                decoded right away.
+                - raw           Bool, return the unparsed efetch responses instead
+                                of article objects (each with a bool that tells
+                                whether it was fetched, or the list of the fetched
+                                PubMed IDs).
+
+            Returns:
+                - articles      List, article objects (or efetch responses).
+        """
+
+        filename = os.path.join(journal, f"{index:06d}")
+        parts = readJSON(f"{filename}.json")
+
+        # Retrieve the batch and write the responses to the journal, the list of
+        # responses is written last and marks the batch as finished
+        if parts is None:
+            parts = []
+            for part, (payload, fetched) in enumerate(
+                self._getArticles(article_ids=article_ids, raw=True)
+            ):
+                with open(f"{filename}-{part}.tmp", "w", encoding="utf8") as part_file:
+                    part_file.write(payload)
+                os.replace(f"{filename}-{part}.tmp", f"{filename}-{part}.xml")
+                parts.append((f"{index:06d}-{part}.xml", fetched))
+            writeJSON(f"{filename}.json", parts)
+
+        # Batches from an earlier run are already cached (if they were fetched)
+        else:
+            parts = [(part_filename, False) for part_filename, _ in parts]
+
+        # Read the responses from the journal
+        for part_filename, fetched in parts:
+            part_filename = os.path.join(journal, part_filename)
+            if raw:
+                with open(part_filename, "r", encoding="utf8") as part_file:
+                    yield part_file.read(), fetched
+                continue
+            with open(part_filename, "rb") as part_file:
+                records = (
+                    iterRecordsStream(part_file)
+                    if stream
+                    else iterRecords(part_file.read())
+                )
+                yield from self._createArticles(
+                    records=records, cache=fetched, lazy=lazy, fields=fields
+                )
+
+    def _getArticlesFromHistory(
+        self: object,
+        history: dict,
+        retstart: int,
+        retmax: int,
+        stream: bool = False,
+        lazy: bool = False,
+        fields: list = None,
+        raw: bool = False,
+    ) -> list:
+        """ Helper method that retrieves a batch of articles from the history server.
+
+            Parameters:
+                - history       Dict, search results on the history server (as
+                                returned by _searchHistory).
+                - retstart      Int, index of the first article to retrieve.
+                - retmax        Int, number of articles to retrieve.
+                - stream        Bool, parse the response while it is being downloaded.
+                - lazy          Bool, decode the fields of the articles on first access.
+                - fields        List, names of the fields of lazy articles that are
+                                decoded right away.
+                - raw           Bool, return the unparsed efetch response instead of
+                                article objects.
+
+            Returns:
+                - articles      List, article objects (or the efetch response).
+        """
+
+        # Get the default parameters
+        parameters = self.parameters.copy()
+
+        # Point to the search results on the history server
+        parameters["WebEnv"] = history["webenv"]
+        parameters["query_key"] = history["query_key"]
+        parameters["retstart"] = retstart
+        parameters["retmax"] = retmax
+
+        # Make the request and parse the response into article objects
+        yield from self._fetchArticles(
+            parameters=parameters, stream=stream, lazy=lazy, fields=fields, raw=raw
+        )
+
+    def _getSummaries(self: object, article_ids: list) -> list:
+        """ Helper method that retrieves the summaries of a batch of article IDs.
+
+            Parameters:
+                - article_ids   List, article IDs.
+
+            Returns:
+                - summaries     List, PubMedSummary objects.
+        """
+
+        # Get the default parameters
+        parameters = self.parameters.copy()
+        parameters["id"] = article_ids
+
+        # Make the request (as POST when the IDs do not fit in a URL)
         response = self._get(
-            url="/entrez/eutils/efetch.fcgi", parameters=parameters, output="xml"
+            url="/entrez/eutils/esummary.fcgi",
+            parameters=parameters,
+            post=len(article_ids) > MAX_GET_IDS,
         )
 
-        # Parse as XML
-        root = xml.fromstring(response)
+        # Parse the response into summary objects
+        yield from parseSummaries(response)
+
+    def _getSummariesFromHistory(
+        self: object, history: dict, retstart: int, retmax: int
+    ) -> list:
+        """ Helper method that retrieves a batch of summaries from the history server.
+
+            Parameters:
+                - history       Dict, results on the history server (as returned
+                                by _searchHistory or _postHistory).
+                - retstart      Int, index of the first summary to retrieve.
+                - retmax        Int, number of summaries to retrieve.
+
+            Returns:
+                - summaries     List, PubMedSummary objects.
+        """
 
-        # Loop over the articles and construct article objects
-        for article in root.iter("PubmedArticle"):
-            yield PubMedArticle(xml_element=article)
-        for book in root.iter("PubmedBookArticle"):
-            yield PubMedBookArticle(xml_element=book)
+        # Get the default parameters
+        parameters = self.parameters.copy()
 
-    def _getArticleIds(self: object, query: str, max_results: int) -> list:
+        # Point to the results on the history server
+        parameters["WebEnv"] = history["webenv"]
+        parameters["query_key"] = history["query_key"]
+        parameters["retstart"] = retstart
+        parameters["retmax"] = retmax
+
+        # Make the request and parse the response into summary objects
+        response = self._get(url="/entrez/eutils/esummary.fcgi", parameters=parameters)
+        yield from parseSummaries(response)
+
+    def _countConcurrently(self: object, queries: list, concurrency: int = 1) -> list:
+        """ Helper method that returns the total number of results of queries.
+
+            Parameters:
+                - queries       List, the queries to send to PubMed.
+                - concurrency   Int, number of requests made at the same time.
+
+            Returns:
+                - counts        List, the number of results of each query.
+        """
+
+        if concurrency <= 1:
+            return [self.getTotalResultsCount(query=query) for query in queries]
+
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+        try:
+            return list(executor.map(self.getTotalResultsCount, queries))
+        finally:
+            executor.shutdown(wait=False)
+
+    def _getLinks(
+        self: object,
+        article_ids: list,
+        link_names: list,
+        batch_size: int = ELINK_BATCH_SIZE,
+        concurrency: int = 1,
+    ) -> dict:
+        """ Helper method that retrieves the links of articles, using the link
+            cache when possible.
+
+            Parameters:
+                - article_ids   List, article IDs.
+                - link_names    List, names of the links (see LINK_NAMES).
+                - batch_size    Int, number of articles per elink request.
+                - concurrency   Int, number of elink requests made at the same time.
+
+            Returns:
+                - links         Dict, the linked article IDs of each article (of all
+                                link names together, without duplicates).
+        """
+
+        links = {article_id: {} for article_id in article_ids}
+
+        # Use the cached links, and only request the links that are missing
+        link_requests = []
+        for link_name in link_names:
+            missing = []
+            for article_id in article_ids:
+                cached = None
+                if self.link_cache is not None:
+                    cached = self.link_cache.get(
+                        {"linkname": link_name, "id": article_id}
+                    )
+                if cached is None:
+                    missing.append(article_id)
+                else:
+                    links[article_id].update(dict.fromkeys(cached))
+            link_requests += [
+                (batch, link_name) for batch in batches(missing, batch_size)
+            ]
+
+        # Make the requests (a few at a time)
+        if concurrency > 1:
+            executor = ThreadPoolExecutor(max_workers=concurrency)
+            try:
+                responses = list(
+                    self._runConcurrently(
+                        executor=executor,
+                        function=self._requestLinks,
+                        items=link_requests,
+                        window=2 * concurrency,
+                        ordered=False,
+                    )
+                )
+            finally:
+                executor.shutdown(wait=False)
+        else:
+            responses = [self._requestLinks(*request) for request in link_requests]
+
+        # Combine the links, and cache them for the next time
+        for link_name, response in responses:
+            for article_id, linked_ids in response.items():
+                links[article_id].update(dict.fromkeys(linked_ids))
+                if self.link_cache is not None:
+                    self.link_cache.put(
+                        {"linkname": link_name, "id": article_id}, linked_ids
+                    )
+
+        return {article_id: list(linked) for article_id, linked in links.items()}
+
+    def _requestLinks(self: object, article_ids: list, link_name: str) -> tuple:
+        """ Helper method that makes an elink request for a batch of articles.
+
+            Parameters:
+                - article_ids   List, article IDs.
+                - link_name     Str, name of the links (see LINK_NAMES).
+
+            Returns:
+                - link_name     Str, name of the links.
+                - links         Dict, the linked article IDs of each article.
+        """
+
+        # Get the default parameters
+        parameters = self.parameters.copy()
+
+        # Separate id parameters keep the links of each article apart
+        parameters["dbfrom"] = "pubmed"
+        parameters["linkname"] = link_name
+        parameters["id"] = list(article_ids)
+
+        # Make the request (as POST when the IDs do not fit in a URL)
+        response = self._get(
+            url="/entrez/eutils/elink.fcgi",
+            parameters=parameters,
+            post=len(article_ids) > MAX_GET_IDS,
+        )
+
+        # Collect the links of each article (articles without links have none)
+        links = {article_id: [] for article_id in article_ids}
+        for linkset in response.get("linksets", []):
+            for article_id in linkset.get("ids", []):
+                if str(article_id) not in links:
+                    continue
+                for linksetdb in linkset.get("linksetdbs", []):
+                    if linksetdb.get("linkname") == link_name:
+                        links[str(article_id)] = [
+                            str(linked_id) for linked_id in linksetdb.get("links", [])
+                        ]
+
+        return link_name, links
+
+    def _postHistory(self: object, article_ids: list) -> dict:
+        """ Helper method that uploads a list of article IDs to the history server.
+
+            Parameters:
+                - article_ids   List, article IDs.
+
+            Returns:
+                - history       Dict, the number of IDs ("count") and the references
+                                to the IDs on the history server ("webenv" and
+                                "query_key"), like _searchHistory.
+        """
+
+        # Get the default parameters
+        parameters = self.parameters.copy()
+        parameters["id"] = ",".join(article_ids)
+
+        # Make the request (epost only returns XML)
+        response = xml.fromstring(
+            self._get(
+                url="/entrez/eutils/epost.fcgi",
+                parameters=parameters,
+                output="xml",
+                post=True,
+            )
+        )
+
+        # Return the references to the history server
+        return {
+            "count": len(article_ids),
+            "webenv": response.findtext("WebEnv"),
+            "query_key": response.findtext("QueryKey"),
+        }
+
+    def _searchHistory(self: object, query: str) -> dict:
+        """ Helper method that stores the results of a query on the history server.
+
+            Parameters:
+                - query         Str, query to be executed against the PubMed database.
+
+            Returns:
+                - history       Dict, the total number of results ("count") and the
+                                references to the results on the history server
+                                ("webenv" and "query_key").
+        """
+
+        # Get the default parameters
+        parameters = self.parameters.copy()
+
+        # Keep the results on the history server, without returning any IDs
+        parameters["term"] = query
+        parameters["usehistory"] = "y"
+        parameters["retmax"] = 0
+
+        # Make the request
+        response = self._get(url="/entrez/eutils/esearch.fcgi", parameters=parameters)
+        result = response.get("esearchresult", {})
+
+        # Return the references to the history server
+        return {
+            "count": int(result.get("count")),
+            "webenv": result.get("webenv"),
+            "query_key": result.get("querykey"),
+        }
+
+    def _getShardedArticleIds(
+        self: object, query: str, max_results: int, concurrency: int = 1
+    ) -> ArticleIds:
+        """ Helper method to retrieve the article IDs for a query with more results
+            than esearch returns, by splitting it into publication date ranges.
+
+            Parameters:
+                - query         Str, query to be executed against the PubMed database.
+                - max_results   Int, the maximum number of results to retrieve (-1
+                                retrieves everything).
+                - concurrency   Int, number of esearch requests made at the same time.
+
+            Returns:
+                - article_ids   ArticleIds, article IDs (most recent first).
+        """
+
+        # A query with few enough results does not have to be split
+        if 0 <= max_results <= MAX_SEARCH_RESULTS:
+            return self._getArticleIds(query=query, max_results=max_results)
+
+        executor = ThreadPoolExecutor(max_workers=concurrency)
+
+        try:
+
+            # Halve the date ranges until each has few enough results (a single
+            # day can not be split, only its first results are retrieved)
+            shards = []
+            ranges = [(SHARD_START_DATE, SHARD_END_DATE)]
+            while ranges:
+                counts = executor.map(
+                    lambda dates: self.getTotalResultsCount(
+                        dateRangeQuery(query, *dates)
+                    ),
+                    ranges,
+                )
+                split = []
+                for (start, end), count in zip(ranges, counts):
+                    if count == 0:
+                        continue
+                    elif count <= MAX_SEARCH_RESULTS:
+                        shards.append((start, end, -1))
+                    elif start == end:
+                        logger.warning(
+                            "%d articles were published on %s, only the first %d "
+                            "are retrieved",
+                            count,
+                            start.strftime("%Y/%m/%d"),
+                            MAX_SEARCH_RESULTS,
+                        )
+                        shards.append((start, end, MAX_SEARCH_RESULTS))
+                    else:
+                        middle = start + (end - start) // 2
+                        split.append((start, middle))
+                        split.append((middle + datetime.timedelta(days=1), end))
+                ranges = split
+
+            # Retrieve the IDs of the shards concurrently, most recent first
+            shard_ids = executor.map(
+                lambda shard: self._getArticleIds(
+                    query=dateRangeQuery(query, *shard[:2]), max_results=shard[2]
+                ),
+                sorted(shards, reverse=True),
+            )
+
+            # Merge the IDs, without duplicates (articles with more than one
+            # publication date can match multiple shards)
+            article_ids = ArticleIds()
+            for ids in shard_ids:
+                article_ids += ids
+            article_ids = article_ids.unique()
+
+        finally:
+            executor.shutdown(wait=False)
+
+        # Cut off the IDs based on the max_results parameter
+        if max_results != -1:
+            article_ids = article_ids[:max_results]
+
+        return article_ids
+
+    def _getArticleIds(self: object, query: str, max_results: int) -> ArticleIds:
         """ Helper method to retrieve the article IDs for a query.
 
             Parameters:
@@ -187,11 +1886,11 @@ class PubMed(object):
                 - max_results   Int, the maximum number of results to retrieve.
 
             Returns:
-                - article_ids   List, article IDs as a list.
+                - article_ids   ArticleIds, article IDs (in the order of the results).
         """
 
         # Create a placeholder for the retrieved IDs
-        article_ids = []
+        article_ids = ArticleIds()
 
         # Get the default parameters
         parameters = self.parameters.copy()
@@ -201,9 +1900,18 @@ class PubMed(object):
         parameters["retmax"] = 50000
 
         # Calculate a cut off point based on the max_results parameter
-        if max_results < parameters["retmax"]:
+        if max_results != -1 and max_results < parameters["retmax"]:
             parameters["retmax"] = max_results
 
+        # Reuse the cached IDs as long as the number of results has not changed
+        if self.search_cache is not None:
+            cache_parameters = dict(parameters, retmax=None, max_results=max_results)
+            cached = self.search_cache.get(cache_parameters, ignore_ttl=True)
+            if cached is not None and cached["count"] == self.getTotalResultsCount(
+                query=query
+            ):
+                return ArticleIds(cached["idlist"])
+
         # Make the first request to PubMed
         response = self._get(url="/entrez/eutils/esearch.fcgi", parameters=parameters)
 
@@ -239,5 +1947,12 @@ class PubMed(object):
             # Get information from the response
             retrieved_count += int(response.get("esearchresult", {}).get("retmax"))
 
+        # Cache the IDs, together with the number of results they belong to
+        if self.search_cache is not None:
+            self.search_cache.put(
+                cache_parameters,
+                {"count": total_result_count, "idlist": article_ids.values.tolist()},
+            )
+
         # Return the response
         return article_ids
@@ -5,7 +5,55 @@ from xml.etree.ElementTree import Element
 from typing import TypeVar
 from typing import Optional
 
+from .author import Author
 from .helpers import getContent
+from .extractor import FieldExtractor
+
+
+# Paths of all fields, extracted in a single traversal of the article
+EXTRACTOR = FieldExtractor(
+    texts={
+        "pubmed_id": "ArticleId[@IdType='pubmed']",
+        "title": "ArticleTitle",
+        "journal": "Journal/Title",
+        "abstract": "AbstractText",
+        "conclusions": "AbstractText[@Label='CONCLUSION']",
+        "methods": "AbstractText[@Label='METHOD']",
+        "results": "AbstractText[@Label='RESULTS']",
+        "copyrights": "CopyrightInformation",
+        "doi": "ArticleId[@IdType='doi']",
+    },
+    lists={"keywords": "Keyword"},
+    elements={"publication_date": "PubMedPubDate[@PubStatus='pubmed']"},
+    records={
+        "authors": (
+            "Author",
+            {
+                "lastname": "LastName",
+                "firstname": "ForeName",
+                "initials": "Initials",
+                "affiliation": "AffiliationInfo/Affiliation",
+            },
+            Author,
+        )
+    },
+)
+
+# Methods that extract a single field, used to decode the fields of lazy articles
+FIELD_EXTRACTORS = {
+    "pubmed_id": "_extractPubMedId",
+    "title": "_extractTitle",
+    "abstract": "_extractAbstract",
+    "keywords": "_extractKeywords",
+    "journal": "_extractJournal",
+    "publication_date": "_extractPublicationDate",
+    "authors": "_extractAuthors",
+    "methods": "_extractMethods",
+    "conclusions": "_extractConclusions",
+    "results": "_extractResults",
+    "copyrights": "_extractCopyrights",
+    "doi": "_extractDoi",
+}
 
 
 class PubMedArticle(object):
@@ -32,13 +80,28 @@ class PubMedArticle(object):
         self: object,
         xml_element: Optional[TypeVar("Element")] = None,
         *args: list,
+        lazy: bool = False,
+        fields: Optional[list] = None,
         **kwargs: dict,
     ) -> None:
         """ Initialization of the object from XML or from parameters.
+
+            Parameters:
+                - xml_element   Element, the XML element to parse.
+                - lazy          Bool, decode each field from the XML element when it
+                                is first accessed, instead of all fields up front.
+                - fields        List, names of the fields of a lazy article that are
+                                decoded right away.
         """
 
+        # Keep the XML element and only decode the requested fields
+        if xml_element is not None and lazy:
+            self.xml = xml_element
+            for field in fields or []:
+                getattr(self, field)
+
         # If an XML element is provided, use it for initialization
-        if xml_element is not None:
+        elif xml_element is not None:
             self._initializeFromXML(xml_element=xml_element)
 
         # If no XML element was provided, try to parse the input parameters
@@ -46,6 +109,22 @@ class PubMedArticle(object):
             for field in self.__slots__:
                 self.__setattr__(field, kwargs.get(field, None))
 
+    def __getattr__(self: object, name: str) -> object:
+        """ Decode a field of a lazy article on first access (only called for fields
+            that are not set yet).
+        """
+
+        # Only fields can be decoded from the XML
+        if name not in FIELD_EXTRACTORS:
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{name}'"
+            )
+
+        # Extract the field and remember it for the next access
+        value = getattr(self, FIELD_EXTRACTORS[name])(self.xml)
+        setattr(self, name, value)
+        return value
+
     def _extractPubMedId(self: object, xml_element: TypeVar("Element")) -> str:
         path = ".//ArticleId[@IdType='pubmed']"
         return getContent(element=xml_element, path=path)
@@ -90,12 +169,17 @@ class PubMedArticle(object):
 
     def _extractPublicationDate(
         self: object, xml_element: TypeVar("Element")
+    ) -> TypeVar("datetime.datetime"):
+        publication_date = xml_element.find(".//PubMedPubDate[@PubStatus='pubmed']")
+        return self._parsePublicationDate(publication_date)
+
+    def _parsePublicationDate(
+        self: object, publication_date: TypeVar("Element")
     ) -> TypeVar("datetime.datetime"):
         # Get the publication date
         try:
 
             # Get the publication elements
-            publication_date = xml_element.find(".//PubMedPubDate[@PubStatus='pubmed']")
             publication_year = int(getContent(publication_date, ".//Year", None))
             publication_month = int(getContent(publication_date, ".//Month", "1"))
             publication_day = int(getContent(publication_date, ".//Day", "1"))
@@ -112,12 +196,12 @@ class PubMedArticle(object):
 
     def _extractAuthors(self: object, xml_element: TypeVar("Element")) -> list:
         return [
-            {
-                "lastname": getContent(author, ".//LastName", None),
-                "firstname": getContent(author, ".//ForeName", None),
-                "initials": getContent(author, ".//Initials", None),
-                "affiliation": getContent(author, ".//AffiliationInfo/Affiliation", None),
-            }
+            Author(
+                lastname=getContent(author, ".//LastName", None),
+                firstname=getContent(author, ".//ForeName", None),
+                initials=getContent(author, ".//Initials", None),
+                affiliation=getContent(author, ".//AffiliationInfo/Affiliation", None),
+            )
             for author in xml_element.findall(".//Author")
         ]
 
@@ -125,35 +209,49 @@ class PubMedArticle(object):
         """ Helper method that parses an XML element into an article object.
         """
 
-        # Parse the different fields of the article
-        self.pubmed_id = self._extractPubMedId(xml_element)
-        self.title = self._extractTitle(xml_element)
-        self.keywords = self._extractKeywords(xml_element)
-        self.journal = self._extractJournal(xml_element)
-        self.abstract = self._extractAbstract(xml_element)
-        self.conclusions = self._extractConclusions(xml_element)
-        self.methods = self._extractMethods(xml_element)
-        self.results = self._extractResults(xml_element)
-        self.copyrights = self._extractCopyrights(xml_element)
-        self.doi = self._extractDoi(xml_element)
-        self.publication_date = self._extractPublicationDate(xml_element)
-        self.authors = self._extractAuthors(xml_element)
+        # Parse the different fields of the article in a single pass
+        values = EXTRACTOR.extract(xml_element)
+        self.pubmed_id = values["pubmed_id"]
+        self.title = values["title"]
+        self.keywords = values["keywords"]
+        self.journal = values["journal"]
+        self.abstract = values["abstract"]
+        self.conclusions = values["conclusions"]
+        self.methods = values["methods"]
+        self.results = values["results"]
+        self.copyrights = values["copyrights"]
+        self.doi = values["doi"]
+        self.publication_date = self._parsePublicationDate(values["publication_date"])
+        self.authors = values["authors"]
         self.xml = xml_element
 
-    def toDict(self: object) -> dict:
+    def toDict(self: object, fields: Optional[list] = None) -> dict:
         """ Helper method to convert the parsed information to a Python dict.
+
+            Parameters:
+                - fields    List, names of the fields to include (defaults to all),
+                            only these fields are decoded for lazy articles.
         """
 
-        return {key: self.__getattribute__(key) for key in self.__slots__}
+        values = {key: getattr(self, key) for key in fields or self.__slots__}
+
+        # Convert the authors to dicts as well
+        if values.get("authors") is not None:
+            values["authors"] = [dict(author) for author in values["authors"]]
 
-    def toJSON(self: object) -> str:
+        return values
+
+    def toJSON(self: object, fields: Optional[list] = None) -> str:
         """ Helper method for debugging, dumps the object as JSON string.
+
+            Parameters:
+                - fields    List, names of the fields to include (defaults to all).
         """
 
         return json.dumps(
             {
                 key: (value if not isinstance(value, (datetime.date, Element)) else str(value))
-                for key, value in self.toDict().items()
+                for key, value in self.toDict(fields=fields).items()
             },
             sort_keys=True,
             indent=4,
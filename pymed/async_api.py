@@ -0,0 +1,474 @@
+import asyncio
+import itertools
+import collections
+
+from typing import Union
+
+from .api import BASE_URL
+from .api import BATCH_SIZE
+from .api import MAX_GET_IDS
+from .api import HISTORY_BATCH_SIZE
+from .api import RETRY_STATUS_CODES
+from .helpers import batches
+from .helpers import retryDelay
+from .parser import parseArticles
+from .ratelimit import getRateLimiter
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+def _parseArticleList(response: str) -> list:
+    """ Helper method that parses an efetch response into a list of article objects
+        (to run in an executor).
+    """
+
+    return list(parseArticles(response))
+
+
+class AsyncPubMed(object):
+    """ Wrapper around the PubMed API for use with asyncio.
+    """
+
+    def __init__(
+        self: object,
+        tool: str = "my_tool",
+        email: str = "my_email@example.com",
+        api_key: str = None,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        pool_maxsize: int = 10,
+        timeout: float = 60,
+        base_url: str = BASE_URL,
+    ) -> None:
+        """ Initialization of the object.
+
+            Parameters:
+                - tool              String, name of the tool that is executing the
+                                    query (kindly requested by PubMed Central).
+                - email             String, email of the user of the tool (kindly
+                                    requested by PubMed Central).
+                - api_key           String, NCBI API key. When provided the rate limit
+                                    is raised from 3 to 10 requests per second.
+                - max_retries       Int, number of times a request is retried after a
+                                    connection error, timeout, 429 or 5xx response.
+                - backoff_factor    Float, base delay in seconds for the exponential
+                                    backoff between retries.
+                - pool_maxsize      Int, maximum number of connections that are kept
+                                    open to PubMed.
+                - timeout           Float, total timeout in seconds for each request.
+                - base_url          String, URL of the E-utilities (e.g. of a local
+                                    server for testing and benchmarking).
+
+            Returns:
+                - None
+        """
+
+        # The asynchronous client depends on aiohttp
+        if aiohttp is None:
+            raise ImportError(
+                "AsyncPubMed requires aiohttp: pip install pymed[async]"
+            )
+
+        # Store the input parameters
+        self.tool = tool
+        self.email = email
+        self.api_key = api_key
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self.base_url = base_url
+
+        # Share the rate limit with every other (async) instance that uses the same key
+        self._rateLimiter = getRateLimiter(api_key=api_key)
+
+        # The session is created on first use, inside the running event loop
+        self._session = None
+
+        # Define the standard / default query parameters
+        self.parameters = {"tool": tool, "email": email, "db": "pubmed"}
+        if api_key is not None:
+            self.parameters["api_key"] = api_key
+
+    async def __aenter__(self: object) -> object:
+        return self
+
+    async def __aexit__(self: object, *args: list) -> None:
+        await self.close()
+
+    async def close(self: object) -> None:
+        """ Close the connections to PubMed.
+        """
+
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def query(
+        self: object,
+        query: str,
+        max_results: int = 100,
+        use_history: bool = False,
+        concurrency: int = 1,
+    ):
+        """ Method that executes a query against PubMed and retrieves the articles.
+
+            Parameters:
+                - query         String, the query to send to PubMed.
+                - max_results   Int, the maximum number of results to retrieve (-1
+                                retrieves everything).
+                - use_history   Bool, keep the search results on the Entrez History
+                                server and fetch the articles from there, instead of
+                                retrieving the article IDs first.
+                - concurrency   Int, number of efetch batches that are retrieved at
+                                the same time (all requests still share the rate limit).
+
+            Returns:
+                - articles      Async iterator, yields PubMedArticle and
+                                PubMedBookArticle objects in order.
+        """
+
+        # Fetch the articles directly from the history server
+        if use_history:
+
+            # Store the search results on the history server
+            history = await self._searchHistory(query=query)
+
+            # Calculate a cut off point based on the max_results parameter
+            total_result_count = history["count"]
+            if max_results != -1:
+                total_result_count = min(total_result_count, max_results)
+
+            # Create a request for each batch on the history server
+            coroutines = iter(
+                [
+                    self._getArticlesFromHistory(
+                        history=history,
+                        retstart=retstart,
+                        retmax=min(HISTORY_BATCH_SIZE, total_result_count - retstart),
+                    )
+                    for retstart in range(0, total_result_count, HISTORY_BATCH_SIZE)
+                ]
+            )
+
+        else:
+
+            # Retrieve the article IDs for the query
+            article_ids = await self._getArticleIds(
+                query=query, max_results=max_results
+            )
+
+            # Create a request for each batch of IDs
+            coroutines = iter(
+                [
+                    self._getArticles(article_ids=batch)
+                    for batch in batches(article_ids, BATCH_SIZE)
+                ]
+            )
+
+        # Start the first batches
+        pending = collections.deque(
+            asyncio.ensure_future(coroutine)
+            for coroutine in itertools.islice(coroutines, concurrency)
+        )
+
+        try:
+            while pending:
+
+                # Wait for the next batch in line and replace it with a new one
+                articles = await pending.popleft()
+                for coroutine in itertools.islice(coroutines, 1):
+                    pending.append(asyncio.ensure_future(coroutine))
+
+                # Return the articles of the completed batch
+                for article in articles:
+                    yield article
+
+        finally:
+
+            # Stop retrieving batches when the caller stops iterating (or on errors)
+            for task in pending:
+                task.cancel()
+            for coroutine in coroutines:
+                coroutine.close()
+
+    async def getTotalResultsCount(self: object, query: str) -> int:
+        """ Helper method that returns the total number of results that match the query.
+
+            Parameters:
+                - query                 String, the query to send to PubMed
+
+            Returns:
+                - total_results_count   Int, total number of results for the query
+        """
+
+        # Get the default parameters
+        parameters = self.parameters.copy()
+
+        # Add specific query parameters
+        parameters["term"] = query
+        parameters["retmax"] = 1
+
+        # Make the request (request a single article ID for this search)
+        response = await self._get(
+            url="/entrez/eutils/esearch.fcgi", parameters=parameters
+        )
+
+        # Return the total number of results (without retrieving them)
+        return int(response.get("esearchresult", {}).get("count"))
+
+    async def _get(
+        self: object,
+        url: str,
+        parameters: dict,
+        output: str = "json",
+        post: bool = False,
+    ) -> Union[dict, str]:
+        """ Generic helper method that makes a request to PubMed.
+
+            Parameters:
+                - url           Str, last part of the URL that is requested (will
+                                be combined with the base url)
+                - parameters    Dict, parameters to use for the request
+                - output        Str, type of output that is requested (defaults to
+                                JSON but can be used to retrieve XML)
+                - post          Bool, send the parameters in the body of a POST
+                                request instead of the URL (e.g. long lists of IDs)
+
+            Returns:
+                - response      Dict / str, if the response is valid JSON it will
+                                be parsed before returning, otherwise a string is
+                                returned
+        """
+
+        # Create the connection pool on first use
+        if self._session is None:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.pool_maxsize),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+
+        # Set the response mode, aiohttp only accepts strings and numbers
+        parameters["retmode"] = output
+        parameters = [
+            (key, item)
+            for key, value in parameters.items()
+            for item in (value if isinstance(value, list) else [value])
+        ]
+
+        for attempt in range(self.max_retries + 1):
+
+            # Wait until the rate limit allows another request
+            await self._rateLimiter.acquireAsync()
+
+            # Make the request to PubMed, retry on connection problems
+            try:
+                if post:
+                    request = self._session.post(
+                        f"{self.base_url}{url}", data=parameters
+                    )
+                else:
+                    request = self._session.get(
+                        f"{self.base_url}{url}", params=parameters
+                    )
+                async with request as response:
+
+                    # Retry transient errors until we run out of attempts
+                    if (
+                        response.status in RETRY_STATUS_CODES
+                        and attempt < self.max_retries
+                    ):
+                        delay = retryDelay(
+                            attempt=attempt,
+                            backoff_factor=self.backoff_factor,
+                            retry_after=response.headers.get("Retry-After"),
+                        )
+
+                    # Check for any errors and return the response
+                    else:
+                        response.raise_for_status()
+                        if output == "json":
+                            return await response.json(content_type=None)
+                        else:
+                            return await response.text()
+
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if attempt == self.max_retries:
+                    raise
+                delay = retryDelay(attempt=attempt, backoff_factor=self.backoff_factor)
+
+            # Wait before retrying
+            await asyncio.sleep(delay)
+
+    async def _getArticles(self: object, article_ids: list) -> list:
+        """ Helper method that retrieves the content of a batch of article IDs.
+
+            Parameters:
+                - article_ids   List, article IDs.
+
+            Returns:
+                - articles      List, article objects.
+        """
+
+        # Get the default parameters
+        parameters = self.parameters.copy()
+        parameters["id"] = article_ids
+
+        # Make the request (as POST when the IDs do not fit in a URL)
+        response = await self._get(
+            url="/entrez/eutils/efetch.fcgi",
+            parameters=parameters,
+            output="xml",
+            post=len(article_ids) > MAX_GET_IDS,
+        )
+
+        # Parse the response into article objects
+        return await self._parseArticles(response)
+
+    async def _getArticlesFromHistory(
+        self: object, history: dict, retstart: int, retmax: int
+    ) -> list:
+        """ Helper method that retrieves a batch of articles from the history server.
+
+            Parameters:
+                - history       Dict, search results on the history server (as
+                                returned by _searchHistory).
+                - retstart      Int, index of the first article to retrieve.
+                - retmax        Int, number of articles to retrieve.
+
+            Returns:
+                - articles      List, article objects.
+        """
+
+        # Get the default parameters
+        parameters = self.parameters.copy()
+
+        # Point to the search results on the history server
+        parameters["WebEnv"] = history["webenv"]
+        parameters["query_key"] = history["query_key"]
+        parameters["retstart"] = retstart
+        parameters["retmax"] = retmax
+
+        # Make the request
+        response = await self._get(
+            url="/entrez/eutils/efetch.fcgi", parameters=parameters, output="xml"
+        )
+
+        # Parse the response into article objects
+        return await self._parseArticles(response)
+
+    async def _parseArticles(self: object, response: str) -> list:
+        """ Helper method that parses an efetch response on a thread, so the event
+            loop is not blocked while a (large) batch is parsed.
+
+            Parameters:
+                - response      Str, XML returned by efetch.
+
+            Returns:
+                - articles      List, article objects.
+        """
+
+        return await asyncio.get_running_loop().run_in_executor(
+            None, _parseArticleList, response
+        )
+
+    async def _searchHistory(self: object, query: str) -> dict:
+        """ Helper method that stores the results of a query on the history server.
+
+            Parameters:
+                - query         Str, query to be executed against the PubMed database.
+
+            Returns:
+                - history       Dict, the total number of results ("count") and the
+                                references to the results on the history server
+                                ("webenv" and "query_key").
+        """
+
+        # Get the default parameters
+        parameters = self.parameters.copy()
+
+        # Keep the results on the history server, without returning any IDs
+        parameters["term"] = query
+        parameters["usehistory"] = "y"
+        parameters["retmax"] = 0
+
+        # Make the request
+        response = await self._get(
+            url="/entrez/eutils/esearch.fcgi", parameters=parameters
+        )
+        result = response.get("esearchresult", {})
+
+        # Return the references to the history server
+        return {
+            "count": int(result.get("count")),
+            "webenv": result.get("webenv"),
+            "query_key": result.get("querykey"),
+        }
+
+    async def _getArticleIds(self: object, query: str, max_results: int) -> list:
+        """ Helper method to retrieve the article IDs for a query.
+
+            Parameters:
+                - query         Str, query to be executed against the PubMed database.
+                - max_results   Int, the maximum number of results to retrieve.
+
+            Returns:
+                - article_ids   List, article IDs as a list.
+        """
+
+        # Create a placeholder for the retrieved IDs
+        article_ids = []
+
+        # Get the default parameters
+        parameters = self.parameters.copy()
+
+        # Add specific query parameters
+        parameters["term"] = query
+        parameters["retmax"] = 50000
+
+        # Calculate a cut off point based on the max_results parameter
+        if max_results != -1 and max_results < parameters["retmax"]:
+            parameters["retmax"] = max_results
+
+        # Make the first request to PubMed
+        response = await self._get(
+            url="/entrez/eutils/esearch.fcgi", parameters=parameters
+        )
+
+        # Add the retrieved IDs to the list
+        article_ids += response.get("esearchresult", {}).get("idlist", [])
+
+        # Get information from the response
+        total_result_count = int(response.get("esearchresult", {}).get("count"))
+        retrieved_count = int(response.get("esearchresult", {}).get("retmax"))
+
+        # If no max is provided (-1) we'll try to retrieve everything
+        if max_results == -1:
+            max_results = total_result_count
+
+        # Continue to make requests until we have everything
+        while retrieved_count < total_result_count and retrieved_count < max_results:
+
+            # Calculate a cut off point based on the max_results parameter
+            if (max_results - retrieved_count) < parameters["retmax"]:
+                parameters["retmax"] = max_results - retrieved_count
+
+            # Start the collection from the number of already retrieved articles
+            parameters["retstart"] = retrieved_count
+
+            # Make a new request
+            response = await self._get(
+                url="/entrez/eutils/esearch.fcgi", parameters=parameters
+            )
+
+            # Add the retrieved IDs to the list
+            article_ids += response.get("esearchresult", {}).get("idlist", [])
+
+            # Get information from the response
+            retrieved_count += int(response.get("esearchresult", {}).get("retmax"))
+
+        # Return the response
+        return article_ids
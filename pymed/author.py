@@ -0,0 +1,108 @@
+import sys
+
+from typing import Optional
+
+
+def internString(value: Optional[str]) -> Optional[str]:
+    """ Helper method that interns a string, so all equal strings share the same
+        object (e.g. the same names and affiliations across a result set).
+    """
+
+    return sys.intern(value) if type(value) is str else value
+
+
+class Author(object):
+    """ Data class that contains an author of a PubMed article. The names and the
+        affiliation are interned, and the author can be used like the (read-only)
+        dict it replaces (author["lastname"], author.get("affiliation"), "lastname"
+        in author, author.items(), dict(author)). It is not a dict itself: convert
+        it with dict(author) or json.dumps(..., default=dict) to dump it as JSON.
+    """
+
+    __slots__ = ("lastname", "firstname", "initials", "affiliation")
+
+    # Fields of the author, in order (also the order of the arguments)
+    FIELDS = ("lastname", "firstname", "initials", "affiliation")
+
+    def __init__(
+        self: object,
+        lastname: Optional[str] = None,
+        firstname: Optional[str] = None,
+        initials: Optional[str] = None,
+        affiliation: Optional[str] = None,
+    ) -> None:
+        """ Initialization of the object.
+        """
+
+        self.lastname = internString(lastname)
+        self.firstname = internString(firstname)
+        self.initials = internString(initials)
+        self.affiliation = internString(affiliation)
+
+    def __getitem__(self: object, key: str) -> Optional[str]:
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self: object) -> list:
+        return iter(self.FIELDS)
+
+    def __len__(self: object) -> int:
+        return len(self.FIELDS)
+
+    def __contains__(self: object, key: str) -> bool:
+        return key in self.FIELDS
+
+    def __eq__(self: object, other: object) -> bool:
+        if isinstance(other, (Author, dict)):
+            return self.toDict() == dict(other)
+        return NotImplemented
+
+    def __repr__(self: object) -> str:
+        return f"{type(self).__name__}({self.toDict()})"
+
+    def __reduce__(self: object) -> tuple:
+        # Pickle the values only, they are interned again when unpickled
+        return (type(self), tuple(getattr(self, field) for field in self.FIELDS))
+
+    def get(self: object, key: str, default: Optional[str] = None) -> Optional[str]:
+        return getattr(self, key) if key in self.FIELDS else default
+
+    def keys(self: object) -> tuple:
+        return self.FIELDS
+
+    def values(self: object) -> list:
+        return [getattr(self, field) for field in self.FIELDS]
+
+    def items(self: object) -> list:
+        return [(field, getattr(self, field)) for field in self.FIELDS]
+
+    def toDict(self: object) -> dict:
+        """ Helper method to convert the author to a Python dict.
+        """
+
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+
+class BookAuthor(Author):
+    """ Data class that contains an author of a PubMed book article (a person or
+        a collective, without affiliation).
+    """
+
+    __slots__ = ("collective",)
+
+    # Fields of the author, in order (also the order of the arguments)
+    FIELDS = ("collective", "lastname", "firstname", "initials")
+
+    def __init__(
+        self: object,
+        collective: Optional[str] = None,
+        lastname: Optional[str] = None,
+        firstname: Optional[str] = None,
+        initials: Optional[str] = None,
+    ) -> None:
+        """ Initialization of the object.
+        """
+
+        super().__init__(lastname=lastname, firstname=firstname, initials=initials)
+        self.collective = internString(collective)
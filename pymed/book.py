@@ -4,7 +4,43 @@ import datetime
 from typing import TypeVar
 from typing import Optional
 
+from .author import BookAuthor
 from .helpers import getContent
+from .extractor import FieldExtractor
+
+
+# Paths of all fields, extracted in a single traversal of the book article
+EXTRACTOR = FieldExtractor(
+    texts={
+        "pubmed_id": "ArticleId[@IdType='pubmed']",
+        "title": "BookTitle",
+        "abstract": "AbstractText",
+        "copyrights": "CopyrightInformation",
+        "doi": "ArticleId[@IdType='doi']",
+        "isbn": "Isbn",
+        "language": "Language",
+        "publication_type": "PublicationType",
+        "publication_date": "PubDate/Year",
+        "publisher": "Publisher/PublisherName",
+        "publisher_location": "Publisher/PublisherLocation",
+    },
+    records={
+        "authors": (
+            "Author",
+            {
+                "collective": "CollectiveName",
+                "lastname": "LastName",
+                "firstname": "ForeName",
+                "initials": "Initials",
+            },
+            BookAuthor,
+        ),
+        "sections": (
+            "Section",
+            {"title": "SectionTitle", "chapter": "LocationLabel"},
+        ),
+    },
+)
 
 
 class PubMedBookArticle(object):
@@ -91,12 +127,12 @@ class PubMedBookArticle(object):
 
     def _extractAuthors(self: object, xml_element: TypeVar("Element")) -> list:
         return [
-            {
-                "collective": getContent(author, path=".//CollectiveName"),
-                "lastname": getContent(element=author, path=".//LastName"),
-                "firstname": getContent(element=author, path=".//ForeName"),
-                "initials": getContent(element=author, path=".//Initials"),
-            }
+            BookAuthor(
+                collective=getContent(author, path=".//CollectiveName"),
+                lastname=getContent(element=author, path=".//LastName"),
+                firstname=getContent(element=author, path=".//ForeName"),
+                initials=getContent(element=author, path=".//Initials"),
+            )
             for author in xml_element.findall(".//Author")
         ]
 
@@ -113,38 +149,49 @@ class PubMedBookArticle(object):
         """ Helper method that parses an XML element into an article object.
         """
 
-        # Parse the different fields of the article
-        self.pubmed_id = self._extractPubMedId(xml_element)
-        self.title = self._extractTitle(xml_element)
-        self.abstract = self._extractAbstract(xml_element)
-        self.copyrights = self._extractCopyrights(xml_element)
-        self.doi = self._extractDoi(xml_element)
-        self.isbn = self._extractIsbn(xml_element)
-        self.language = self._extractLanguage(xml_element)
-        self.publication_date = self._extractPublicationDate(xml_element)
-        self.authors = self._extractAuthors(xml_element)
-        self.publication_type = self._extractPublicationType(xml_element)
-        self.publisher = self._extractPublisher(xml_element)
-        self.publisher_location = self._extractPublisherLocation(xml_element)
-        self.sections = self._extractSections(xml_element)
-
-    def toDict(self: object) -> dict:
+        # Parse the different fields of the article in a single pass
+        values = EXTRACTOR.extract(xml_element)
+        self.pubmed_id = values["pubmed_id"]
+        self.title = values["title"]
+        self.abstract = values["abstract"]
+        self.copyrights = values["copyrights"]
+        self.doi = values["doi"]
+        self.isbn = values["isbn"]
+        self.language = values["language"]
+        self.publication_date = values["publication_date"]
+        self.authors = values["authors"]
+        self.publication_type = values["publication_type"]
+        self.publisher = values["publisher"]
+        self.publisher_location = values["publisher_location"]
+        self.sections = values["sections"]
+
+    def toDict(self: object, fields: Optional[list] = None) -> dict:
         """ Helper method to convert the parsed information to a Python dict.
+
+            Parameters:
+                - fields    List, names of the fields to include (defaults to all),
+                            fields that books do not have are None.
         """
 
-        return {
-            key: (self.__getattribute__(key) if hasattr(self, key) else None)
-            for key in self.__slots__
-        }
+        values = {key: getattr(self, key, None) for key in fields or self.__slots__}
+
+        # Convert the authors to dicts as well
+        if values.get("authors") is not None:
+            values["authors"] = [dict(author) for author in values["authors"]]
 
-    def toJSON(self: object) -> str:
+        return values
+
+    def toJSON(self: object, fields: Optional[list] = None) -> str:
         """ Helper method for debugging, dumps the object as JSON string.
+
+            Parameters:
+                - fields    List, names of the fields to include (defaults to all).
         """
 
         return json.dumps(
             {
                 key: (value if not isinstance(value, datetime.date) else str(value))
-                for key, value in self.toDict().items()
+                for key, value in self.toDict(fields=fields).items()
             },
             sort_keys=True,
             indent=4,
@@ -0,0 +1,225 @@
+import os
+import gzip
+import bisect
+import multiprocessing
+
+from array import array
+
+import xml.etree.ElementTree as xml
+
+from typing import Optional
+
+from .parser import RECORD_TAGS
+from .parser import getPubMedId
+from .parser import createArticle
+from .parser import iterRecordsStream
+
+
+def _open(path: str):
+    """ Helper method that opens a (gzipped) XML file for reading.
+    """
+
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+# Latest versions of the records of the update files, set in every process of
+# the pool by _setLatest (see LatestVersions)
+_latest = None
+
+
+class LatestVersions(object):
+    """ Compact index of the file with the latest version of each record of the
+        update files (-1 for deleted records): the sorted PubMed IDs and the
+        index of the file of each, as arrays of ints (8 bytes per record).
+    """
+
+    __slots__ = ("pubmed_ids", "indexes")
+
+    def __init__(self: object, latest: dict) -> None:
+        """ Initialization of the object.
+
+            Parameters:
+                - latest    Dict, index of the file with the latest version per
+                            PubMed ID (int).
+
+            Returns:
+                - None
+        """
+
+        self.pubmed_ids = array("I", sorted(latest))
+        self.indexes = array("i", (latest[pubmed_id] for pubmed_id in self.pubmed_ids))
+
+    def __len__(self: object) -> int:
+        return len(self.pubmed_ids)
+
+    def get(self: object, pubmed_id: str, default: int) -> int:
+        """ Return the index of the file with the latest version of a record (or
+            the default when it is not in the update files).
+        """
+
+        pubmed_id = int(pubmed_id)
+        position = bisect.bisect_left(self.pubmed_ids, pubmed_id)
+        if position < len(self.pubmed_ids) and self.pubmed_ids[position] == pubmed_id:
+            return self.indexes[position]
+        return default
+
+
+def readIndex(path: str) -> tuple:
+    """ Read the PubMed IDs of the records and of the DeleteCitation entries in a
+        baseline or update file (without parsing the records).
+
+        Parameters:
+            - path      Str, path of the (gzipped) XML file.
+
+        Returns:
+            - pubmed_ids    Array, PubMed IDs of the records (unsigned ints).
+            - deleted       Array, PubMed IDs of the deleted records.
+    """
+
+    pubmed_ids = array("I")
+    deleted = array("I")
+    root = None
+    with _open(path) as source:
+        for event, element in xml.iterparse(source, events=("start", "end")):
+
+            # Keep a reference to the root (the first element) so it can be cleared
+            if root is None:
+                root = element
+
+            # Collect the IDs of the records, and drop the rest of the records
+            elif event == "end" and element.tag in RECORD_TAGS:
+                pubmed_ids.append(int(getPubMedId(element)))
+                root.clear()
+
+            # Collect the deleted IDs
+            elif event == "end" and element.tag == "DeleteCitation":
+                deleted.extend(int(pmid.text) for pmid in element.iter("PMID"))
+                root.clear()
+
+    return pubmed_ids, deleted
+
+
+def readFile(
+    path: str,
+    as_dict: bool = False,
+    keep_xml: bool = False,
+    latest: Optional[LatestVersions] = None,
+    index: int = 0,
+) -> list:
+    """ Read all records of a baseline or update file.
+
+        Parameters:
+            - path          Str, path of the (gzipped) XML file.
+            - as_dict       Bool, return the records as dicts instead of article
+                            objects.
+            - keep_xml      Bool, keep the XML element of each article (makes the
+                            results a lot larger to send between processes).
+            - latest        LatestVersions, index of the file with the latest
+                            version of the records of the update files (-1 for
+                            deleted records). Records that are not in the file with
+                            this index are skipped.
+            - index         Int, index of this file.
+
+        Returns:
+            - articles      List, the article objects (or dicts).
+    """
+
+    articles = []
+    with _open(path) as source:
+        for record in iterRecordsStream(source):
+
+            # Skip records that are revised or deleted later on
+            if latest and latest.get(getPubMedId(record), index) != index:
+                continue
+
+            article = createArticle(record)
+            if not keep_xml and hasattr(article, "xml"):
+                article.xml = None
+            articles.append(article.toDict() if as_dict else article)
+
+    return articles
+
+
+def _setLatest(latest: LatestVersions) -> None:
+    """ Helper method that keeps the index of the latest versions in a process of
+        the pool (sent once per process, instead of with every file).
+    """
+
+    global _latest
+    _latest = latest
+
+
+def _readFile(arguments: tuple) -> list:
+    """ Helper method that unpacks the arguments of readFile, and adds the latest
+        versions of the process (for Pool.imap).
+    """
+
+    path, as_dict, keep_xml, index = arguments
+    return readFile(path, as_dict, keep_xml, latest=_latest, index=index)
+
+
+def load(
+    paths: list,
+    processes: Optional[int] = None,
+    as_dict: bool = False,
+    keep_xml: bool = False,
+    apply_deletions: bool = True,
+    updates: Optional[list] = None,
+) -> list:
+    """ Load the articles from PubMed baseline and update files (e.g. from
+        ftp.ncbi.nlm.nih.gov/pubmed/), parsing the files in parallel processes.
+        No requests are made to PubMed.
+
+        Pass the update files separately (updates) to only return the latest
+        version of each record: records that are revised (or deleted by a
+        DeleteCitation entry) in the same or a later update file are skipped. To
+        find these, the IDs in the update files are read beforehand, into a
+        compact index that is sent to each process once. The baseline files do
+        not overlap, so they are not indexed.
+
+        Parameters:
+            - paths             List, paths of the (gzipped) baseline files (or of any
+                                files that are loaded as they are), in order.
+            - processes         Int, number of processes to parse with (defaults to
+                                the number of CPUs).
+            - as_dict           Bool, return the records as dicts instead of article
+                                objects.
+            - keep_xml          Bool, keep the XML element of each article.
+            - apply_deletions   Bool, skip records that are revised or deleted in the
+                                same or a later update file.
+            - updates           List, paths of the (gzipped) update files, in the
+                                order they were published (loaded after paths).
+
+        Returns:
+            - articles          Iterator, yields the article objects (or dicts) in
+                                the order of the files.
+    """
+
+    paths = [os.fspath(path) for path in paths]
+    first_update = len(paths)
+    paths += [os.fspath(path) for path in updates or []]
+
+    # Find the file with the latest version of each record, in a single pass over
+    # the update files
+    latest = None
+    if apply_deletions and first_update < len(paths):
+        versions = {}
+        with multiprocessing.Pool(processes=processes) as pool:
+            indexes = pool.imap(readIndex, paths[first_update:])
+            for index, (pubmed_ids, deleted) in enumerate(indexes, first_update):
+                versions.update(dict.fromkeys(pubmed_ids, index))
+                versions.update(dict.fromkeys(deleted, -1))
+        latest = LatestVersions(versions)
+        del versions
+
+    # Parse the files in parallel, returning the results in order
+    with multiprocessing.Pool(
+        processes=processes, initializer=_setLatest, initargs=(latest,)
+    ) as pool:
+        tasks = [
+            (path, as_dict, keep_xml, index) for index, path in enumerate(paths)
+        ]
+        for articles in pool.imap(_readFile, tasks):
+            yield from articles
@@ -0,0 +1,597 @@
+import os
+import json
+import time
+import sqlite3
+import threading
+import collections
+
+import xml.etree.ElementTree as xml
+
+from abc import ABC
+from abc import abstractmethod
+from typing import Optional
+
+from .parser import getDateRevised
+from .parser import serializeRecord
+
+
+class ArticleCache(ABC):
+    """ Base class of the local caches of article XML, keyed by PubMed ID.
+
+        Entries expire after a time-to-live, a newer entry is never replaced by an
+        older revision of the same record (based on its DateRevised), and the least
+        recently used entries are evicted when the cache grows beyond its size cap.
+    """
+
+    def __init__(
+        self: object, ttl: Optional[float] = None, max_entries: Optional[int] = None
+    ) -> None:
+        """ Initialization of the object.
+
+            Parameters:
+                - ttl           Float, number of seconds after which an entry is stale
+                                and has to be fetched again (None never expires).
+                - max_entries   Int, maximum number of entries in the cache, the least
+                                recently used entries are evicted (None is unlimited).
+
+            Returns:
+                - None
+        """
+
+        # Store the input parameters
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        # Keep track of the use of the cache
+        self.hits = 0
+        self.misses = 0
+
+        # The cache can be shared between threads
+        self._lock = threading.RLock()
+
+    def get(self: object, pubmed_id: str) -> Optional[str]:
+        """ Get the XML of a record from the cache.
+
+            Parameters:
+                - pubmed_id     Str, PubMed ID of the record.
+
+            Returns:
+                - record        Str, XML of the record (None when it is not cached or
+                                stale).
+        """
+
+        return self.getMany([pubmed_id]).get(pubmed_id)
+
+    def getMany(self: object, pubmed_ids: list) -> dict:
+        """ Get the XML of multiple records from the cache.
+
+            Parameters:
+                - pubmed_ids    List, PubMed IDs of the records.
+
+            Returns:
+                - records       Dict, XML per PubMed ID for the records that are
+                                cached and not stale.
+        """
+
+        with self._lock:
+            records = self._load(
+                pubmed_ids=[str(pubmed_id) for pubmed_id in pubmed_ids]
+            )
+            self.hits += len(records)
+            self.misses += len(pubmed_ids) - len(records)
+            return records
+
+    def put(self: object, xml_element: xml.Element) -> None:
+        """ Store a record in the cache.
+
+            Parameters:
+                - xml_element   Element, a PubmedArticle or PubmedBookArticle element.
+
+            Returns:
+                - None
+        """
+
+        self.putMany([xml_element])
+
+    def putMany(self: object, xml_elements: list) -> None:
+        """ Store multiple records in the cache.
+
+            Parameters:
+                - xml_elements  List, PubmedArticle or PubmedBookArticle elements.
+
+            Returns:
+                - None
+        """
+
+        # Serialize the records, together with their revision dates
+        self.putRecords([serializeRecord(xml_element) for xml_element in xml_elements])
+
+    def putRecords(self: object, records: list) -> None:
+        """ Store multiple records that are already serialized.
+
+            Parameters:
+                - records       List, tuples of the PubMed ID, the revision date and
+                                the XML of each record (see serializeRecord).
+
+            Returns:
+                - None
+        """
+
+        with self._lock:
+            self._store(records=records)
+            if self.max_entries is not None:
+                self._evict()
+
+    def invalidate(self: object, pubmed_ids: list) -> None:
+        """ Remove records from the cache (e.g. because they were revised).
+
+            Parameters:
+                - pubmed_ids    List, PubMed IDs of the records.
+
+            Returns:
+                - None
+        """
+
+        with self._lock:
+            self._delete(pubmed_ids=[str(pubmed_id) for pubmed_id in pubmed_ids])
+
+    def stats(self: object) -> dict:
+        """ Statistics of the use of the cache.
+
+            Returns:
+                - stats     Dict, the number of hits, misses and entries.
+        """
+
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self)}
+
+    def _isStale(self: object, fetched: float) -> bool:
+        return self.ttl is not None and fetched + self.ttl < time.time()
+
+    @abstractmethod
+    def __len__(self: object) -> int:
+        """ Return the number of entries in the cache.
+        """
+
+    @abstractmethod
+    def _load(self: object, pubmed_ids: list) -> dict:
+        """ Return the XML of the records that are stored (and not stale), and mark
+            them as used.
+        """
+
+    @abstractmethod
+    def _store(self: object, records: list) -> None:
+        """ Store serialized records, unless a newer revision is stored already.
+        """
+
+    @abstractmethod
+    def _delete(self: object, pubmed_ids: list) -> None:
+        """ Remove the records with these IDs.
+        """
+
+    @abstractmethod
+    def _evict(self: object) -> None:
+        """ Remove the least recently used entries beyond max_entries.
+        """
+
+
+class SQLiteArticleCache(ArticleCache):
+    """ Article cache stored in a SQLite database.
+    """
+
+    def __init__(
+        self: object,
+        path: str,
+        ttl: Optional[float] = None,
+        max_entries: Optional[int] = None,
+    ) -> None:
+        """ Initialization of the object.
+
+            Parameters:
+                - path          Str, path of the database file.
+                - ttl           Float, number of seconds after which an entry is stale.
+                - max_entries   Int, maximum number of entries in the cache.
+
+            Returns:
+                - None
+        """
+
+        super().__init__(ttl=ttl, max_entries=max_entries)
+
+        # Open (or create) the database
+        self.path = path
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS articles (
+                    pubmed_id TEXT PRIMARY KEY,
+                    revised TEXT,
+                    fetched REAL NOT NULL,
+                    accessed REAL NOT NULL,
+                    record TEXT NOT NULL
+                )
+                """
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS articles_accessed ON articles (accessed)"
+            )
+
+    def __len__(self: object) -> int:
+        with self._lock:
+            count = self._connection.execute("SELECT COUNT(*) FROM articles")
+            return count.fetchone()[0]
+
+    def close(self: object) -> None:
+        """ Close the database.
+        """
+
+        with self._lock:
+            self._connection.close()
+
+    def _load(self: object, pubmed_ids: list) -> dict:
+        records = {}
+        now = time.time()
+
+        # Query in chunks, SQLite limits the number of parameters
+        for index in range(0, len(pubmed_ids), 500):
+            chunk = pubmed_ids[index : index + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._connection.execute(
+                f"SELECT pubmed_id, fetched, record FROM articles "
+                f"WHERE pubmed_id IN ({placeholders})",
+                chunk,
+            ).fetchall()
+            records.update(
+                {
+                    pubmed_id: record
+                    for pubmed_id, fetched, record in rows
+                    if not self._isStale(fetched)
+                }
+            )
+
+        # Mark the entries as recently used
+        with self._connection:
+            self._connection.executemany(
+                "UPDATE articles SET accessed = ? WHERE pubmed_id = ?",
+                [(now, pubmed_id) for pubmed_id in records],
+            )
+
+        return records
+
+    def _store(self: object, records: list) -> None:
+        now = time.time()
+
+        # Never replace an entry with an older revision of the record
+        with self._connection:
+            self._connection.executemany(
+                """
+                INSERT INTO articles (pubmed_id, revised, fetched, accessed, record)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT (pubmed_id) DO UPDATE SET
+                    revised = excluded.revised,
+                    fetched = excluded.fetched,
+                    accessed = excluded.accessed,
+                    record = excluded.record
+                WHERE articles.revised IS NULL
+                    OR excluded.revised IS NULL
+                    OR excluded.revised >= articles.revised
+                """,
+                [
+                    (pubmed_id, revised, now, now, record)
+                    for pubmed_id, revised, record in records
+                ],
+            )
+
+    def _delete(self: object, pubmed_ids: list) -> None:
+        with self._connection:
+            self._connection.executemany(
+                "DELETE FROM articles WHERE pubmed_id = ?",
+                [(pubmed_id,) for pubmed_id in pubmed_ids],
+            )
+
+    def _evict(self: object) -> None:
+        excess = len(self) - self.max_entries
+        if excess > 0:
+            with self._connection:
+                self._connection.execute(
+                    """
+                    DELETE FROM articles WHERE pubmed_id IN (
+                        SELECT pubmed_id FROM articles ORDER BY accessed LIMIT ?
+                    )
+                    """,
+                    (excess,),
+                )
+
+
+class DirectoryArticleCache(ArticleCache):
+    """ Article cache stored as one XML file per record in a directory. The time a
+        record was fetched is kept as the modification time of its file, and the
+        time it was last used as the access time.
+    """
+
+    def __init__(
+        self: object,
+        path: str,
+        ttl: Optional[float] = None,
+        max_entries: Optional[int] = None,
+    ) -> None:
+        """ Initialization of the object.
+
+            Parameters:
+                - path          Str, path of the directory.
+                - ttl           Float, number of seconds after which an entry is stale.
+                - max_entries   Int, maximum number of entries in the cache.
+
+            Returns:
+                - None
+        """
+
+        super().__init__(ttl=ttl, max_entries=max_entries)
+
+        # Create the directory and count the records that are already cached
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self._entries = sum(1 for _ in self._files())
+
+    def __len__(self: object) -> int:
+        return self._entries
+
+    def _files(self: object) -> list:
+        """ Helper method that yields the paths of all cached records.
+        """
+
+        for directory, _, filenames in os.walk(self.path):
+            for filename in filenames:
+                if filename.endswith(".xml"):
+                    yield os.path.join(directory, filename)
+
+    def _filename(self: object, pubmed_id: str) -> str:
+        """ Helper method that returns the path of a record. Records are spread over
+            subdirectories to keep the directories small.
+        """
+
+        return os.path.join(self.path, pubmed_id[-3:].zfill(3), f"{pubmed_id}.xml")
+
+    def _load(self: object, pubmed_ids: list) -> dict:
+        records = {}
+        now = time.time()
+
+        for pubmed_id in pubmed_ids:
+            filename = self._filename(pubmed_id)
+            try:
+                fetched = os.path.getmtime(filename)
+                if self._isStale(fetched):
+                    continue
+                with open(filename, "r", encoding="utf8") as record_file:
+                    records[pubmed_id] = record_file.read()
+
+                # Mark the entry as recently used
+                os.utime(filename, (now, fetched))
+
+            except FileNotFoundError:
+                continue
+
+        return records
+
+    def _store(self: object, records: list) -> None:
+        for pubmed_id, revised, record in records:
+            filename = self._filename(pubmed_id)
+
+            # Never replace an entry with an older revision of the record
+            exists = os.path.exists(filename)
+            if exists and revised is not None:
+                cached_revised = getDateRevised(xml.parse(filename).getroot())
+                if cached_revised is not None and revised < cached_revised:
+                    continue
+
+            # Write to a temporary file first, so a record is never half written
+            os.makedirs(os.path.dirname(filename), exist_ok=True)
+            with open(f"{filename}.tmp", "w", encoding="utf8") as record_file:
+                record_file.write(record)
+            os.replace(f"{filename}.tmp", filename)
+            if not exists:
+                self._entries += 1
+
+    def _delete(self: object, pubmed_ids: list) -> None:
+        for pubmed_id in pubmed_ids:
+            try:
+                os.remove(self._filename(pubmed_id))
+                self._entries -= 1
+            except FileNotFoundError:
+                continue
+
+    def _evict(self: object) -> None:
+        excess = self._entries - self.max_entries
+        if excess > 0:
+
+            # Remove the least recently used records (and a little more, so the
+            # directory does not have to be scanned on every write)
+            excess = max(excess, self.max_entries // 10)
+            filenames = sorted(self._files(), key=os.path.getatime)
+            for filename in filenames[:excess]:
+                os.remove(filename)
+                self._entries -= 1
+
+
+class SearchCache(object):
+    """ Cache of esearch results, kept in memory and optionally in a SQLite database
+        so it survives restarts.
+    """
+
+    # Parameters that do not influence the results of a search
+    IGNORED_PARAMETERS = ("tool", "email", "api_key", "retmode")
+
+    def __init__(
+        self: object,
+        ttl: Optional[float] = 300,
+        max_entries: int = 1024,
+        path: Optional[str] = None,
+    ) -> None:
+        """ Initialization of the object.
+
+            Parameters:
+                - ttl           Float, number of seconds after which a result is stale
+                                (None never expires).
+                - max_entries   Int, maximum number of results in the cache, the least
+                                recently used results are evicted.
+                - path          Str, path of a database file to persist the results
+                                in (optional).
+
+            Returns:
+                - None
+        """
+
+        # Store the input parameters
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.path = path
+
+        # Keep track of the use of the cache
+        self.hits = 0
+        self.misses = 0
+
+        # Results in order of use, each stored with the time it was stored
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+        # Open (or create) the database
+        self._connection = None
+        if path is not None:
+            self._connection = sqlite3.connect(path, check_same_thread=False)
+            with self._connection:
+                self._connection.execute(
+                    """
+                    CREATE TABLE IF NOT EXISTS searches (
+                        key TEXT PRIMARY KEY,
+                        stored REAL NOT NULL,
+                        result TEXT NOT NULL
+                    )
+                    """
+                )
+
+    def __len__(self: object) -> int:
+        return len(self._entries)
+
+    def key(self: object, parameters: dict) -> str:
+        """ Create the key of a search from its parameters. Whitespace in the query
+            is normalized, but the case is kept (PubMed operators are case sensitive).
+
+            Parameters:
+                - parameters    Dict, parameters of the esearch request.
+
+            Returns:
+                - key           Str, key of the search.
+        """
+
+        parameters = {
+            key: value
+            for key, value in parameters.items()
+            if key not in self.IGNORED_PARAMETERS
+        }
+        if "term" in parameters:
+            parameters["term"] = " ".join(str(parameters["term"]).split())
+        return json.dumps(parameters, sort_keys=True, default=str)
+
+    def get(self: object, parameters: dict, ignore_ttl: bool = False) -> Optional[dict]:
+        """ Get the result of a search from the cache.
+
+            Parameters:
+                - parameters    Dict, parameters of the esearch request.
+                - ignore_ttl    Bool, also return stale results (for results that are
+                                validated in another way).
+
+            Returns:
+                - result        Dict, the result (None when it is not cached or stale).
+        """
+
+        key = self.key(parameters)
+        now = time.time()
+
+        with self._lock:
+
+            # Look in memory first, then in the database
+            entry = self._entries.get(key)
+            if entry is None and self._connection is not None:
+                row = self._connection.execute(
+                    "SELECT stored, result FROM searches WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    entry = (row[0], json.loads(row[1]))
+                    self._remember(key=key, entry=entry)
+
+            # Check if the result is still fresh
+            stored = entry[0] if entry is not None else None
+            if entry is None or (
+                not ignore_ttl and self.ttl is not None and stored + self.ttl < now
+            ):
+                self.misses += 1
+                return None
+
+            # Mark the result as recently used
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self: object, parameters: dict, result: dict) -> None:
+        """ Store the result of a search.
+
+            Parameters:
+                - parameters    Dict, parameters of the esearch request.
+                - result        Dict, the result (must be serializable as JSON).
+
+            Returns:
+                - None
+        """
+
+        key = self.key(parameters)
+        now = time.time()
+
+        with self._lock:
+            self._remember(key=key, entry=(now, result))
+
+            # Persist the result, and keep the most recent results in the database
+            if self._connection is not None:
+                with self._connection:
+                    self._connection.execute(
+                        "INSERT OR REPLACE INTO searches VALUES (?, ?, ?)",
+                        (key, now, json.dumps(result)),
+                    )
+                    self._connection.execute(
+                        """
+                        DELETE FROM searches WHERE key NOT IN (
+                            SELECT key FROM searches ORDER BY stored DESC LIMIT ?
+                        )
+                        """,
+                        (self.max_entries,),
+                    )
+
+    def clear(self: object) -> None:
+        """ Remove all results from the cache.
+        """
+
+        with self._lock:
+            self._entries.clear()
+            if self._connection is not None:
+                with self._connection:
+                    self._connection.execute("DELETE FROM searches")
+
+    def stats(self: object) -> dict:
+        """ Statistics of the use of the cache.
+
+            Returns:
+                - stats     Dict, the number of hits, misses and entries (in memory).
+        """
+
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self)}
+
+    def _remember(self: object, key: str, entry: tuple) -> None:
+        """ Helper method that keeps a result in memory, evicting the least recently
+            used results.
+        """
+
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
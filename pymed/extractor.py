@@ -0,0 +1,225 @@
+import re
+
+from typing import Tuple
+from typing import TypeVar
+from typing import Optional
+
+
+# Simplified path syntax: "Tag", "Parent/Tag", "Tag[@Attribute='value']"
+PATH_PATTERN = re.compile(
+    r"^(?:(?P<parent>[\w.-]+)/)?(?P<tag>[\w.-]+)"
+    r"(?:\[@(?P<attribute>[\w.-]+)='(?P<value>[^']*)'\])?$"
+)
+
+# Kinds of values that can be extracted
+TEXT = 0
+LIST = 1
+ELEMENT = 2
+RECORD = 3
+
+
+def compilePath(path: str) -> Tuple[str, Optional[str], Optional[str], Optional[str]]:
+    """ Helper method that compiles a path into the parts that are matched.
+
+        Parameters:
+            - path      Str, path of the element relative to any descendant, e.g.
+                        "Journal/Title" or "ArticleId[@IdType='doi']" (equivalent to
+                        ".//Journal/Title" and ".//ArticleId[@IdType='doi']").
+
+        Returns:
+            - parts     Tuple, the tag, parent tag, attribute name and attribute value.
+    """
+
+    match = PATH_PATTERN.match(path)
+    if match is None:
+        raise ValueError(f"Unsupported path: {path}")
+    return match.group("tag", "parent", "attribute", "value")
+
+
+def joinContent(texts: list, default: str = None, separator: str = "\n") -> str:
+    """ Helper method that joins the texts of the matched elements, in the same way
+        as getContent does.
+
+        Parameters:
+            - texts         List, text of each matched element (may contain None).
+            - default       Str, default value to return when nothing was matched.
+            - separator     Str, separator between the texts.
+
+        Returns:
+            - text          Str, the joined text.
+    """
+
+    if len(texts) == 0:
+        return default
+    elif len(texts) == 1:
+        return texts[0] if texts[0] is not None else ""
+    return separator.join([text for text in texts if text is not None])
+
+
+class FieldExtractor(object):
+    """ Extracts a set of fields from an XML element in a single traversal.
+    """
+
+    def __init__(
+        self: object,
+        texts: dict = None,
+        lists: dict = None,
+        elements: dict = None,
+        records: dict = None,
+    ) -> None:
+        """ Initialization of the object.
+
+            Parameters:
+                - texts     Dict, field name and path of the elements whose texts are
+                            joined (like getContent).
+                - lists     Dict, field name and path of the elements whose texts are
+                            returned as a list.
+                - elements  Dict, field name and path of the element of which the
+                            first match is returned (like find).
+                - records   Dict, field name and a tuple with the tag of the record
+                            element, a dict of sub fields (name and path) that are
+                            joined per record and optionally the class that is
+                            created from the sub fields (dict by default).
+
+            Returns:
+                - None
+        """
+
+        # Rules per tag, so every element only needs a single lookup
+        self._rules = {}
+        self._records = {}
+        self._factories = {}
+        self._fields = []
+
+        # Compile the paths of the top level fields
+        for kind, fields in [(TEXT, texts), (LIST, lists), (ELEMENT, elements)]:
+            for name, path in (fields or {}).items():
+                self._addRule(rules=self._rules, kind=kind, name=name, path=path)
+                self._fields.append((kind, name))
+
+        # Compile the paths of the fields within records
+        for name, (tag, subfields, *factory) in (records or {}).items():
+            rules = {}
+            for subfield, path in subfields.items():
+                self._addRule(rules=rules, kind=TEXT, name=subfield, path=path)
+            self._records[tag] = (name, tuple(subfields), rules)
+            self._factories[name] = factory[0] if factory else dict
+            self._fields.append((RECORD, name))
+
+    def _addRule(self: object, rules: dict, kind: int, name: str, path: str) -> None:
+        """ Helper method that compiles a path into a rule.
+
+            Parameters:
+                - rules     Dict, the rules per tag (updated in place).
+                - kind      Int, kind of value that is extracted (TEXT, LIST, ELEMENT).
+                - name      Str, name of the field.
+                - path      Str, path of the elements to match.
+
+            Returns:
+                - None
+        """
+
+        tag, parent, attribute, value = compilePath(path)
+
+        # Paths with a parent are matched on the children of the parent element
+        if parent is None:
+            rules.setdefault(tag, []).append((None, kind, name, attribute, value))
+        else:
+            rules.setdefault(parent, []).append((tag, kind, name, attribute, value))
+
+    def extract(self: object, xml_element: TypeVar("Element")) -> dict:
+        """ Extract all fields from the element.
+
+            Parameters:
+                - xml_element   Element, the XML element to parse.
+
+            Returns:
+                - values        Dict, the value of each field.
+        """
+
+        # Placeholders for the matches of each field
+        matches = {
+            name: (None if kind == ELEMENT else []) for kind, name in self._fields
+        }
+
+        # Walk over all descendants (in document order) and apply the matching rules
+        all_rules, records, match = self._rules, self._records, self._match
+        descendants = xml_element.iter()
+        next(descendants)
+        for element in descendants:
+            tag = element.tag
+            rules = all_rules.get(tag)
+            if rules is not None:
+                match(element, rules, matches)
+
+            # Records (e.g. authors) match their own sub fields within their element
+            record = records.get(tag)
+            if record is not None:
+                name, subfields, record_rules = record
+                record_matches = {subfield: [] for subfield in subfields}
+                matches[name].append(record_matches)
+                record_descendants = element.iter()
+                next(record_descendants)
+                for record_element in record_descendants:
+                    rules = record_rules.get(record_element.tag)
+                    if rules is not None:
+                        match(record_element, rules, record_matches)
+
+        # Join the texts of the matched elements
+        values = {}
+        for kind, name in self._fields:
+            if kind == TEXT:
+                values[name] = joinContent(matches[name])
+            elif kind == RECORD:
+                factory = self._factories[name]
+                values[name] = [
+                    factory(
+                        **{
+                            subfield: joinContent(texts)
+                            for subfield, texts in record.items()
+                        }
+                    )
+                    for record in matches[name]
+                ]
+            else:
+                values[name] = matches[name]
+
+        # Return the extracted values
+        return values
+
+    def _match(
+        self: object, element: TypeVar("Element"), rules: list, matches: dict
+    ) -> None:
+        """ Helper method that applies the rules of a tag to an element.
+
+            Parameters:
+                - element   Element, the XML element to match.
+                - rules     List, the rules for the tag of the element.
+                - matches   Dict, the matches per field (updated in place).
+
+            Returns:
+                - None
+        """
+
+        for child_tag, kind, name, attribute, value in rules:
+
+            # Match the element itself (the most common case)
+            if child_tag is None:
+                if attribute is not None and element.get(attribute) != value:
+                    continue
+                if kind != ELEMENT:
+                    matches[name].append(element.text)
+                elif matches[name] is None:
+                    matches[name] = element
+                continue
+
+            # Match the children of the element for paths with a parent
+            for child in element:
+                if child.tag != child_tag:
+                    continue
+                if attribute is not None and child.get(attribute) != value:
+                    continue
+                if kind != ELEMENT:
+                    matches[name].append(child.text)
+                elif matches[name] is None:
+                    matches[name] = child
@@ -0,0 +1,191 @@
+import csv
+import itertools
+
+from array import array
+from typing import Optional
+
+
+def authorName(author: object) -> Optional[str]:
+    """ Helper method that returns the name of an author that identifies its node
+        in the graph ("lastname firstname", or the name of a collective).
+
+        Parameters:
+            - author    Author / dict, the author.
+
+        Returns:
+            - name      Str, the name of the author (None for authors without one).
+    """
+
+    if author.get("lastname") is not None or author.get("firstname") is not None:
+        return f'{author.get("lastname")} {author.get("firstname")}'
+    return author.get("collective")
+
+
+class CoAuthorshipGraph(object):
+    """ Weighted co-authorship graph, built incrementally from articles. Every
+        author gets an integer ID, and every pair of authors that wrote an article
+        together an edge, weighted by the number of articles they share.
+
+        Only the names of the authors and the edges are kept in memory (not the
+        articles), and adding an edge is a single dict update.
+    """
+
+    def __init__(
+        self: object, key: object = authorName, max_authors: Optional[int] = None
+    ) -> None:
+        """ Initialization of the object.
+
+            Parameters:
+                - key           Callable, returns the name that identifies the node of
+                                an author (None to leave the author out).
+                - max_authors   Int, articles with more authors than this are only
+                                added as nodes, without edges (the number of edges
+                                of an article grows quadratically with its authors).
+
+            Returns:
+                - None
+        """
+
+        self.key = key
+        self.max_authors = max_authors
+
+        # Integer ID of each author, and the name of each ID
+        self.nodes = {}
+        self.names = []
+
+        # Weight of each edge, keyed by the IDs of both authors packed into one int
+        self.edges = {}
+
+    def __len__(self: object) -> int:
+        return len(self.names)
+
+    def add(self: object, article: object) -> None:
+        """ Add the authors of an article to the graph.
+
+            Parameters:
+                - article   PubMedArticle / PubMedBookArticle, the article.
+
+            Returns:
+                - None
+        """
+
+        self.addAuthors(article.authors or [])
+
+    def addAuthors(self: object, authors: list) -> None:
+        """ Add a group of co-authors to the graph.
+
+            Parameters:
+                - authors   List, the authors (Author objects or dicts).
+
+            Returns:
+                - None
+        """
+
+        nodes, names, key = self.nodes, self.names, self.key
+
+        # Look up (or assign) the ID of each author
+        author_ids = set()
+        for author in authors:
+            name = key(author)
+            if name is None:
+                continue
+            author_id = nodes.get(name)
+            if author_id is None:
+                author_id = nodes[name] = len(names)
+                names.append(name)
+            author_ids.add(author_id)
+
+        # Add (or strengthen) the edge between every pair of authors
+        if self.max_authors is not None and len(author_ids) > self.max_authors:
+            return
+        edges = self.edges
+        for source, target in itertools.combinations(sorted(author_ids), 2):
+            edge = source << 32 | target
+            edges[edge] = edges.get(edge, 0) + 1
+
+    def extend(self: object, articles: list) -> "CoAuthorshipGraph":
+        """ Add the authors of articles to the graph (e.g. the results of
+            PubMed.query, which are consumed one by one).
+
+            Parameters:
+                - articles  List / iterator, yields the articles.
+
+            Returns:
+                - graph     CoAuthorshipGraph, the graph itself.
+        """
+
+        for article in articles:
+            self.add(article)
+        return self
+
+    def toCOO(self: object) -> tuple:
+        """ Export the edges in coordinate (COO) format, each edge once with the
+            lowest ID as source.
+
+            Returns:
+                - sources   array, ID of the first author of each edge.
+                - targets   array, ID of the second author of each edge.
+                - weights   array, weight of each edge.
+        """
+
+        sources, targets, weights = array("I"), array("I"), array("I")
+        for edge, weight in self.edges.items():
+            sources.append(edge >> 32)
+            targets.append(edge & 0xFFFFFFFF)
+            weights.append(weight)
+        return sources, targets, weights
+
+    def toScipy(self: object, symmetric: bool = True) -> "scipy.sparse.coo_matrix":
+        """ Export the graph as sparse adjacency matrix (requires scipy).
+
+            Parameters:
+                - symmetric     Bool, include each edge in both directions (True)
+                                or only from the lowest to the highest ID (False).
+
+            Returns:
+                - matrix        scipy.sparse.coo_matrix, the weighted adjacency matrix.
+        """
+
+        try:
+            import numpy
+            from scipy import sparse
+        except ImportError:
+            raise ImportError("Exporting to a sparse matrix requires scipy")
+
+        sources, targets, weights = [
+            numpy.frombuffer(values, dtype=values.typecode) for values in self.toCOO()
+        ]
+        if symmetric:
+            sources, targets = (
+                numpy.concatenate([sources, targets]),
+                numpy.concatenate([targets, sources]),
+            )
+            weights = numpy.concatenate([weights, weights])
+        return sparse.coo_matrix(
+            (weights, (sources, targets)), shape=(len(self), len(self))
+        )
+
+    def toCSV(self: object, nodes_path: str, edges_path: str) -> None:
+        """ Write the nodes ("id", "label") and the edges ("source", "target",
+            "weight") to CSV files, e.g. to import them in Gephi.
+
+            Parameters:
+                - nodes_path    Str, path of the nodes file.
+                - edges_path    Str, path of the edges file.
+
+            Returns:
+                - None
+        """
+
+        with open(nodes_path, "w", encoding="utf8", newline="") as nodes_file:
+            writer = csv.writer(nodes_file, delimiter=",")
+            writer.writerow(["id", "label"])
+            writer.writerows(enumerate(self.names))
+
+        with open(edges_path, "w", encoding="utf8", newline="") as edges_file:
+            writer = csv.writer(edges_file, delimiter=",")
+            writer.writerow(["source", "target", "weight"])
+            writer.writerows(
+                (edge >> 32, edge & 0xFFFFFFFF, weight)
+                for edge, weight in self.edges.items()
+            )
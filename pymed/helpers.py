@@ -1,4 +1,12 @@
+import os
+import json
+import time
+import random
+import datetime
+import email.utils
+
 from typing import TypeVar
+from typing import Optional
 
 
 def batches(iterable: list, n: int = 1) -> list:
@@ -47,3 +55,128 @@ def getContent(
     # Extract the text and return it
     else:
         return separator.join([sub.text for sub in result if sub.text is not None])
+
+
+def retryDelay(
+    attempt: int, backoff_factor: float, retry_after: Optional[str] = None
+) -> float:
+    """ Helper method that calculates how long to wait before retrying a request.
+
+        Parameters:
+            - attempt           Int, number of the attempt that failed (starting at 0).
+            - backoff_factor    Float, base delay in seconds for the exponential
+                                backoff.
+            - retry_after       Str, value of the Retry-After header of the failed
+                                response (if any). A value that can not be parsed
+                                falls back to the exponential backoff.
+
+        Returns:
+            - delay             Float, number of seconds to wait.
+    """
+
+    # Honor the delay requested by the server (either seconds or an HTTP date),
+    # unless it can not be parsed
+    if retry_after is not None:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+        try:
+            retry_date = email.utils.parsedate_to_datetime(retry_after)
+            return max(0.0, retry_date.timestamp() - time.time())
+        except (TypeError, ValueError):
+            pass
+
+    # Exponential backoff with full jitter
+    return random.uniform(0, backoff_factor * (2 ** attempt))
+
+
+def readJSON(path: str, default: object = None) -> object:
+    """ Helper method that reads a JSON file.
+
+        Parameters:
+            - path          Str, path of the file.
+            - default       Object, value to return when the file does not exist.
+
+        Returns:
+            - value         Object, the parsed contents of the file.
+    """
+
+    if not os.path.exists(path):
+        return default
+    with open(path, "r", encoding="utf8") as json_file:
+        return json.load(json_file)
+
+
+def writeJSON(path: str, value: object) -> None:
+    """ Helper method that writes a JSON file. The file is replaced in a single
+        step, so it is never left half written.
+
+        Parameters:
+            - path          Str, path of the file.
+            - value         Object, the value to write.
+
+        Returns:
+            - None
+    """
+
+    with open(f"{path}.tmp", "w", encoding="utf8") as json_file:
+        json.dump(value, json_file, indent=4, sort_keys=True)
+    os.replace(f"{path}.tmp", path)
+
+
+def dateRangeQuery(query: str, start: datetime.date, end: datetime.date) -> str:
+    """ Helper method that limits a query to a range of publication dates.
+
+        Parameters:
+            - query         Str, the query.
+            - start         Date, first publication date of the range.
+            - end           Date, last publication date of the range.
+
+        Returns:
+            - query         Str, the query for the range.
+    """
+
+    return (
+        f'({query}) AND ("{start.strftime("%Y/%m/%d")}"[PDAT] : '
+        f'"{end.strftime("%Y/%m/%d")}"[PDAT])'
+    )
+
+
+def dateBuckets(start: datetime.date, end: datetime.date, interval: str) -> list:
+    """ Helper method that splits a range of dates into years, months or days.
+
+        Parameters:
+            - start         Date, first date of the range.
+            - end           Date, last date of the range.
+            - interval      Str, "year", "month" or "day".
+
+        Returns:
+            - buckets       List, the key ("2019", "2019/03" or "2019/03/05"), the
+                            first and the last date of each bucket (within the
+                            range), in order.
+    """
+
+    buckets = []
+    bucket_start = start
+    while bucket_start <= end:
+
+        # Find the start of the next bucket
+        if interval == "year":
+            key = bucket_start.strftime("%Y")
+            next_start = datetime.date(bucket_start.year + 1, 1, 1)
+        elif interval == "month":
+            key = bucket_start.strftime("%Y/%m")
+            month = bucket_start.year * 12 + bucket_start.month
+            next_start = datetime.date(month // 12, month % 12 + 1, 1)
+        elif interval == "day":
+            key = bucket_start.strftime("%Y/%m/%d")
+            next_start = bucket_start + datetime.timedelta(days=1)
+        else:
+            raise ValueError(f"Unknown interval: {interval}")
+
+        bucket_end = min(next_start - datetime.timedelta(days=1), end)
+        buckets.append((key, bucket_start, bucket_end))
+        bucket_start = next_start
+
+    return buckets
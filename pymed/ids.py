@@ -0,0 +1,168 @@
+from array import array
+from typing import Union
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class ArticleIds(object):
+    """ Compact list of PubMed IDs, stored as unsigned 32-bit integers in a single
+        buffer (4 bytes per ID, instead of a str object of about 55 bytes and a
+        reference in a list).
+
+        It can be used like the list of str IDs it replaces: iterating and indexing
+        return str IDs, and slicing (e.g. by helpers.batches) returns ArticleIds.
+        The set operations (|, &, - and ^) return the sorted unique IDs, and are
+        vectorized with NumPy when it is installed.
+    """
+
+    __slots__ = ("values",)
+
+    def __init__(self: object, article_ids: Union[list, array] = ()) -> None:
+        """ Initialization of the object.
+
+            Parameters:
+                - article_ids   List / array, the IDs (str or int), or an array of
+                                unsigned ints to use as buffer (without copying).
+
+            Returns:
+                - None
+        """
+
+        if isinstance(article_ids, ArticleIds):
+            self.values = array("I", article_ids.values)
+        elif isinstance(article_ids, array) and article_ids.typecode == "I":
+            self.values = article_ids
+        else:
+            self.values = array("I", map(int, article_ids))
+
+    def __len__(self: object) -> int:
+        return len(self.values)
+
+    def __iter__(self: object) -> list:
+        return map(str, self.values)
+
+    def __getitem__(self: object, index: Union[int, slice]) -> Union[str, "ArticleIds"]:
+        if isinstance(index, slice):
+            return ArticleIds(self.values[index])
+        return str(self.values[index])
+
+    def __contains__(self: object, article_id: Union[str, int]) -> bool:
+        return int(article_id) in self.values
+
+    def __eq__(self: object, other: object) -> bool:
+        if isinstance(other, ArticleIds):
+            return self.values == other.values
+        if isinstance(other, (list, tuple)):
+            return list(self) == [str(article_id) for article_id in other]
+        return NotImplemented
+
+    def __repr__(self: object) -> str:
+        return f"ArticleIds({list(self)})"
+
+    def __reduce__(self: object) -> tuple:
+        return (ArticleIds, (self.values,))
+
+    def __add__(self: object, other: list) -> "ArticleIds":
+        result = ArticleIds(self)
+        result.extend(other)
+        return result
+
+    def __iadd__(self: object, other: list) -> "ArticleIds":
+        self.extend(other)
+        return self
+
+    def __or__(self: object, other: list) -> "ArticleIds":
+        return self.union(other)
+
+    def __and__(self: object, other: list) -> "ArticleIds":
+        return self.intersection(other)
+
+    def __sub__(self: object, other: list) -> "ArticleIds":
+        return self.difference(other)
+
+    def __xor__(self: object, other: list) -> "ArticleIds":
+        return self.symmetric_difference(other)
+
+    def append(self: object, article_id: Union[str, int]) -> None:
+        self.values.append(int(article_id))
+
+    def extend(self: object, article_ids: list) -> None:
+        if isinstance(article_ids, ArticleIds):
+            self.values.extend(article_ids.values)
+        else:
+            self.values.extend(map(int, article_ids))
+
+    def unique(self: object) -> "ArticleIds":
+        """ Return the IDs without duplicates (in their original order).
+        """
+
+        return ArticleIds(array("I", dict.fromkeys(self.values)))
+
+    def sorted(self: object) -> "ArticleIds":
+        """ Return the sorted unique IDs.
+        """
+
+        if numpy is not None:
+            return self._fromNumpy(numpy.unique(self.toNumpy()))
+        return ArticleIds(array("I", sorted(set(self.values))))
+
+    def union(self: object, other: list) -> "ArticleIds":
+        """ Return the sorted unique IDs that are in either list.
+        """
+
+        return self._combine(other, "union1d", set.union)
+
+    def intersection(self: object, other: list) -> "ArticleIds":
+        """ Return the sorted unique IDs that are in both lists.
+        """
+
+        return self._combine(other, "intersect1d", set.intersection)
+
+    def difference(self: object, other: list) -> "ArticleIds":
+        """ Return the sorted unique IDs that are not in the other list.
+        """
+
+        return self._combine(other, "setdiff1d", set.difference)
+
+    def symmetric_difference(self: object, other: list) -> "ArticleIds":
+        """ Return the sorted unique IDs that are in one of the lists, but not in
+            both.
+        """
+
+        return self._combine(other, "setxor1d", set.symmetric_difference)
+
+    def toNumpy(self: object) -> "numpy.ndarray":
+        """ Return the IDs as a NumPy array of unsigned ints, sharing the buffer
+            (requires NumPy).
+        """
+
+        if numpy is None:
+            raise ImportError("Exporting to NumPy requires numpy")
+        return numpy.frombuffer(self.values, dtype=self.values.typecode)
+
+    def _combine(
+        self: object, other: list, function: str, operation: object
+    ) -> "ArticleIds":
+        """ Helper method that applies a set operation to both lists, with the
+            NumPy function when it is available.
+        """
+
+        other = other if isinstance(other, ArticleIds) else ArticleIds(other)
+        if numpy is not None:
+            return self._fromNumpy(
+                getattr(numpy, function)(self.toNumpy(), other.toNumpy())
+            )
+        return ArticleIds(
+            array("I", sorted(operation(set(self.values), other.values)))
+        )
+
+    def _fromNumpy(self: object, values: "numpy.ndarray") -> "ArticleIds":
+        """ Helper method that creates a list of IDs from a NumPy array.
+        """
+
+        result = array("I")
+        result.frombytes(values.astype(self.values.typecode).tobytes())
+        return ArticleIds(result)
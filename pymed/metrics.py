@@ -0,0 +1,359 @@
+import time
+import bisect
+import threading
+
+from typing import Optional
+
+
+# Upper bounds (in seconds) of the buckets of the latency histograms
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Events that hooks can be added for, and the values they are called with
+EVENTS = {
+    "request": ("endpoint", "status", "seconds", "bytes", "attempt"),
+    "retry": ("endpoint", "attempt", "delay", "reason"),
+    "rate_limit": ("seconds",),
+    "batch": ("records", "seconds"),
+    "article": ("article", "seconds"),
+}
+
+
+def formatLabels(names: tuple, values: tuple, extra: str = "") -> str:
+    """ Helper method that formats the labels of a sample in the Prometheus text
+        format, e.g. {endpoint="efetch",status="200"}.
+    """
+
+    labels = [
+        '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+        for name, value in zip(names, values)
+    ]
+    if extra:
+        labels.append(extra)
+    return "{" + ",".join(labels) + "}" if labels else ""
+
+
+class Counter(object):
+    """ Thread-safe counter, with a value per combination of labels.
+    """
+
+    def __init__(self: object, name: str, description: str, labels: tuple = ()) -> None:
+        """ Initialization of the object.
+
+            Parameters:
+                - name          Str, name of the metric.
+                - description   Str, help text of the metric.
+                - labels        Tuple, names of the labels.
+
+            Returns:
+                - None
+        """
+
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self.values = {}
+        self._lock = threading.Lock()
+
+    def inc(self: object, value: float = 1, **labels: dict) -> None:
+        """ Increase the counter (of the combination of labels) by a value.
+        """
+
+        key = tuple(labels.get(label, "") for label in self.labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0) + value
+
+    def get(self: object, **labels: dict) -> float:
+        """ Return the value of the counter (of the combination of labels).
+        """
+
+        return self.values.get(tuple(labels.get(label, "") for label in self.labels), 0)
+
+    def toPrometheus(self: object) -> list:
+        """ Return the lines of the counter in the Prometheus text format.
+        """
+
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} counter",
+        ]
+        with self._lock:
+            for key, value in sorted(self.values.items()):
+                lines.append(f"{self.name}{formatLabels(self.labels, key)} {value}")
+        return lines
+
+
+class Histogram(object):
+    """ Thread-safe histogram of observed values (e.g. latencies), with the counts
+        per bucket, the sum and the number of observations per combination of
+        labels.
+    """
+
+    def __init__(
+        self: object,
+        name: str,
+        description: str,
+        labels: tuple = (),
+        buckets: tuple = DEFAULT_BUCKETS,
+    ) -> None:
+        """ Initialization of the object.
+
+            Parameters:
+                - name          Str, name of the metric.
+                - description   Str, help text of the metric.
+                - labels        Tuple, names of the labels.
+                - buckets       Tuple, upper bounds of the buckets (ascending).
+
+            Returns:
+                - None
+        """
+
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self.values = {}
+        self._lock = threading.Lock()
+
+    def observe(self: object, value: float, **labels: dict) -> None:
+        """ Add an observation (of the combination of labels).
+        """
+
+        key = tuple(labels.get(label, "") for label in self.labels)
+        with self._lock:
+            counts, total = self.values.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            counts[bisect.bisect_left(self.buckets, value)] += 1
+            self.values[key] = (counts, total + value)
+
+    def get(self: object, **labels: dict) -> dict:
+        """ Return the number of observations, their sum and the counts per bucket
+            (of the combination of labels).
+        """
+
+        key = tuple(labels.get(label, "") for label in self.labels)
+        counts, total = self.values.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+        return {
+            "count": sum(counts),
+            "sum": total,
+            "buckets": dict(zip(self.buckets + (float("inf"),), counts)),
+        }
+
+    def toPrometheus(self: object) -> list:
+        """ Return the lines of the histogram in the Prometheus text format.
+        """
+
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            for key, (counts, total) in sorted(self.values.items()):
+
+                # Buckets are cumulative
+                cumulative = 0
+                for bound, count in zip(self.buckets + ("+Inf",), counts):
+                    cumulative += count
+                    labels = formatLabels(self.labels, key, f'le="{bound}"')
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+
+                labels = formatLabels(self.labels, key)
+                lines.append(f"{self.name}_sum{labels} {total}")
+                lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Metrics(object):
+    """ Counters and latency histograms of the requests to PubMed and the parsing
+        of the responses, and hooks that are called for each event (see EVENTS).
+        Pass an instance to PubMed(..., metrics=metrics) to collect them.
+    """
+
+    def __init__(self: object, buckets: tuple = DEFAULT_BUCKETS) -> None:
+        """ Initialization of the object.
+
+            Parameters:
+                - buckets   Tuple, upper bounds (in seconds) of the buckets of the
+                            latency histograms.
+
+            Returns:
+                - None
+        """
+
+        self.requests = Counter(
+            "pymed_requests_total",
+            "Number of requests made to PubMed.",
+            ("endpoint", "status"),
+        )
+        self.request_seconds = Histogram(
+            "pymed_request_duration_seconds",
+            "Duration of the requests to PubMed (streamed: until the headers).",
+            ("endpoint",),
+            buckets,
+        )
+        self.response_bytes = Counter(
+            "pymed_response_bytes_total",
+            "Number of bytes received from PubMed.",
+            ("endpoint",),
+        )
+        self.retries = Counter(
+            "pymed_retries_total",
+            "Number of requests that were retried.",
+            ("endpoint", "reason"),
+        )
+        self.rate_limit_seconds = Histogram(
+            "pymed_rate_limit_wait_seconds",
+            "Time spent waiting for the rate limit before each request.",
+            (),
+            buckets,
+        )
+        self.batch_seconds = Histogram(
+            "pymed_batch_parse_seconds",
+            "Time spent parsing the records of each efetch batch.",
+            (),
+            buckets,
+        )
+        self.articles = Counter(
+            "pymed_articles_total", "Number of article objects created.", ("type",)
+        )
+        self.article_seconds = Counter(
+            "pymed_article_construction_seconds_total",
+            "Time spent creating article objects.",
+            ("type",),
+        )
+
+        # Callbacks for each event
+        self._hooks = {event: [] for event in EVENTS}
+
+    def addHook(self: object, event: str, callback: object) -> None:
+        """ Add a callback that is called with the values of an event as keyword
+            arguments, e.g. addHook("request", print).
+
+            Parameters:
+                - event     Str, name of the event (see EVENTS).
+                - callback  Callable, the callback.
+
+            Returns:
+                - None
+        """
+
+        if event not in EVENTS:
+            raise ValueError(f"Unknown event: {event}")
+        self._hooks[event].append(callback)
+
+    def removeHook(self: object, event: str, callback: object) -> None:
+        """ Remove a callback that was added with addHook.
+        """
+
+        self._hooks[event].remove(callback)
+
+    def emit(self: object, event: str, **values: dict) -> None:
+        """ Call the callbacks of an event.
+        """
+
+        for callback in self._hooks[event]:
+            callback(**values)
+
+    def observeRequest(
+        self: object,
+        endpoint: str,
+        status: Optional[int],
+        seconds: float,
+        bytes: int,
+        attempt: int,
+    ) -> None:
+        """ Record a request (status is None when the request failed).
+        """
+
+        status = "error" if status is None else str(status)
+        self.requests.inc(endpoint=endpoint, status=status)
+        self.request_seconds.observe(seconds, endpoint=endpoint)
+        self.response_bytes.inc(bytes, endpoint=endpoint)
+        self.emit(
+            "request",
+            endpoint=endpoint,
+            status=status,
+            seconds=seconds,
+            bytes=bytes,
+            attempt=attempt,
+        )
+
+    def observeRetry(
+        self: object, endpoint: str, attempt: int, delay: float, reason: str
+    ) -> None:
+        """ Record a retry of a request.
+        """
+
+        self.retries.inc(endpoint=endpoint, reason=reason)
+        self.emit(
+            "retry", endpoint=endpoint, attempt=attempt, delay=delay, reason=reason
+        )
+
+    def observeRateLimit(self: object, seconds: float) -> None:
+        """ Record the time spent waiting for the rate limit.
+        """
+
+        self.rate_limit_seconds.observe(seconds)
+        self.emit("rate_limit", seconds=seconds)
+
+    def observeArticle(self: object, article: object, seconds: float) -> None:
+        """ Record the creation of an article object.
+        """
+
+        article_type = type(article).__name__
+        self.articles.inc(type=article_type)
+        self.article_seconds.inc(seconds, type=article_type)
+        self.emit("article", article=article, seconds=seconds)
+
+    def timeBatch(self: object, records: list) -> list:
+        """ Record the time spent parsing the records of an efetch batch. The time
+            is measured while the records are retrieved from the iterator (so it
+            excludes the time the caller spends on each record).
+
+            Parameters:
+                - records   List / iterator, yields the records of the batch.
+
+            Returns:
+                - records   Iterator, yields the same records.
+        """
+
+        seconds = 0.0
+        count = 0
+        records = iter(records)
+
+        while True:
+            start = time.perf_counter()
+            record = next(records, None)
+            seconds += time.perf_counter() - start
+            if record is None:
+                break
+            count += 1
+            yield record
+
+        self.batch_seconds.observe(seconds)
+        self.emit("batch", records=count, seconds=seconds)
+
+    def metrics(self: object) -> list:
+        """ Return all counters and histograms.
+        """
+
+        return [
+            self.requests,
+            self.request_seconds,
+            self.response_bytes,
+            self.retries,
+            self.rate_limit_seconds,
+            self.batch_seconds,
+            self.articles,
+            self.article_seconds,
+        ]
+
+    def toPrometheus(self: object) -> str:
+        """ Export all counters and histograms in the Prometheus text format.
+
+            Returns:
+                - text      Str, the metrics (e.g. to serve on a /metrics endpoint).
+        """
+
+        lines = []
+        for metric in self.metrics():
+            lines += metric.toPrometheus()
+        return "\n".join(lines) + "\n"
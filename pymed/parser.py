@@ -0,0 +1,225 @@
+import re
+
+import xml.etree.ElementTree as xml
+
+from typing import Union
+from typing import TypeVar
+from typing import BinaryIO
+from typing import Optional
+
+from .article import PubMedArticle
+from .book import PubMedBookArticle
+
+
+# Tags of the records in an efetch response
+RECORD_TAGS = ("PubmedArticle", "PubmedBookArticle")
+
+# The serialized records of an efetch response, and the PubMed ID of each (the
+# first PMID of a record is that of the citation or book document)
+RECORD_PATTERN = re.compile(
+    r"<(PubmedArticle|PubmedBookArticle)>.*?<PMID[^>]*>(\d+)</PMID>.*?</\1>",
+    re.DOTALL,
+)
+
+
+def createArticle(
+    xml_element: TypeVar("Element"), lazy: bool = False, fields: Optional[list] = None
+) -> Union[PubMedArticle, PubMedBookArticle]:
+    """ Helper method that creates the article object for a record.
+
+        Parameters:
+            - xml_element   Element, a PubmedArticle or PubmedBookArticle element.
+            - lazy          Bool, decode the fields of the article on first access.
+            - fields        List, names of the fields of a lazy article that are
+                            decoded right away.
+
+        Returns:
+            - article       PubMedArticle / PubMedBookArticle, the article object.
+                            Book articles are always decoded right away (lazy
+                            and fields only apply to articles).
+    """
+
+    if xml_element.tag == "PubmedArticle":
+        return PubMedArticle(xml_element=xml_element, lazy=lazy, fields=fields)
+    else:
+        return PubMedBookArticle(xml_element=xml_element)
+
+
+def getPubMedId(xml_element: TypeVar("Element")) -> str:
+    """ Helper method that returns the PubMed ID of a record (without parsing the
+        rest of the record).
+
+        Parameters:
+            - xml_element   Element, a PubmedArticle or PubmedBookArticle element.
+
+        Returns:
+            - pubmed_id     Str, the PubMed ID of the record.
+    """
+
+    return xml_element.findtext("MedlineCitation/PMID") or xml_element.findtext(
+        "BookDocument/PMID"
+    )
+
+
+def getDateRevised(xml_element: TypeVar("Element")) -> Optional[str]:
+    """ Helper method that returns the date a record was last revised.
+
+        Parameters:
+            - xml_element   Element, a PubmedArticle or PubmedBookArticle element.
+
+        Returns:
+            - date_revised  Str, the date as YYYY-MM-DD (None if it is unknown).
+    """
+
+    date_revised = xml_element.find("MedlineCitation/DateRevised")
+    if date_revised is None:
+        date_revised = xml_element.find("BookDocument/DateRevised")
+    if date_revised is None:
+        return None
+
+    # Format the date so dates can be compared as strings
+    year, month, day = [
+        date_revised.findtext(part, "1") for part in ("Year", "Month", "Day")
+    ]
+    return f"{int(year):04d}-{int(month):02d}-{int(day):02d}"
+
+
+def serializeRecord(xml_element: TypeVar("Element")) -> tuple:
+    """ Helper method that serializes a record, together with its ID and revision
+        date (as stored in the article caches).
+
+        Parameters:
+            - xml_element   Element, a PubmedArticle or PubmedBookArticle element.
+
+        Returns:
+            - record        Tuple, the PubMed ID, the revision date and the XML.
+    """
+
+    return (
+        getPubMedId(xml_element),
+        getDateRevised(xml_element),
+        xml.tostring(xml_element, encoding="unicode"),
+    )
+
+
+def splitRecords(response: str) -> dict:
+    """ Helper method that splits an efetch response into the serialized records,
+        without parsing them (e.g. to reorder them before they are parsed in
+        another process).
+
+        Parameters:
+            - response      Str, XML returned by efetch.
+
+        Returns:
+            - records       Dict, XML of each record per PubMed ID (in the order
+                            of the response).
+    """
+
+    return {
+        match.group(2): match.group(0) for match in RECORD_PATTERN.finditer(response)
+    }
+
+
+def iterRecords(response: Union[str, bytes]) -> list:
+    """ Helper method that parses an efetch response into the elements of the
+        records.
+
+        Parameters:
+            - response      Str / bytes, XML returned by efetch.
+
+        Returns:
+            - records       List, yields the PubmedArticle and PubmedBookArticle
+                            elements in the order of the document.
+    """
+
+    # Parse as XML
+    root = xml.fromstring(response)
+
+    # Loop over the articles and the books
+    for element in root:
+        if element.tag in RECORD_TAGS:
+            yield element
+
+
+def iterRecordsStream(stream: BinaryIO) -> list:
+    """ Helper method that incrementally parses an efetch response while it is
+        being read. Each record is returned as soon as it is complete, after
+        which it is removed from the document to keep memory usage flat.
+
+        Parameters:
+            - stream        File-like object, yields the bytes of the XML response.
+
+        Returns:
+            - records       List, yields the PubmedArticle and PubmedBookArticle
+                            elements in the order of the document.
+    """
+
+    root = None
+
+    # Parse the document while reading it
+    for event, element in xml.iterparse(stream, events=("start", "end")):
+
+        # Keep a reference to the root (the first element) so it can be cleared
+        if root is None:
+            root = element
+
+        # Return the records as soon as their closing tags arrive
+        elif event == "end" and element.tag in RECORD_TAGS:
+            yield element
+
+            # Drop the processed records from the document
+            root.clear()
+
+
+def parseArticles(
+    response: Union[str, bytes], lazy: bool = False, fields: Optional[list] = None
+) -> list:
+    """ Helper method that parses an efetch response into article objects.
+
+        Parameters:
+            - response      Str / bytes, XML returned by efetch.
+            - lazy          Bool, decode the fields of the articles on first access.
+            - fields        List, names of the fields of lazy articles that are
+                            decoded right away.
+
+        Returns:
+            - articles      List, yields the article and book article objects.
+    """
+
+    for record in iterRecords(response):
+        yield createArticle(record, lazy=lazy, fields=fields)
+
+
+def parseArticlesDetached(
+    response: Union[str, bytes], serialize: Union[bool, list] = False
+) -> tuple:
+    """ Helper method that parses an efetch response into article objects that
+        are cheap to send to another process. The XML element of each article is
+        dropped (pickling it takes a lot longer than parsing the response).
+
+        Parameters:
+            - response      Str / bytes, XML returned by efetch.
+            - serialize     Bool / list, also return the serialized records (to
+                            store in an article cache), or only those of the
+                            PubMed IDs in the list.
+
+        Returns:
+            - articles      List, the article and book article objects.
+            - records       List, the serialized records (empty if serialize is
+                            False).
+    """
+
+    articles = []
+    records = []
+    if isinstance(serialize, list):
+        serialize = set(serialize)
+
+    for record in iterRecords(response):
+        if serialize is True or (serialize and getPubMedId(record) in serialize):
+            records.append(serializeRecord(record))
+        article = createArticle(record)
+        if hasattr(article, "xml"):
+            article.xml = None
+        articles.append(article)
+
+    return articles, records
@@ -0,0 +1,120 @@
+import time
+import asyncio
+import threading
+
+from typing import Optional
+
+
+# Number of requests per second that PubMed allows without and with an API key
+DEFAULT_RATE_LIMIT = 3
+API_KEY_RATE_LIMIT = 10
+
+
+class RateLimiter(object):
+    """ Thread-safe token bucket that blocks the caller until a request is allowed.
+    """
+
+    def __init__(self: object, rate: float, capacity: float = 1) -> None:
+        """ Initialization of the object.
+
+            Parameters:
+                - rate          Float, number of tokens added to the bucket per second.
+                - capacity      Float, maximum number of tokens in the bucket (the
+                                burst size). Defaults to 1 so requests are spread
+                                evenly over each second.
+
+            Returns:
+                - None
+        """
+
+        # Store the input parameters
+        self.rate = rate
+        self.capacity = capacity
+
+        # Start with a full bucket
+        self._tokens = capacity
+        self._updated = time.monotonic()
+
+        # Guard the bucket, it is shared between threads and PubMed instances
+        self._lock = threading.Lock()
+
+    def _reserve(self: object) -> float:
+        """ Helper method that takes a token from the bucket.
+
+            Returns:
+                - delay     Float, number of seconds the caller has to wait before
+                            the reserved token becomes available.
+        """
+
+        with self._lock:
+
+            # Refill the bucket with the tokens that were added since the last call
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+
+            # Take a token, the bucket goes negative if callers are queueing up
+            self._tokens -= 1
+
+            # Calculate how long it takes before this token is actually available
+            return max(0.0, -self._tokens / self.rate)
+
+    def acquire(self: object) -> float:
+        """ Block until a request may be made.
+
+            Returns:
+                - waited    Float, number of seconds spent waiting for a token.
+        """
+
+        # Reserve a token and sleep (without holding the lock) until it is ours
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+        # Return the time spent waiting
+        return delay
+
+    async def acquireAsync(self: object) -> float:
+        """ Wait (without blocking the event loop) until a request may be made.
+            Shares the bucket with the blocking acquire method.
+
+            Returns:
+                - waited    Float, number of seconds spent waiting for a token.
+        """
+
+        # Reserve a token and yield to the event loop until it is ours
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        # Return the time spent waiting
+        return delay
+
+
+# Limiters shared by all PubMed instances, keyed by API key
+_rateLimiters = {}
+_rateLimitersLock = threading.Lock()
+
+
+def getRateLimiter(api_key: Optional[str] = None) -> RateLimiter:
+    """ Helper method that returns the rate limiter shared by everyone using the
+        same API key. PubMed enforces its limits per key, or per client without one.
+
+        Parameters:
+            - api_key       Str, NCBI API key (optional).
+
+        Returns:
+            - limiter       RateLimiter, the shared rate limiter for the key.
+    """
+
+    with _rateLimitersLock:
+
+        # Create a limiter for this key if there is none yet
+        if api_key not in _rateLimiters:
+            rate = API_KEY_RATE_LIMIT if api_key else DEFAULT_RATE_LIMIT
+            _rateLimiters[api_key] = RateLimiter(rate=rate)
+
+        # Return the shared limiter
+        return _rateLimiters[api_key]
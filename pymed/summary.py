@@ -0,0 +1,135 @@
+import json
+import datetime
+
+from typing import Optional
+
+from .author import Author
+from .author import internString
+
+
+def parseDate(value: Optional[str]) -> Optional[datetime.date]:
+    """ Helper method that parses a date of a summary ("2019/10/17 06:00").
+    """
+
+    try:
+        year, month, day = value.split(" ", 1)[0].split("/")
+        return datetime.date(year=int(year), month=int(month), day=int(day))
+    except (AttributeError, ValueError):
+        return None
+
+
+def parseAuthor(name: str) -> Author:
+    """ Helper method that creates an author from the name in a summary, which
+        consists of the last name and the initials ("Smith JA").
+    """
+
+    lastname, _, initials = name.rpartition(" ")
+    if not lastname:
+        return Author(lastname=initials)
+    return Author(lastname=lastname, initials=initials)
+
+
+class PubMedSummary(object):
+    """ Data class that contains the summary of a PubMed article (from esummary):
+        only the core metadata, without the abstract, keywords and XML of a
+        PubMedArticle, at a fraction of the size and the cost to parse.
+    """
+
+    __slots__ = ("pubmed_id", "title", "journal", "publication_date", "authors", "doi")
+
+    def __init__(self: object, **kwargs: dict) -> None:
+        """ Initialization of the object from parameters.
+        """
+
+        for field in self.__slots__:
+            setattr(self, field, kwargs.get(field, None))
+
+    @classmethod
+    def fromJSON(cls: type, document: dict) -> "PubMedSummary":
+        """ Create the summary from a document of an esummary (JSON) response.
+
+            Parameters:
+                - document  Dict, the document summary of an article.
+
+            Returns:
+                - summary   PubMedSummary, the summary.
+        """
+
+        # The date the article was added to PubMed, like PubMedArticle
+        dates = {
+            date.get("pubstatus"): date.get("date")
+            for date in document.get("history", [])
+        }
+
+        # The identifiers of the article
+        ids = {
+            article_id.get("idtype"): article_id.get("value")
+            for article_id in document.get("articleids", [])
+        }
+
+        return cls(
+            pubmed_id=document.get("uid"),
+            title=document.get("title") or document.get("booktitle") or None,
+            journal=internString(
+                document.get("fulljournalname") or document.get("source") or None
+            ),
+            publication_date=parseDate(
+                dates.get("pubmed") or document.get("sortpubdate")
+            ),
+            authors=[
+                parseAuthor(author["name"])
+                for author in document.get("authors", [])
+                if author.get("authtype", "Author") == "Author" and author.get("name")
+            ],
+            doi=ids.get("doi") or None,
+        )
+
+    def toDict(self: object, fields: Optional[list] = None) -> dict:
+        """ Helper method to convert the summary to a Python dict.
+
+            Parameters:
+                - fields    List, names of the fields to include (defaults to all).
+        """
+
+        values = {key: getattr(self, key) for key in fields or self.__slots__}
+
+        # Convert the authors to dicts as well
+        if values.get("authors") is not None:
+            values["authors"] = [dict(author) for author in values["authors"]]
+
+        return values
+
+    def toJSON(self: object, fields: Optional[list] = None) -> str:
+        """ Helper method for debugging, dumps the object as JSON string.
+
+            Parameters:
+                - fields    List, names of the fields to include (defaults to all).
+        """
+
+        return json.dumps(
+            {
+                key: (value if not isinstance(value, datetime.date) else str(value))
+                for key, value in self.toDict(fields=fields).items()
+            },
+            sort_keys=True,
+            indent=4,
+        )
+
+
+def parseSummaries(response: dict) -> list:
+    """ Helper method that creates the summaries of an esummary (JSON) response.
+
+        Parameters:
+            - response      Dict, the parsed esummary response.
+
+        Returns:
+            - summaries     List, PubMedSummary objects (in the order of the IDs,
+                            without the IDs that could not be found).
+    """
+
+    result = response.get("result", {})
+    return [
+        PubMedSummary.fromJSON(result[uid])
+        for uid in result.get("uids", [])
+        if uid in result and "error" not in result[uid]
+    ]
@@ -0,0 +1,411 @@
+import datetime
+
+from array import array
+from typing import Union
+from typing import Optional
+
+
+# Dates are stored as the number of days since the UNIX epoch (like Arrow's date32)
+EPOCH = datetime.date(1970, 1, 1).toordinal()
+
+# Fields of the authors in the authors column
+AUTHOR_FIELDS = ("lastname", "firstname", "initials", "affiliation", "collective")
+
+
+class StringColumn(object):
+    """ Column of strings, stored like an Arrow large_string array: the UTF-8
+        bytes of all values in a single buffer, the offsets of the values in
+        that buffer, and a bitmap that marks the values that are not None.
+    """
+
+    __slots__ = ("offsets", "data", "validity", "null_count")
+
+    def __init__(self: object) -> None:
+        """ Initialization of an empty column.
+        """
+
+        self.offsets = array("q", [0])
+        self.data = bytearray()
+        self.validity = bytearray()
+        self.null_count = 0
+
+    def __len__(self: object) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self: object, index: int) -> Optional[str]:
+        if not isValid(self.validity, index):
+            return None
+        return self.data[self.offsets[index] : self.offsets[index + 1]].decode()
+
+    def append(self: object, value: Optional[str]) -> None:
+        """ Add a value (or None) to the end of the column.
+        """
+
+        index = len(self)
+        if value is not None:
+            self.data += value.encode()
+        self.offsets.append(len(self.data))
+        appendValidity(self.validity, index, value is not None)
+        if value is None:
+            self.null_count += 1
+
+    def buffers(self: object) -> dict:
+        return {"validity": self.validity, "offsets": self.offsets, "data": self.data}
+
+
+class DateColumn(object):
+    """ Column of dates, stored as the number of days since 1970-01-01 with a
+        bitmap that marks the values that are not None.
+    """
+
+    __slots__ = ("values", "validity", "null_count")
+
+    def __init__(self: object) -> None:
+        """ Initialization of an empty column.
+        """
+
+        self.values = array("i")
+        self.validity = bytearray()
+        self.null_count = 0
+
+    def __len__(self: object) -> int:
+        return len(self.values)
+
+    def __getitem__(self: object, index: int) -> Optional[datetime.date]:
+        if not isValid(self.validity, index):
+            return None
+        return datetime.date.fromordinal(self.values[index] + EPOCH)
+
+    def append(self: object, value: Optional[datetime.date]) -> None:
+        """ Add a value (or None) to the end of the column.
+        """
+
+        index = len(self)
+        self.values.append(0 if value is None else value.toordinal() - EPOCH)
+        appendValidity(self.validity, index, value is not None)
+        if value is None:
+            self.null_count += 1
+
+    def buffers(self: object) -> dict:
+        return {"validity": self.validity, "values": self.values}
+
+
+class ListColumn(object):
+    """ Column of lists, stored like an Arrow list array: the items of all lists
+        in a single child column, and the offsets of each list in that column.
+        The child column is a StringColumn, or a dict of StringColumns for lists
+        of records (all with the same length).
+    """
+
+    __slots__ = ("offsets", "values", "validity", "null_count")
+
+    def __init__(self: object, fields: Optional[tuple] = None) -> None:
+        """ Initialization of an empty column.
+
+            Parameters:
+                - fields    Tuple, names of the fields of the items (None for a
+                            list of strings).
+        """
+
+        self.offsets = array("i", [0])
+        self.validity = bytearray()
+        self.null_count = 0
+        if fields is None:
+            self.values = StringColumn()
+        else:
+            self.values = {field: StringColumn() for field in fields}
+
+    def __len__(self: object) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self: object, index: int) -> Optional[list]:
+        if not isValid(self.validity, index):
+            return None
+        items = range(self.offsets[index], self.offsets[index + 1])
+        if isinstance(self.values, StringColumn):
+            return [self.values[item] for item in items]
+        return [
+            {field: column[item] for field, column in self.values.items()}
+            for item in items
+        ]
+
+    def append(self: object, value: Optional[list]) -> None:
+        """ Add a list (or None) to the end of the column.
+        """
+
+        index = len(self)
+        items = value or []
+
+        # Add the items to the child column(s)
+        if isinstance(self.values, StringColumn):
+            for item in items:
+                self.values.append(item)
+        else:
+            for item in items:
+                for field, column in self.values.items():
+                    column.append(item.get(field))
+
+        self.offsets.append(self.offsets[-1] + len(items))
+        appendValidity(self.validity, index, value is not None)
+        if value is None:
+            self.null_count += 1
+
+    def buffers(self: object) -> dict:
+        if isinstance(self.values, StringColumn):
+            values = self.values.buffers()
+        else:
+            values = {field: column.buffers() for field, column in self.values.items()}
+        return {"validity": self.validity, "offsets": self.offsets, "values": values}
+
+
+def appendValidity(validity: bytearray, index: int, valid: bool) -> None:
+    """ Helper method that sets the bit of a new value in a validity bitmap
+        (least significant bit first, like Arrow).
+    """
+
+    if index % 8 == 0:
+        validity.append(0)
+    if valid:
+        validity[-1] |= 1 << (index % 8)
+
+
+def isValid(validity: bytearray, index: int) -> bool:
+    """ Helper method that checks the bit of a value in a validity bitmap.
+    """
+
+    return bool(validity[index >> 3] & (1 << (index & 7)))
+
+
+def toDate(value: Union[datetime.date, str, None]) -> Optional[datetime.date]:
+    """ Helper method that converts a publication date to a date. Book articles
+        only have a publication year, which becomes January 1st of that year.
+    """
+
+    if isinstance(value, datetime.date):
+        return value
+    if isinstance(value, str) and value.isdigit():
+        return datetime.date(int(value), 1, 1)
+    return None
+
+
+class ArticleTable(object):
+    """ Columnar container of articles, stored in compact Arrow-style buffers
+        instead of one object per article. Articles are added one by one (e.g.
+        straight from PubMed.query) and only the fields of the columns are kept.
+
+        The buffers can be exported without copying to NumPy (toNumpy) and Arrow
+        (toArrow), and written to Parquet and Feather files (requires pyarrow).
+        While exported arrays exist, no articles can be added to the table (a
+        BufferError is raised).
+    """
+
+    def __init__(self: object, articles: Optional[list] = None) -> None:
+        """ Initialization of the object.
+
+            Parameters:
+                - articles  List / iterator, articles to add to the table.
+        """
+
+        self.columns = {
+            "pubmed_id": StringColumn(),
+            "title": StringColumn(),
+            "journal": StringColumn(),
+            "publication_date": DateColumn(),
+            "doi": StringColumn(),
+            "keywords": ListColumn(),
+            "authors": ListColumn(fields=AUTHOR_FIELDS),
+        }
+        if articles is not None:
+            self.extend(articles)
+
+    @classmethod
+    def fromArticles(cls: type, articles: list) -> "ArticleTable":
+        """ Collect articles (e.g. the results of PubMed.query) into a table.
+
+            Parameters:
+                - articles  List / iterator, yields PubMedArticle and
+                            PubMedBookArticle objects.
+
+            Returns:
+                - table     ArticleTable, the table with the articles.
+        """
+
+        return cls(articles=articles)
+
+    def __len__(self: object) -> int:
+        return len(self.columns["pubmed_id"])
+
+    def __getitem__(self: object, index: int) -> dict:
+        """ Return an article of the table as dict.
+        """
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ArticleTable index out of range")
+        return {name: column[index] for name, column in self.columns.items()}
+
+    def __iter__(self: object) -> list:
+        for index in range(len(self)):
+            yield self[index]
+
+    def append(self: object, article: object) -> None:
+        """ Add an article to the end of the table.
+
+            Parameters:
+                - article   PubMedArticle / PubMedBookArticle, the article (only the
+                            fields of the columns are read, so lazy articles only
+                            decode these fields).
+
+            Returns:
+                - None
+        """
+
+        columns = self.columns
+        columns["pubmed_id"].append(getattr(article, "pubmed_id", None))
+        columns["title"].append(getattr(article, "title", None))
+        columns["journal"].append(getattr(article, "journal", None))
+        columns["publication_date"].append(
+            toDate(getattr(article, "publication_date", None))
+        )
+        columns["doi"].append(getattr(article, "doi", None))
+        columns["keywords"].append(getattr(article, "keywords", None))
+        columns["authors"].append(getattr(article, "authors", None))
+
+    def extend(self: object, articles: list) -> None:
+        """ Add articles to the end of the table.
+
+            Parameters:
+                - articles  List / iterator, yields the articles.
+
+            Returns:
+                - None
+        """
+
+        for article in articles:
+            self.append(article)
+
+    def column(self: object, name: str) -> list:
+        """ Return the values of a column as list.
+        """
+
+        column = self.columns[name]
+        return [column[index] for index in range(len(column))]
+
+    def toNumpy(self: object) -> dict:
+        """ Export the buffers of all columns as NumPy arrays, without copying.
+
+            Returns:
+                - arrays    Dict, per column a dict with its buffers: "validity"
+                            (bitmap, uint8), "offsets" (int64 for strings, int32
+                            for lists), "data" (UTF-8 bytes, uint8), "values"
+                            (int32 days since 1970-01-01 for dates, the child
+                            column(s) for lists).
+        """
+
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("Exporting to NumPy requires numpy")
+
+        def export(buffers: dict) -> dict:
+            arrays = {}
+            for name, buffer in buffers.items():
+                if isinstance(buffer, dict):
+                    arrays[name] = export(buffer)
+                elif isinstance(buffer, array):
+                    arrays[name] = numpy.frombuffer(buffer, dtype=buffer.typecode)
+                else:
+                    arrays[name] = numpy.frombuffer(buffer, dtype=numpy.uint8)
+            return arrays
+
+        return {name: export(column.buffers()) for name, column in self.columns.items()}
+
+    def toArrow(self: object) -> "pyarrow.Table":
+        """ Export the table as Arrow table, without copying the buffers.
+
+            Returns:
+                - table     pyarrow.Table, the table.
+        """
+
+        try:
+            import pyarrow
+        except ImportError:
+            raise ImportError("Exporting to Arrow requires pyarrow")
+
+        def validity(column: object) -> Optional["pyarrow.Buffer"]:
+            if column.null_count == 0:
+                return None
+            return pyarrow.py_buffer(column.validity)
+
+        def strings(column: StringColumn) -> "pyarrow.Array":
+            return pyarrow.Array.from_buffers(
+                pyarrow.large_string(),
+                len(column),
+                [
+                    validity(column),
+                    pyarrow.py_buffer(column.offsets),
+                    pyarrow.py_buffer(column.data),
+                ],
+                null_count=column.null_count,
+            )
+
+        def dates(column: DateColumn) -> "pyarrow.Array":
+            return pyarrow.Array.from_buffers(
+                pyarrow.date32(),
+                len(column),
+                [validity(column), pyarrow.py_buffer(column.values)],
+                null_count=column.null_count,
+            )
+
+        def lists(column: ListColumn) -> "pyarrow.Array":
+            if isinstance(column.values, StringColumn):
+                values = strings(column.values)
+            else:
+                values = pyarrow.StructArray.from_arrays(
+                    [strings(child) for child in column.values.values()],
+                    names=list(column.values),
+                )
+            return pyarrow.Array.from_buffers(
+                pyarrow.list_(values.type),
+                len(column),
+                [validity(column), pyarrow.py_buffer(column.offsets)],
+                null_count=column.null_count,
+                children=[values],
+            )
+
+        converters = {StringColumn: strings, DateColumn: dates, ListColumn: lists}
+        return pyarrow.Table.from_arrays(
+            [converters[type(column)](column) for column in self.columns.values()],
+            names=list(self.columns),
+        )
+
+    def writeParquet(self: object, path: str, **kwargs: dict) -> None:
+        """ Write the table to a Parquet file (requires pyarrow).
+
+            Parameters:
+                - path      Str, path of the file.
+                - kwargs    Dict, passed on to pyarrow.parquet.write_table.
+
+            Returns:
+                - None
+        """
+
+        from pyarrow import parquet
+
+        parquet.write_table(self.toArrow(), path, **kwargs)
+
+    def writeFeather(self: object, path: str, **kwargs: dict) -> None:
+        """ Write the table to a Feather file (requires pyarrow).
+
+            Parameters:
+                - path      Str, path of the file.
+                - kwargs    Dict, passed on to pyarrow.feather.write_feather.
+
+            Returns:
+                - None
+        """
+
+        from pyarrow import feather
+
+        feather.write_feather(self.toArrow(), path, **kwargs)
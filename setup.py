@@ -19,6 +19,7 @@ setup(
     url="https://github.com/gijswobben/pymed",
     packages=find_packages(),
     install_requires=["requests>=2.20.0"],
+    extras_require={"async": ["aiohttp>=3.6.0"]},
     tests_require=["pytest"],
     long_description_content_type="text/markdown",
     long_description=read("README.md"),
@@ -0,0 +1,54 @@
+import os
+import sys
+
+import pytest
+
+from pymed import PubMed
+from pymed.ratelimit import getRateLimiter
+
+# The stand-in server of the benchmarks (which imports corpus.py from there)
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+import server  # noqa: E402
+
+
+# API key used for the tests (the stand-in server accepts any key)
+API_KEY = "test"
+
+
+@pytest.fixture
+def stand_in():
+    """ Start stand-in servers for a test (with the given options), and stop them
+        afterwards.
+    """
+
+    servers = []
+
+    def start(**options: dict) -> server.Server:
+        servers.append(server.Server(**options).start())
+        return servers[-1]
+
+    # Do not wait on the client side rate limit
+    getRateLimiter(api_key=API_KEY).rate = 1000
+
+    yield start
+
+    for stand_in_server in servers:
+        stand_in_server.shutdown()
+        stand_in_server.server_close()
+
+
+@pytest.fixture
+def pubmed():
+    """ Create a PubMed object for a stand-in server.
+    """
+
+    def create(stand_in_server: server.Server, **options: dict) -> PubMed:
+        return PubMed(
+            api_key=API_KEY,
+            base_url=stand_in_server.url,
+            backoff_factor=0.01,
+            **options,
+        )
+
+    return create
@@ -0,0 +1,22 @@
+from pymed.book import PubMedBookArticle
+
+from server import Corpus
+
+
+def testToDictFields(stand_in, pubmed):
+    """ Articles and book articles convert only the requested fields.
+    """
+
+    stand_in_server = stand_in(corpus=Corpus(size=200))
+    articles = list(
+        pubmed(stand_in_server).query(
+            "test", max_results=-1, lazy=True, fields=["pubmed_id"]
+        )
+    )
+    assert any(isinstance(article, PubMedBookArticle) for article in articles)
+
+    for article in articles:
+        values = article.toDict(fields=["title", "journal"])
+        assert list(values) == ["title", "journal"]
+        assert values["title"] == article.title
+        assert '"title"' in article.toJSON(fields=["title"])
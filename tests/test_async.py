@@ -0,0 +1,37 @@
+import asyncio
+import threading
+
+import pymed.async_api
+
+from pymed.async_api import AsyncPubMed
+
+from conftest import API_KEY
+from server import Corpus
+
+
+def testAsyncQueryParsesOnThread(stand_in, monkeypatch):
+    """ The responses are parsed on another thread than the event loop.
+    """
+
+    stand_in_server = stand_in(corpus=Corpus(size=600))
+    threads = set()
+
+    def parseArticles(response: str) -> list:
+        threads.add(threading.current_thread())
+        return []
+
+    monkeypatch.setattr(pymed.async_api, "parseArticles", parseArticles)
+
+    async def query() -> list:
+        async with AsyncPubMed(api_key=API_KEY, base_url=stand_in_server.url) as pubmed:
+            return [
+                article
+                async for article in pubmed.query(
+                    "test", max_results=-1, use_history=True
+                )
+            ]
+
+    asyncio.run(asyncio.wait_for(query(), timeout=10))
+
+    assert len(threads) > 0
+    assert threading.main_thread() not in threads
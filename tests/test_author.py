@@ -0,0 +1,33 @@
+import json
+import pickle
+
+from pymed.author import Author
+from pymed.author import BookAuthor
+
+
+def testAuthorLikeDict():
+    """ Authors can be used like the dicts they replace.
+    """
+
+    values = {
+        "lastname": "Smith",
+        "firstname": "Jane",
+        "initials": "J",
+        "affiliation": None,
+    }
+    author = Author(**values)
+
+    assert "lastname" in author and "collective" not in author
+    assert author["lastname"] == "Smith"
+    assert author.get("missing", "default") == "default"
+    assert list(author) == list(values)
+    assert len(author) == len(values)
+    assert author.items() == list(values.items())
+    assert author.values() == list(values.values())
+    assert dict(author) == values and author == values
+    assert json.loads(json.dumps([author], default=dict)) == [values]
+    assert pickle.loads(pickle.dumps(author)) == author
+
+    book_author = BookAuthor(collective="Group")
+    assert "collective" in book_author and "affiliation" not in book_author
+    assert dict(book_author)["collective"] == "Group"
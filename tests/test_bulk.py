@@ -0,0 +1,94 @@
+import gzip
+
+from pymed.bulk import load
+from pymed.bulk import LatestVersions
+
+from corpus import record
+
+
+def writeFile(path: str, records: list, deleted: list = ()) -> str:
+    """ Write a (gzipped) baseline or update file with records and deletions.
+    """
+
+    with gzip.open(path, "wt") as target:
+        target.write("<?xml version='1.0' ?>\n<PubmedArticleSet>\n")
+        target.write("\n".join(records))
+        if deleted:
+            target.write(
+                "<DeleteCitation>"
+                + "".join(f'<PMID Version="1">{pmid}</PMID>' for pmid in deleted)
+                + "</DeleteCitation>"
+            )
+        target.write("\n</PubmedArticleSet>")
+    return str(path)
+
+
+def revised(pmid: int) -> str:
+    """ Return a revision of a synthetic record (with a different title).
+    """
+
+    return record(pmid).replace(
+        f"<ArticleTitle>Study {pmid} ", "<ArticleTitle>Revised "
+    )
+
+
+def createFiles(directory: str) -> tuple:
+    """ Create two baseline files and two update files, which revise and delete
+        records of the baseline and of each other.
+    """
+
+    baseline = [
+        writeFile(directory / "baseline1.xml.gz", [record(pmid) for pmid in (1, 2, 3)]),
+        writeFile(directory / "baseline2.xml.gz", [record(pmid) for pmid in (4, 5, 6)]),
+    ]
+    updates = [
+        writeFile(
+            directory / "update1.xml.gz",
+            [revised(2), record(7), record(8)],
+            deleted=[5, 8],
+        ),
+        writeFile(directory / "update2.xml.gz", [revised(7)], deleted=[3]),
+    ]
+    return baseline, updates
+
+
+def testLoadLatestVersions(tmp_path):
+    """ Only the latest version of each record is loaded, without the deleted
+        records.
+    """
+
+    baseline, updates = createFiles(tmp_path)
+    expected = [("1", "Study"), ("4", "Study"), ("6", "Study")]
+    expected += [("2", "Revised"), ("7", "Revised")]
+
+    articles = load(baseline, processes=2, as_dict=True, updates=updates)
+
+    assert [
+        (article["pubmed_id"].split()[0], article["title"].split()[0])
+        for article in articles
+    ] == expected
+
+
+def testLoadWithoutDeletions(tmp_path):
+    """ Every record is loaded when the deletions are not applied, or when the
+        update files are not passed separately (so nothing is indexed).
+    """
+
+    baseline, updates = createFiles(tmp_path)
+
+    for articles in (
+        load(baseline, processes=2, apply_deletions=False, updates=updates),
+        load(baseline + updates, processes=2),
+    ):
+        assert len(list(articles)) == 10
+
+
+def testLatestVersions():
+    """ The index of the latest versions finds the file of each indexed record.
+    """
+
+    latest = LatestVersions({7: 3, 2: -1, 40: 2})
+
+    assert len(latest) == 3
+    indexes = [latest.get(pubmed_id, 0) for pubmed_id in ("2", "7", "8", "40")]
+    assert indexes == [-1, 3, 0, 2]
@@ -0,0 +1,74 @@
+import pytest
+
+from pymed.cache import ArticleCache
+from pymed.cache import SQLiteArticleCache
+from pymed.cache import DirectoryArticleCache
+
+from server import Corpus
+
+
+def pubmedIds(articles: list) -> list:
+    """ Return the (first) PubMed ID of each article.
+    """
+
+    return [article.pubmed_id.split()[0] for article in articles]
+
+
+@pytest.fixture(params=["sqlite", "directory"])
+def cache(request, tmp_path):
+    """ Create an empty article cache of each type.
+    """
+
+    if request.param == "sqlite":
+        return SQLiteArticleCache(str(tmp_path / "articles.db"))
+    return DirectoryArticleCache(str(tmp_path / "articles"))
+
+
+def testCachedArticlesInOrder(stand_in, pubmed, cache):
+    """ Cached and fetched articles are returned in the order of the IDs, and
+        only the missing articles are fetched.
+    """
+
+    stand_in_server = stand_in(corpus=Corpus(size=300))
+    client = pubmed(stand_in_server, cache=cache)
+    article_ids = ["5", "10", "15", "97", "20", "194", "25"]
+
+    # Cache some of the articles (including a book), in each way of fetching
+    for options in ({}, {"stream": True}, {"processes": 2}):
+        cache.invalidate(article_ids)
+        assert pubmedIds(client.fetch(["10", "97", "20"])) == ["10", "97", "20"]
+        assert len(cache) == 3
+
+        requests = stand_in_server.stats["efetch"]
+        assert pubmedIds(client.fetch(article_ids, **options)) == article_ids
+        assert stand_in_server.stats["efetch"] == requests + 1
+        assert cache.stats()["hits"] >= 3
+
+        # The fetched articles were added to the cache, the rest is not fetched
+        assert len(cache) == 7
+        assert pubmedIds(client.fetch(article_ids, **options)) == article_ids
+        assert stand_in_server.stats["efetch"] == requests + 1
+
+
+def testPartlyCachedQuery(stand_in, pubmed, cache):
+    """ A query with some cached articles returns the articles in the same order
+        as without a cache.
+    """
+
+    stand_in_server = stand_in(corpus=Corpus(size=600))
+    expected = pubmedIds(pubmed(stand_in_server).query("test", max_results=-1))
+
+    client = pubmed(stand_in_server, cache=cache)
+    list(client.fetch(expected[::7]))
+
+    assert pubmedIds(client.query("test", max_results=-1)) == expected
+    assert pubmedIds(client.query("test", max_results=-1, processes=2)) == expected
+
+
+
+def testArticleCacheIsAbstract():
+    """ The base class of the caches can not be used by itself.
+    """
+
+    with pytest.raises(TypeError):
+        ArticleCache()
@@ -0,0 +1,27 @@
+from pymed.cache import SearchCache
+
+from server import Corpus
+
+
+def testCitationsLinkCache(stand_in, pubmed):
+    """ The links of a traversal are kept in the link cache, without evicting the
+        cached searches.
+    """
+
+    stand_in_server = stand_in(corpus=Corpus(size=2000))
+    search_cache = SearchCache(max_entries=10)
+    link_cache = SearchCache(max_entries=100000)
+    client = pubmed(stand_in_server, search_cache=search_cache, link_cache=link_cache)
+
+    client.getTotalResultsCount("test")
+    graph = client.citations(["2000", "1999"], direction="both", depth=2)
+    elink_requests = stand_in_server.stats["elink"]
+
+    # The search is still cached, and the links of every expanded article are
+    assert len(search_cache) == 1
+    expanded = [article_id for article_id, links in graph.items() if links is not None]
+    assert len(link_cache) == 2 * len(expanded)
+
+    # The same traversal is answered from the link cache
+    assert client.citations(["2000", "1999"], direction="both", depth=2) == graph
+    assert stand_in_server.stats["elink"] == elink_requests
@@ -0,0 +1,26 @@
+from server import Corpus
+
+
+def pubmedIds(articles: list) -> list:
+    """ Return the (first) PubMed ID of each article.
+    """
+
+    return [article.pubmed_id.split()[0] for article in articles]
+
+
+def testConcurrentQuery(stand_in, pubmed):
+    """ Batches fetched concurrently are returned in the order of the results
+        (or all of them, in any order, when ordered is False).
+    """
+
+    stand_in_server = stand_in(corpus=Corpus(size=1000), latency=0.01)
+    client = pubmed(stand_in_server)
+
+    expected = pubmedIds(client.query("test", max_results=-1))
+    ordered = pubmedIds(client.query("test", max_results=-1, concurrency=4))
+    unordered = pubmedIds(
+        client.query("test", max_results=-1, concurrency=4, ordered=False)
+    )
+
+    assert ordered == expected
+    assert sorted(unordered) == sorted(expected)
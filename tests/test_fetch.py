@@ -0,0 +1,41 @@
+from server import Corpus
+
+
+def pubmedIds(articles: list) -> list:
+    """ Return the (first) PubMed ID of each article.
+    """
+
+    return sorted(article.pubmed_id.split()[0] for article in articles)
+
+
+def testFetch(stand_in, pubmed):
+    """ Long lists of IDs are sent as POST, short ones as GET.
+    """
+
+    stand_in_server = stand_in(corpus=Corpus(size=2000))
+    client = pubmed(stand_in_server)
+    article_ids = [str(pmid) for pmid in range(1, 1001)]
+
+    assert pubmedIds(client.fetch(article_ids[:100])) == sorted(article_ids[:100])
+    assert stand_in_server.stats.get("post", 0) == 0
+
+    assert pubmedIds(client.fetch(article_ids)) == sorted(article_ids)
+    assert stand_in_server.stats["post"] == 1
+    assert stand_in_server.stats["efetch"] == 2
+
+
+def testFetchWithHistory(stand_in, pubmed):
+    """ With use_history the IDs are uploaded once, and the articles retrieved
+        from the history server.
+    """
+
+    stand_in_server = stand_in(corpus=Corpus(size=2000))
+    article_ids = [str(pmid) for pmid in range(1, 1001)]
+
+    articles = pubmed(stand_in_server).fetch(
+        article_ids, batch_size=400, use_history=True
+    )
+
+    assert pubmedIds(articles) == sorted(article_ids)
+    assert stand_in_server.stats["epost"] == 1
+    assert stand_in_server.stats["efetch"] == 3
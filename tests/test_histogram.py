@@ -0,0 +1,24 @@
+import collections
+
+from server import Corpus
+
+
+def testHistogram(stand_in, pubmed):
+    """ The results are counted per year of publication, and busy years are
+        split into months.
+    """
+
+    corpus = Corpus(size=700)
+    stand_in_server = stand_in(corpus=corpus)
+    dates = [corpus.date(pubmed_id) for pubmed_id in corpus.ids]
+    years = collections.Counter(str(date.year) for date in dates)
+    months = collections.Counter(f"{date:%Y/%m}" for date in dates)
+
+    histogram = pubmed(stand_in_server).histogram("test", 1990, 2024, concurrency=4)
+    assert histogram == {str(year): years[str(year)] for year in range(1990, 2025)}
+
+    # The months have at most 2 results, and are not split any further
+    refined = pubmed(stand_in_server).histogram("test", 1990, 1990, refine=2)
+    assert refined == {
+        f"1990/{month:02d}": months[f"1990/{month:02d}"] for month in range(1, 13)
+    }
@@ -0,0 +1,20 @@
+import pymed.api
+
+from server import Corpus
+
+
+def testQueryWithHistory(stand_in, pubmed, monkeypatch):
+    """ Queries with use_history retrieve more results than esearch returns for
+        a query, from the history server.
+    """
+
+    monkeypatch.setattr(pymed.api, "HISTORY_BATCH_SIZE", 400)
+    stand_in_server = stand_in(corpus=Corpus(size=1000), max_search_results=100)
+
+    articles = list(
+        pubmed(stand_in_server).query("test", max_results=-1, use_history=True)
+    )
+
+    assert len(articles) == 1000
+    assert stand_in_server.stats["esearch"] == 1
+    assert stand_in_server.stats["efetch"] == 3
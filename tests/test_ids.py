@@ -0,0 +1,50 @@
+import pickle
+
+import pytest
+
+import pymed.ids
+
+from pymed.ids import ArticleIds
+
+
+@pytest.fixture(params=["numpy", "without numpy"])
+def backend(request, monkeypatch):
+    """ Run a test with NumPy (if it is installed) and without.
+    """
+
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(pymed.ids, "numpy", None)
+    return request.param
+
+
+def testArticleIdsList(backend):
+    """ ArticleIds can be used like a list of str IDs.
+    """
+
+    article_ids = ArticleIds(["3", "1", "2"])
+    article_ids.append(5)
+    article_ids += ["4"]
+
+    assert list(article_ids) == ["3", "1", "2", "5", "4"]
+    assert article_ids[0] == "3"
+    assert article_ids[1:3] == ["1", "2"]
+    assert isinstance(article_ids[1:3], ArticleIds)
+    assert "5" in article_ids and "6" not in article_ids
+    assert pickle.loads(pickle.dumps(article_ids)) == article_ids
+
+
+def testArticleIdsSetOperations(backend):
+    """ The set operations return the sorted unique IDs.
+    """
+
+    first = ArticleIds(["5", "3", "1", "3"])
+    second = ArticleIds(["4", "3", "2", "1"])
+
+    assert first | second == ["1", "2", "3", "4", "5"]
+    assert first & second == ["1", "3"]
+    assert first - ["4", "3", "2", "1"] == ["5"]
+    assert first ^ second == ["2", "4", "5"]
+    assert first.unique() == ["5", "3", "1"]
+    assert first.sorted() == ["1", "3", "5"]
@@ -0,0 +1,42 @@
+import itertools
+
+import pytest
+
+from server import Corpus
+
+
+def testJournalResumesQuery(stand_in, pubmed, tmp_path):
+    """ An interrupted query continues with the batches that were not retrieved
+        yet when it is executed again with the same journal.
+    """
+
+    stand_in_server = stand_in(corpus=Corpus(size=1000))
+    client = pubmed(stand_in_server)
+    journal = str(tmp_path / "journal")
+
+    # Stop during the second of four batches
+    interrupted = client.query("test", max_results=-1, journal=journal)
+    list(itertools.islice(interrupted, 300))
+    del interrupted
+    assert stand_in_server.stats["efetch"] == 2
+
+    # Only the remaining batches are fetched, and nothing at all once the query
+    # is complete
+    for _ in range(2):
+        articles = list(client.query("test", max_results=-1, journal=journal))
+        assert len(articles) == 1000
+        assert stand_in_server.stats["efetch"] == 4
+        assert stand_in_server.stats["esearch"] == 1
+
+
+def testJournalWithoutHistory(stand_in, pubmed, tmp_path):
+    """ Journaled queries can not use the history server (or summaries).
+    """
+
+    client = pubmed(stand_in())
+    journal = str(tmp_path / "journal")
+
+    with pytest.raises(ValueError):
+        client.query("test", journal=journal, use_history=True)
+    with pytest.raises(ValueError):
+        client.query("test", journal=journal, summary=True)
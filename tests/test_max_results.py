@@ -0,0 +1,38 @@
+import asyncio
+
+from pymed.async_api import AsyncPubMed
+
+from conftest import API_KEY
+from server import Corpus
+
+
+def testQueryAllResults(stand_in, pubmed):
+    """ max_results=-1 retrieves every result.
+    """
+
+    stand_in_server = stand_in(corpus=Corpus(size=600))
+    articles = list(pubmed(stand_in_server).query("test", max_results=-1))
+
+    assert len(articles) == 600
+    assert stand_in_server.stats["esearch"] == 1
+
+
+def testAsyncQueryAllResults(stand_in):
+    """ max_results=-1 retrieves every result with the asynchronous client (and
+        does not keep paging).
+    """
+
+    stand_in_server = stand_in(corpus=Corpus(size=600))
+
+    async def query() -> list:
+        async with AsyncPubMed(
+            api_key=API_KEY, base_url=stand_in_server.url, backoff_factor=0.01
+        ) as pubmed:
+            return [
+                article async for article in pubmed.query("test", max_results=-1)
+            ]
+
+    articles = asyncio.run(asyncio.wait_for(query(), timeout=10))
+
+    assert len(articles) == 600
+    assert stand_in_server.stats["esearch"] == 1
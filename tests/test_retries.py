@@ -0,0 +1,27 @@
+from pymed.helpers import retryDelay
+
+from server import Corpus
+
+
+def testQueryRetriesTransientErrors(stand_in, pubmed):
+    """ Requests that fail with 503 are retried.
+    """
+
+    stand_in_server = stand_in(corpus=Corpus(size=1000), error_rate=0.3, seed=1)
+    articles = list(
+        pubmed(stand_in_server, max_retries=10).query("test", max_results=-1)
+    )
+
+    assert len(articles) == 1000
+    assert stand_in_server.stats["errors"] > 0
+
+
+def testRetryDelay():
+    """ The Retry-After header is honored, and the exponential backoff is used
+        when it is missing or can not be parsed.
+    """
+
+    assert retryDelay(attempt=0, backoff_factor=1, retry_after="2") == 2
+    assert retryDelay(0, 1, retry_after="Wed, 21 Oct 2015 07:28:00 GMT") == 0
+    for retry_after in (None, "", "soon"):
+        assert 0 <= retryDelay(2, 1, retry_after=retry_after) <= 4
@@ -0,0 +1,20 @@
+from pymed.cache import SearchCache
+
+from server import Corpus
+
+
+def testSearchCache(stand_in, pubmed):
+    """ The IDs of a repeated query are reused while the number of results has
+        not changed.
+    """
+
+    stand_in_server = stand_in(corpus=Corpus(size=300))
+    client = pubmed(stand_in_server, search_cache=SearchCache())
+
+    article_ids = client.search("test", max_results=-1)
+    requests = stand_in_server.stats["esearch"]
+
+    # Only the (cached) count is requested again
+    assert client.search("test", max_results=-1) == article_ids
+    assert client.search("test", max_results=-1) == article_ids
+    assert stand_in_server.stats["esearch"] == requests + 1
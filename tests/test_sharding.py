@@ -0,0 +1,45 @@
+import logging
+import datetime
+
+import pymed.api
+
+from server import Corpus
+
+
+class SameDayCorpus(Corpus):
+    """ Synthetic corpus of which every record was published on the same day.
+    """
+
+    def date(self: object, pubmed_id: str) -> datetime.date:
+        return datetime.date(2024, 12, 28)
+
+
+def testShardedQuery(stand_in, pubmed, monkeypatch):
+    """ A sharded query retrieves more results than esearch returns for a query.
+    """
+
+    monkeypatch.setattr(pymed.api, "MAX_SEARCH_RESULTS", 100)
+    stand_in_server = stand_in(corpus=Corpus(size=300), max_search_results=100)
+
+    article_ids = pubmed(stand_in_server).search(
+        "test", max_results=-1, sharded=True, concurrency=4
+    )
+
+    assert sorted(article_ids, key=int) == [str(pmid) for pmid in range(1, 301)]
+
+
+def testShardedQueryOversizedDay(stand_in, pubmed, monkeypatch, caplog):
+    """ A day with more results than esearch returns is capped (with a warning)
+        instead of paging beyond the limit.
+    """
+
+    monkeypatch.setattr(pymed.api, "MAX_SEARCH_RESULTS", 20)
+    stand_in_server = stand_in(corpus=SameDayCorpus(size=50), max_search_results=20)
+
+    with caplog.at_level(logging.WARNING, logger="pymed.api"):
+        articles = list(
+            pubmed(stand_in_server).query("test", max_results=-1, sharded=True)
+        )
+
+    assert len(articles) == 20
+    assert "50 articles were published on 2024/12/28" in caplog.text
@@ -0,0 +1,29 @@
+from server import Corpus
+
+
+def articleFields(articles: list) -> list:
+    """ Return the fields of the articles (without their XML element), in the
+        order of their PubMed IDs.
+    """
+
+    return sorted(
+        (
+            {key: value for key, value in article.toDict().items() if key != "xml"}
+            for article in articles
+        ),
+        key=lambda fields: fields["pubmed_id"],
+    )
+
+
+def testQueryStream(stand_in, pubmed):
+    """ Streamed responses are parsed into the same articles.
+    """
+
+    stand_in_server = stand_in(corpus=Corpus(size=300))
+    client = pubmed(stand_in_server)
+
+    streamed = list(client.query("test", max_results=-1, stream=True))
+    parsed = list(client.query("test", max_results=-1))
+
+    assert len(streamed) == 300
+    assert articleFields(streamed) == articleFields(parsed)
@@ -0,0 +1,24 @@
+from pymed.summary import PubMedSummary
+
+from server import Corpus
+
+
+def testQuerySummaries(stand_in, pubmed):
+    """ Summaries have the core fields of the articles, retrieved in large
+        batches.
+    """
+
+    stand_in_server = stand_in(corpus=Corpus(size=300))
+    client = pubmed(stand_in_server)
+
+    summaries = list(client.query("test", max_results=-1, summary=True))
+    articles = {
+        article.pubmed_id.split()[0]: article
+        for article in client.query("test", max_results=-1)
+    }
+
+    assert len(summaries) == 300
+    assert stand_in_server.stats["esummary"] == 1
+    for summary in summaries:
+        assert isinstance(summary, PubMedSummary)
+        assert summary.title == articles[summary.pubmed_id].title
@@ -0,0 +1,25 @@
+import json
+
+import pymed.api
+
+from server import Corpus
+
+
+def testSyncMoreThanSearchResults(stand_in, pubmed, monkeypatch, tmp_path):
+    """ A sync retrieves more articles than esearch returns for a query.
+    """
+
+    monkeypatch.setattr(pymed.api, "MAX_SEARCH_RESULTS", 100)
+    stand_in_server = stand_in(corpus=Corpus(size=300), max_search_results=100)
+    state_path = str(tmp_path / "state.json")
+
+    # The first sync, and the next one (the stand-in server ignores the dates the
+    # articles were added or modified, so every article is retrieved again)
+    for _ in range(2):
+        articles = list(
+            pubmed(stand_in_server).sync("test", state_path=state_path, concurrency=4)
+        )
+
+        assert len(articles) == 300
+        with open(state_path) as state_file:
+            assert json.load(state_file)["test"]["articles"] == 300